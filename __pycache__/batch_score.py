@@ -0,0 +1,163 @@
+"""Headless scoring of every market x scenario x risk appetite.
+
+    python batch_score.py --output-dir out --format parquet --processes 8
+
+Writes one part file per block of markets into --output-dir.
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+import decisions
+import risk_engine
+import sample_data
+import scenario_grid
+
+DEFAULT_CAPITAL = 2_000_000
+DEFAULT_ENVIRONMENT = "Moderate"
+MARKETS_PER_TASK = 256
+
+
+# ======================
+# Scoring
+# ======================
+def latest_markets(df):
+    return df.sort_values(["Country", "Year"]).groupby("Country", observed=True).tail(1).reset_index(drop=True)
+
+
+def score_markets(latest, capital=DEFAULT_CAPITAL, environment=DEFAULT_ENVIRONMENT):
+    # Same outputs as the dashboard for each latest market row, crossed with
+    # every scenario and appetite, using each market's sidebar defaults
+    n_m = len(latest)
+    scenarios = scenario_grid.SCENARIOS
+    appetites = scenario_grid.APPETITES
+    n_s, n_a = len(scenarios), len(appetites)
+
+    # Row order: market-major, then scenario, then appetite
+    m_idx = np.repeat(np.arange(n_m), n_s * n_a)
+    s_idx = np.tile(np.repeat(np.arange(n_s), n_a), n_m)
+    a_idx = np.tile(np.arange(n_a), n_m * n_s)
+
+    countries = latest["Country"].astype(str).to_numpy()
+    composite, band, alloc_mult = scenario_grid.lookup_many(
+        latest["Sovereign_Rating"].astype(str).to_numpy()[m_idx],
+        latest["Market_Tier"].astype(str).to_numpy()[m_idx],
+        [environment] * len(m_idx),
+        np.array([scenario_grid.default_depth(c) for c in countries], dtype=int)[m_idx],
+        np.array([scenario_grid.default_liquidity(c) for c in countries], dtype=int)[m_idx],
+        np.asarray(scenarios, dtype=object)[s_idx]
+    )
+
+    risk = latest["Risk_Score"].to_numpy(dtype=float)[m_idx]
+    growth = latest["GDP_Growth"].to_numpy(dtype=float)[m_idx]
+    appetite_mult = np.array([scenario_grid.APPETITE_MULTIPLIERS[a] for a in appetites])[a_idx]
+
+    expansion = decisions.expansion_amounts(risk, capital, appetite_mult, alloc_mult)
+    scores = decisions.decision_scores(growth, risk)
+    verdict_idx = decisions.verdict_index(scores["final_score"])
+
+    return pd.DataFrame({
+        "Country": countries[m_idx],
+        "Year": latest["Year"].to_numpy()[m_idx],
+        "Scenario": np.asarray(scenarios, dtype=object)[s_idx],
+        "Risk_Appetite": np.asarray(appetites, dtype=object)[a_idx],
+        "Risk_Score": risk,
+        "Risk_Level": risk_engine.risk_levels(risk),
+        "Expected_Return": risk_engine.expected_return(risk),
+        "Composite_Risk": composite,
+        "Recommendation_Band": band,
+        "Alloc_Mult": alloc_mult,
+        "Defensive_Amount": expansion["Defensive"],
+        "Moderate_Amount": expansion["Moderate"],
+        "Aggressive_Amount": expansion["Aggressive"],
+        "Growth_Score": scores["growth_score"],
+        "Safety_Score": scores["safety_score"],
+        "Return_Score": scores["return_score"],
+        "Final_Score": scores["final_score"],
+        "Verdict": np.array([v["verdict"] for v in decisions.VERDICTS], dtype=object)[verdict_idx]
+    })
+
+
+def _market_blocks(df, markets_per_task):
+    latest = latest_markets(df)
+    return [latest.iloc[i:i + markets_per_task] for i in range(0, len(latest), markets_per_task)]
+
+
+def _run(task, tasks, processes):
+    if processes and processes > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            return list(pool.map(task, tasks))
+    return [task(t) for t in tasks]
+
+
+def _score_task(args):
+    return score_markets(*args)
+
+
+def score_all(df, capital=DEFAULT_CAPITAL, processes=None, markets_per_task=MARKETS_PER_TASK):
+    tasks = [(block, capital) for block in _market_blocks(df, markets_per_task)]
+    return pd.concat(_run(_score_task, tasks, processes), ignore_index=True)
+
+
+# ======================
+# Output
+# ======================
+def write_frame(frame, path_base, fmt):
+    if fmt == "parquet":
+        try:
+            path = path_base + ".parquet"
+            frame.to_parquet(path, index=False)
+            return path
+        except ImportError:
+            print("pyarrow is not installed; writing CSV instead", file=sys.stderr)
+    path = path_base + ".csv"
+    frame.to_csv(path, index=False)
+    return path
+
+
+def _score_write_task(args):
+    block, capital, path_base, fmt = args
+    return write_frame(score_markets(block, capital), path_base, fmt)
+
+
+def write_scores(df, output_dir, fmt="parquet", capital=DEFAULT_CAPITAL, processes=None,
+                 markets_per_task=MARKETS_PER_TASK):
+    # Each worker scores and writes its own part file, so serialisation
+    # scales with the pool instead of funnelling through the parent
+    os.makedirs(output_dir, exist_ok=True)
+    tasks = [
+        (block, capital, os.path.join(output_dir, f"part-{i:05d}"), fmt)
+        for i, block in enumerate(_market_blocks(df, markets_per_task))
+    ]
+    return _run(_score_write_task, tasks, processes)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score every market, scenario and risk appetite.")
+    parser.add_argument("--output-dir", default="batch_output")
+    parser.add_argument("--format", choices=["parquet", "csv"], default="parquet")
+    parser.add_argument("--capital", type=float, default=DEFAULT_CAPITAL)
+    parser.add_argument("--countries", type=int, default=len(sample_data.COUNTRIES),
+                        help="synthetic universe size (the named sample markets come first)")
+    parser.add_argument("--seed", type=int, default=sample_data.SEED)
+    parser.add_argument("--processes", type=int, default=os.cpu_count())
+    parser.add_argument("--markets-per-task", type=int, default=MARKETS_PER_TASK)
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    panel = sample_data.generate_panel(sample_data.synthetic_countries(args.countries), seed=args.seed)
+    df = risk_engine.derived_frame(panel)
+    paths = write_scores(df, args.output_dir, args.format, args.capital, args.processes, args.markets_per_task)
+
+    elapsed = time.perf_counter() - started
+    print(f"{len(paths)} part files -> {args.output_dir} in {elapsed:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,151 @@
+"""Time and peak memory of each stage of a dashboard rerun, per panel size.
+
+    python benchmark.py --sizes 10 100 1000 10000 --output bench.json
+
+Every stage runs uncached: --repeat timed runs (best and median reported)
+plus one run under tracemalloc for the peak allocation.
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+import charts
+import components
+import frame_memory
+import panel_cube
+import portfolio
+import risk_engine
+import sample_data
+import stress
+
+DEFAULT_SIZES = [10, 100, 1000, 10000]
+DEFAULT_REPEAT = 3
+DEFAULT_PATHS = 10_000
+# The mean-variance covariance is markets x markets; larger universes are
+# reported as skipped rather than allocating it
+MV_MAX_MARKETS = 2000
+
+
+# ======================
+# Measurement
+# ======================
+def measure(fn, repeat=DEFAULT_REPEAT):
+    # Returns (result, timings in seconds, peak traced bytes)
+    timings = []
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - started)
+
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, timings, peak
+
+
+# ======================
+# Stages
+# ======================
+def run_stages(n_countries, repeat=DEFAULT_REPEAT, n_paths=DEFAULT_PATHS, mv_max_markets=MV_MAX_MARKETS):
+    # Same order as a rerun of financial.py; each stage feeds the next
+    countries = sample_data.synthetic_countries(n_countries)
+    rows = []
+
+    def stage(name, fn, skip=None):
+        if skip:
+            rows.append({"stage": name, "countries": n_countries, "skipped": skip})
+            return None
+        result, timings, peak = measure(fn, repeat)
+        rows.append({
+            "stage": name,
+            "countries": n_countries,
+            "best_s": min(timings),
+            "median_s": float(np.median(timings)),
+            "peak_mb": peak / 2 ** 20
+        })
+        return result
+
+    panel = stage("load_sample_data",
+                  lambda: frame_memory.compact_frame(sample_data.generate_panel(countries)))
+    df = stage("risk_pipeline", lambda: risk_engine.compute_risk_frame(panel))
+    cube = stage("panel_cube", lambda: panel_cube.PanelCube(df))
+    latest = cube.year_rows()
+
+    weights, _ = stage("portfolio_inverse_risk",
+                       lambda: portfolio.optimize_allocations(latest, df, 1.0, 1.0))
+    stage("portfolio_mean_variance",
+          lambda: portfolio.optimize_allocations(latest, df, 1.0, 1.0, method="mean_variance"),
+          skip=f"more than {mv_max_markets} markets" if len(latest) > mv_max_markets else None)
+    top_markets = portfolio.allocation_frame(latest, weights[0])
+    top_markets = top_markets[top_markets["Allocation"] > 0.05]
+
+    results = stage("stress", lambda: stress.run_stress(df, n_paths=n_paths))
+
+    country = cube.countries[0]
+    stage("figures", lambda: [
+        charts.market_analysis_figure(cube.country_rows(country)),
+        charts.allocation_treemap(top_markets),
+        charts.risk_return_scatter(top_markets),
+        charts.stress_loss_figure(results["by_scenario"]),
+        charts.loss_distribution_figure(results["histogram"], len(results["losses"]), results["var"]),
+        charts.comparison_figure(cube.metric("Risk_Score", cube.countries[:5]), "Risk_Score")
+    ])
+    stage("country_cards", lambda: components.country_cards(latest.nlargest(6, "GDP")))
+
+    for row in rows:
+        row["rows"] = len(df)
+    return rows
+
+
+def run_benchmark(sizes=DEFAULT_SIZES, repeat=DEFAULT_REPEAT, n_paths=DEFAULT_PATHS,
+                  mv_max_markets=MV_MAX_MARKETS):
+    results = []
+    for n in sizes:
+        results.extend(run_stages(n, repeat, n_paths, mv_max_markets))
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "platform": platform.platform(),
+            "years": len(sample_data.YEARS),
+            "repeat": repeat,
+            "n_paths": n_paths
+        },
+        "results": results
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark each stage of the dashboard pipeline.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="synthetic universe sizes (number of countries)")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--paths", type=int, default=DEFAULT_PATHS, help="stress paths per run")
+    parser.add_argument("--mv-max-markets", type=int, default=MV_MAX_MARKETS)
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    args = parser.parse_args(argv)
+
+    report = run_benchmark(args.sizes, args.repeat, args.paths, args.mv_max_markets)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            fh.write(text + "\n")
+        print(f"{len(report['results'])} stage results -> {args.output}")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,78 @@
+import numpy as np
+import plotly.graph_objects as go
+
+# ======================
+# Settings
+# ======================
+# Above WEBGL_THRESHOLD points a trace switches to Scattergl; above
+# MAX_POINTS it is downsampled (LTTB) to MAX_POINTS before it is sent
+WEBGL_THRESHOLD = 1000
+MAX_POINTS = 2000
+
+
+# ======================
+# Downsampling
+# ======================
+def lttb(x, y, n_out=MAX_POINTS):
+    # Largest-Triangle-Three-Buckets: keeps the visual shape of a series
+    # with n_out points; first and last points are always kept
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    # Bucket edges over the interior points
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    # Average of each following bucket, vectorized up front
+    sums_x = np.add.reduceat(x[1:n - 1], edges[:-1] - 1)
+    sums_y = np.add.reduceat(y[1:n - 1], edges[:-1] - 1)
+    counts = np.diff(edges)
+    avg_x = np.append(sums_x / counts, x[-1])
+    avg_y = np.append(sums_y / counts, y[-1])
+
+    keep = np.empty(n_out, dtype=int)
+    keep[0] = 0
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        bx, by = x[lo:hi], y[lo:hi]
+        # Twice the triangle area against the previous pick and next average
+        area = np.abs((x[a] - avg_x[i + 1]) * (by - y[a]) - (x[a] - bx) * (avg_y[i + 1] - y[a]))
+        a = lo + int(np.argmax(area))
+        keep[i + 1] = a
+    keep[-1] = n - 1
+    return keep
+
+
+def visible_window(x, x_range=None):
+    # Index mask of the points inside the visible x range
+    x = np.asarray(x)
+    if x_range is None:
+        return np.ones(len(x), dtype=bool)
+    lo, hi = x_range
+    return (x >= lo) & (x <= hi)
+
+
+def prepare_series(x, y, x_range=None, max_points=MAX_POINTS):
+    x = np.asarray(x)
+    y = np.asarray(y)
+    mask = visible_window(x, x_range)
+    x, y = x[mask], y[mask]
+
+    # NaNs would break the triangle areas; gaps are not drawn anyway
+    finite = np.isfinite(y.astype(float))
+    x, y = x[finite], y[finite]
+    keep = lttb(x, y, max_points)
+    return x[keep], y[keep]
+
+
+# ======================
+# Traces
+# ======================
+def scatter_trace(x, y, x_range=None, max_points=MAX_POINTS, webgl_threshold=WEBGL_THRESHOLD, **kwargs):
+    # Drop-in for go.Scatter that keeps the payload flat as history grows
+    n = int(visible_window(x, x_range).sum())
+    x, y = prepare_series(x, y, x_range, max_points)
+    trace_type = go.Scattergl if n > webgl_threshold else go.Scatter
+    return trace_type(x=x, y=y, **kwargs)
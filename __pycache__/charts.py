@@ -0,0 +1,165 @@
+import pandas as pd
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+
+import chart_data
+import startup
+
+# Streamlit already imports graph_objects; express is the costly part and
+# loads on the first figure that uses it (the default tab needs none)
+px = startup.lazy_import("plotly.express")
+
+# ======================
+# Market Analysis
+# ======================
+def market_analysis_figure(country_df, x_range=None):
+    # Multi-metric chart; long histories are windowed and downsampled
+    fig = make_subplots(
+        rows=2, cols=2,
+        subplot_titles=('GDP & Credit Trend', 'Inflation Trend', 'Growth Rates', 'Risk Trend'),
+        specs=[[{'secondary_y': True}, {}], [{}, {}]]
+    )
+
+    fig.add_trace(
+        chart_data.scatter_trace(country_df['Year'], country_df['GDP'], x_range,
+                                 name='GDP', line=dict(color='#3b82f6', width=3)),
+        row=1, col=1, secondary_y=False
+    )
+
+    fig.add_trace(
+        chart_data.scatter_trace(country_df['Year'], country_df['Credit'], x_range,
+                                 name='Credit', line=dict(color='#10b981', width=3)),
+        row=1, col=1, secondary_y=True
+    )
+
+    fig.add_trace(
+        chart_data.scatter_trace(country_df['Year'], country_df['Inflation'], x_range,
+                                 name='Inflation', line=dict(color='#f59e0b', width=3)),
+        row=1, col=2
+    )
+
+    fig.add_trace(
+        chart_data.scatter_trace(country_df['Year'], country_df['GDP_Growth'], x_range,
+                                 name='GDP Growth', line=dict(color='#8b5cf6', width=3)),
+        row=2, col=1
+    )
+
+    fig.add_trace(
+        chart_data.scatter_trace(country_df['Year'], country_df['Risk_Score'], x_range,
+                                 name='Risk Score', line=dict(color='#ef4444', width=3)),
+        row=2, col=2
+    )
+
+    fig.update_layout(height=600, showlegend=True, template='plotly_white')
+    return fig
+
+
+def risk_gauge_figure(risk_score, risk_color):
+    fig = go.Figure(go.Indicator(
+        mode="gauge+number",
+        value=risk_score,
+        domain={'x': [0, 1], 'y': [0, 1]},
+        title={'text': "Risk Score", 'font': {'size': 16}},
+        gauge={
+            'axis': {'range': [0, 100], 'tickwidth': 1},
+            'bar': {'color': risk_color, 'thickness': 0.3},
+            'steps': [
+                {'range': [0, 30], 'color': "#d1fae5"},
+                {'range': [30, 50], 'color': "#fef3c7"},
+                {'range': [50, 70], 'color': "#ffedd5"},
+                {'range': [70, 100], 'color': "#fee2e2"}
+            ]
+        }
+    ))
+    fig.update_layout(height=250)
+    return fig
+
+
+# ======================
+# Balanced Expansion
+# ======================
+def sensitivity_figure(depth_axis, liquidity_axis, surface):
+    fig = px.imshow(
+        surface, x=liquidity_axis, y=depth_axis, origin='lower',
+        color_continuous_scale='RdYlGn_r', aspect='auto',
+        labels={'x': 'Liquidity Score', 'y': 'Market Depth', 'color': 'Composite Risk'},
+        title='Composite Risk Sensitivity: Depth × Liquidity'
+    )
+    fig.update_layout(height=400)
+    return fig
+
+
+# ======================
+# Portfolio Optimizer
+# ======================
+def allocation_treemap(top_markets):
+    fig = px.treemap(
+        top_markets,
+        path=['Country'],
+        values='Allocation',
+        color='Risk_Score',
+        color_continuous_scale='RdYlGn_r',
+        title='Optimal Portfolio Allocation'
+    )
+    fig.update_layout(height=500)
+    return fig
+
+
+def risk_return_scatter(top_markets):
+    fig = px.scatter(
+        top_markets,
+        x='Risk_Score',
+        y='GDP_Growth',
+        size='Allocation',
+        color='Country',
+        text='Country',
+        title='Risk-Return Analysis'
+    )
+    fig.update_traces(textposition='top center')
+    fig.update_layout(height=500)
+    return fig
+
+
+# ======================
+# Risk Reports
+# ======================
+RISK_FACTORS = pd.DataFrame({
+    'Factor': ['Economic', 'Credit', 'Market', 'Regulatory', 'Liquidity'],
+    'Contribution': [35, 25, 20, 12, 8]
+})
+
+
+def stress_loss_figure(stress_data):
+    return px.bar(stress_data, x='Scenario', y=['Expected Loss', 'Weighted Loss'],
+                  barmode='group', title='Expected Credit Loss Under Stress',
+                  color_discrete_sequence=['#ef4444', '#f59e0b'])
+
+
+def loss_distribution_figure(histogram, n_paths, var):
+    fig = px.bar(
+        histogram, x='Loss', y='Paths',
+        title=f'Simulated Loss Distribution ({n_paths:,} paths)',
+        labels={'Loss': 'Portfolio Loss (%)'},
+        color_discrete_sequence=['#3b82f6']
+    )
+    fig.add_vline(x=var, line_dash="dash", line_color="#ef4444")
+    fig.update_layout(showlegend=False, bargap=0)
+    return fig
+
+
+def risk_contribution_figure(risk_factors=RISK_FACTORS):
+    return px.pie(risk_factors, values='Contribution', names='Factor',
+                  title='Risk Contribution Analysis')
+
+
+# ======================
+# Market Comparison
+# ======================
+def comparison_figure(history, metric):
+    # history: Year x Country matrix for one metric
+    fig = go.Figure()
+    for country in history.columns:
+        fig.add_trace(chart_data.scatter_trace(history.index, history[country], name=country, mode='lines+markers'))
+    fig.update_layout(height=450, template='plotly_white', title=f'{metric.replace("_", " ")} by Market',
+                      xaxis_title='Year', yaxis_title=metric.replace("_", " "))
+    return fig
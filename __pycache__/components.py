@@ -0,0 +1,71 @@
+import re
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+# ======================
+# Stylesheet
+# ======================
+def minify_css(css):
+    # Comments and layout whitespace removed; the stylesheet travels in the
+    # page on every rerun, so it is minified once and sent small
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{};,>])\s*", r"\1", css)
+    # A space before ':' can be a descendant selector, so only the one after goes
+    return re.sub(r":\s+", ":", css).strip()
+
+
+# ======================
+# Card Grid
+# ======================
+# One st.markdown call (one delta, one frontend element) per grid, however
+# many cards it holds
+def _compact(html):
+    # Markdown would read indented HTML lines as a code block
+    return "".join(line.strip() for line in html.splitlines())
+
+
+def card_grid(cards, columns=3, gap=16):
+    body = "".join(_compact(card) for card in cards)
+    return (
+        f'<div style="display:grid; grid-template-columns:repeat({columns}, minmax(0, 1fr)); '
+        f'gap:{gap}px; margin-bottom:15px;">{body}</div>'
+    )
+
+
+def render_card_grid(cards, columns=3):
+    st.markdown(card_grid(cards, columns), unsafe_allow_html=True)
+
+
+# ======================
+# Country Cards
+# ======================
+def _fmt(values, spec):
+    return pd.Series(values).map(spec.format)
+
+
+def _row(label, value, style="font-weight:600;"):
+    return "<div><span>" + label + ":</span><span style=\"" + style + "\">" + value + "</span></div>"
+
+
+def country_cards(frame):
+    # Every card templated column-wise in one pass over the frame
+    growth = frame["GDP_Growth"].to_numpy()
+    growth_style = pd.Series(np.where(growth > 0, "#10b981", "#ef4444")).radd("font-weight:600; color:") + ";"
+
+    html = (
+        '<div class="country-card"><b>' + frame["Country"].astype(str).reset_index(drop=True) + "</b>" +
+        _row("GDP", "$" + _fmt(frame["GDP"].to_numpy() / 1e9, "{:.1f}") + "B") +
+        "<div><span>Growth:</span><span style=\"" + growth_style + "\">" + _fmt(growth, "{:.1f}") + "%</span></div>" +
+        _row("Inflation", _fmt(frame["Inflation"].to_numpy(), "{:.1f}") + "%") +
+        _row("Risk Score", _fmt(frame["Risk_Score"].to_numpy(), "{:.0f}")) +
+        _row("Rating", frame["Sovereign_Rating"].astype(str).reset_index(drop=True)) +
+        "</div>"
+    )
+    return html.tolist()
+
+
+def render_country_cards(frame, columns=3):
+    render_card_grid(country_cards(frame), columns)
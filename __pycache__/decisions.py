@@ -0,0 +1,64 @@
+import numpy as np
+
+# ======================
+# Expansion Strategies
+# ======================
+# Share of the risk-adjusted base rate deployed by each strategy
+STRATEGY_SHARES = {
+    "Defensive": 0.7,
+    "Moderate": 0.9,
+    "Aggressive": 1.0
+}
+
+# ======================
+# Verdicts
+# ======================
+# Final score strictly above each threshold earns that verdict
+VERDICT_THRESHOLDS = [75, 60, 45]
+
+VERDICTS = [
+    {"verdict": "STRONG BUY", "color": "#10b981", "bg": "#d1fae5", "action": "EXPAND EXPOSURE"},
+    {"verdict": "MODERATE BUY", "color": "#3b82f6", "bg": "#dbeafe", "action": "GRADUAL ENTRY"},
+    {"verdict": "HOLD", "color": "#f59e0b", "bg": "#fef3c7", "action": "MAINTAIN POSITION"},
+    {"verdict": "AVOID / EXIT", "color": "#ef4444", "bg": "#fee2e2", "action": "REDUCE EXPOSURE"}
+]
+
+
+# ======================
+# Kernels
+# ======================
+# All functions accept scalars or NumPy arrays so the dashboard and the
+# batch scorer share one implementation.
+def base_rate(risk_score, appetite_mult, alloc_mult):
+    return np.maximum(0, (100 - risk_score) / 100) * appetite_mult * alloc_mult
+
+
+def expansion_amounts(risk_score, capital, appetite_mult, alloc_mult):
+    rate = base_rate(risk_score, appetite_mult, alloc_mult)
+    return {name: capital * rate * share for name, share in STRATEGY_SHARES.items()}
+
+
+def decision_scores(gdp_growth, risk_score):
+    growth_score = np.minimum(100, gdp_growth * 10 + 50)
+    safety_score = 100 - risk_score
+    return_score = np.minimum(100, (100 - risk_score) * 1.5)
+    final_score = (growth_score + safety_score + return_score) / 3
+    return {
+        "growth_score": growth_score,
+        "safety_score": safety_score,
+        "return_score": return_score,
+        "final_score": final_score
+    }
+
+
+def verdict_index(final_score):
+    score = np.asarray(final_score)
+    return np.select(
+        [score > t for t in VERDICT_THRESHOLDS],
+        list(range(len(VERDICT_THRESHOLDS))),
+        default=len(VERDICT_THRESHOLDS)
+    )
+
+
+def verdict(final_score):
+    return VERDICTS[int(verdict_index(final_score))]
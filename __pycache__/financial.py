@@ -0,0 +1,894 @@
+import streamlit as st
+import pandas as pd
+import hashlib
+import os
+import time
+import uuid
+from datetime import datetime
+
+import startup
+
+# Chart and report modules load on first use; the report builder only
+# when a report is requested
+charts = startup.lazy_import("charts")
+risk_report = startup.lazy_import("risk_report")
+
+import components
+import decisions
+import frame_memory
+import jobs
+import panel_cube
+import perf_spans
+import portfolio
+import risk_engine
+import sample_data
+import scoring_model
+import scenario_grid
+import stress
+
+# Start of this rerun, for the session's first-paint time
+run_started = time.perf_counter()
+
+# ======================
+# Page Config
+# ======================
+st.set_page_config(
+    page_title="Credit Risk & Expansion Dashboard",
+    page_icon="🏦",
+    layout="wide",
+    initial_sidebar_state="expanded"
+)
+
+# ======================
+# Custom CSS
+# ======================
+@st.cache_resource
+def load_css():
+    # Read and minified once per process; Streamlit still needs the style
+    # element in every rerun's output
+    with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), "dashboard.css"), encoding="utf-8") as fh:
+        return components.minify_css(fh.read())
+
+st.markdown(f"<style>{load_css()}</style>", unsafe_allow_html=True)
+
+# ======================
+# Header
+# ======================
+st.markdown("""
+<div class="main-header">
+    <h1>🏛️ Unified Credit Institution</h1>
+    <p style="font-size: 1.2rem; opacity: 0.9;">Advanced Risk & Expansion Analytics Platform</p>
+</div>
+""", unsafe_allow_html=True)
+
+st.markdown(f"<p style='text-align:center; color:#64748b; margin-bottom:20px;'>Last Update: {datetime.now().strftime('%Y-%m-%d %H:%M')}</p>", unsafe_allow_html=True)
+
+# ======================
+# Section Timing
+# ======================
+# Per-session latency histograms for the named sections below; recording
+# is on only while the developer panel is (toggle at the sidebar bottom)
+if "perf" not in st.session_state:
+    st.session_state.perf = perf_spans.SpanRecorder()
+perf = st.session_state.perf
+perf.enabled = st.session_state.get("perf_panel", False)
+
+# ======================
+# Sample Data
+# ======================
+# One process-wide copy shared by every session (st.cache_resource hands
+# out the object itself; st.cache_data would unpickle a private copy on
+# every call). The shared frames are frozen: in-place writes raise, and
+# code that needs to add or change columns works on a .copy().
+@st.cache_resource
+def load_sample_data(seed=sample_data.SEED):
+    # Categorical labels and float32 metrics; see frame_memory.py for the
+    # per-stage footprint
+    return frame_memory.read_only_frame(frame_memory.compact_frame(sample_data.generate_panel(seed=seed)))
+
+# ======================
+# Data Processing
+# ======================
+@st.cache_resource(max_entries=risk_engine.DERIVED_CACHE_SIZE)
+def load_risk_data(weights):
+    # The fingerprint-keyed layer in risk_engine is shared with batch jobs;
+    # this wrapper only spares the per-rerun hashing of the panel.
+    return frame_memory.read_only_frame(risk_engine.derived_frame(load_sample_data(), dict(weights)))
+
+@st.cache_resource(max_entries=risk_engine.DERIVED_CACHE_SIZE)
+def load_panel_cube(weights):
+    # Country x Year index over the derived frame; per-market and per-year
+    # access below is a slice, not a scan. The cube keeps the read-only
+    # derived frame itself as cube.frame.
+    return panel_cube.PanelCube(load_risk_data(weights))
+
+# Market list and classifications for the sidebar do not depend on the
+# risk weights, so the default model's cube serves them
+with perf.span("data_loading"):
+    cube = load_panel_cube(risk_engine.weights_key())
+
+@st.cache_resource(max_entries=8)
+def load_stress_results(weights, n_paths=stress.N_PATHS):
+    results = stress.run_stress(load_risk_data(weights), n_paths=n_paths, weights=dict(weights))
+    for arr in (results["losses"], results["regimes"]):
+        arr.setflags(write=False)
+    return results
+
+RISK_FACTOR_LABELS = {
+    "GDP_Growth_MA": "5Y Avg Growth (abs)",
+    "GDP_Growth_Vol": "5Y Growth Volatility",
+    "Inflation_Vol": "5Y Inflation Volatility",
+    "GDP_Drawdown": "GDP Drawdown",
+    "Credit_GDP_Gap": "Credit-to-GDP Gap"
+}
+
+# ======================
+# Sidebar - Enhanced Market Configuration
+# ======================
+with st.sidebar, perf.span("sidebar"):
+    st.markdown("## 🌍 **Market Configuration**")
+    st.markdown("---")
+    
+    # Primary market selection
+    country = st.selectbox("Select Primary Market", cube.countries)
+    
+    # Get country-specific data
+    country_data = cube.latest(country)
+    
+    st.markdown("### 📊 **Market Classification**")
+    
+    # Market Tier with institutional context
+    market_tier = st.selectbox(
+        "Market Tier",
+        scenario_grid.TIERS,
+        index=scenario_grid.TIERS.index(
+            country_data.get("Market_Tier", "Secondary Market")
+        ),
+        help="Core: Primary investment markets | Secondary: Growth markets | Opportunistic: High risk/return | Monitor: Watch only"
+    )
+    
+    # Sovereign rating
+    st.markdown("### 📈 **Sovereign Risk**")
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        sovereign_rating = st.selectbox(
+            "S&P Rating",
+            scenario_grid.RATINGS,
+            index=scenario_grid.RATINGS.index(
+                country_data.get("Sovereign_Rating", "A")
+            )
+        )
+    
+    with col2:
+        regulatory_env = st.select_slider(
+            "Regulatory Environment",
+            options=scenario_grid.ENVIRONMENTS,
+            value="Moderate"
+        )
+    
+    st.markdown("### 🏦 **Market Depth & Liquidity**")
+    
+    col3, col4 = st.columns(2)
+    with col3:
+        market_depth = st.slider("Market Depth (1-10)", 1, 10, 
+                                scenario_grid.default_depth(country))
+    with col4:
+        liquidity_score = st.slider("Liquidity Score (1-10)", 1, 10,
+                                   scenario_grid.default_liquidity(country))
+    
+    st.markdown("### 🌐 **Macroeconomic Factors**")
+    
+    interest_rate = st.slider("Central Bank Rate (%)", 0.0, 15.0, 
+                             5.0 if country in ['USA', 'UK'] else 3.5, 0.25)
+    
+    exchange_volatility = st.select_slider(
+        "Exchange Rate Volatility",
+        options=["Very Low", "Low", "Moderate", "High", "Very High"],
+        value="Low" if country in ['USA', 'UAE', 'KSA'] else "Moderate"
+    )
+    
+    # Scenario Analysis
+    st.markdown("### 🔮 **Scenario Analysis**")
+    
+    scenario = st.selectbox(
+        "Select Scenario",
+        scenario_grid.SCENARIOS
+    )
+    
+    if scenario == "Optimistic":
+        gdp_adjust = st.slider("GDP Upside (%)", 0, 5, 2)
+        st.info("✨ Optimistic: Higher growth, lower risk")
+    elif scenario == "Pessimistic":
+        gdp_adjust = st.slider("GDP Downside (%)", -10, 0, -3)
+        st.warning("⚠️ Pessimistic: Economic slowdown")
+    elif scenario == "Stress Test":
+        gdp_adjust = st.slider("Stress Level (%)", -20, 0, -10)
+        st.error("🧪 Stress Test: Worst case scenario")
+    else:
+        gdp_adjust = 0
+    
+    # Investment Parameters
+    st.markdown("### 💰 **Investment Parameters**")
+    capital = st.number_input("Total Capital ($)", 100000, 10000000, 2000000, 100000)
+    
+    # Risk appetite
+    risk_appetite = st.select_slider(
+        "Risk Appetite",
+        options=scenario_grid.APPETITES,
+        value="Moderate"
+    )
+    
+    appetite_multipliers = scenario_grid.APPETITE_MULTIPLIERS
+    
+    # ======================
+    # Smart Recommendations
+    # ======================
+    st.markdown("### 💡 **Smart Recommendations**")
+    
+    # Composite risk and allocation band from the precomputed scenario grid
+    recommendation = scenario_grid.lookup(
+        sovereign_rating, market_tier, regulatory_env,
+        market_depth, liquidity_score, scenario
+    )
+    composite_risk = recommendation["composite_risk"]
+    alloc_mult = recommendation["alloc_mult"]
+    
+    getattr(st, recommendation["recommendation"]["style"])(recommendation["recommendation"]["title"])
+    st.info(recommendation["recommendation"]["detail"])
+    
+    st.caption(f"Composite Risk Score: {composite_risk:.2f}")
+    
+    # Scoring model from risk_models.json plus optional rolling-feature terms
+    with st.expander("🧮 Risk Model"):
+        model_config = scoring_model.load_config()
+        risk_model = st.selectbox("Scoring Model", list(model_config["models"]),
+                                  index=list(model_config["models"]).index(model_config["default_model"]))
+        model_weights = scoring_model.model_weights(risk_model)
+        factor_weights = {
+            name: st.slider(label, 0.0, 0.5, float(model_weights.get(name, risk_engine.FACTOR_WEIGHTS[name])), 0.05)
+            for name, label in RISK_FACTOR_LABELS.items()
+        }
+    
+    st.markdown("---")
+    st.checkbox("🛠️ Developer Timing Panel", key="perf_panel")
+
+# Risk_Score weights for everything below; zero terms stay out of the key
+# so equal models share their cache entries
+with perf.span("data_processing"):
+    weights = risk_engine.weights_key({
+        k: v for k, v in {**model_weights, **factor_weights}.items() if v
+    })
+    cube = load_panel_cube(weights)
+
+# ======================
+# Get latest data
+# ======================
+latest = cube.latest(country)
+country_df = cube.country_rows(country)
+
+# ======================
+# Risk Level
+# ======================
+risk_level, risk_color = risk_engine.risk_label(latest.Risk_Score)
+
+# تعريف expected_return هنا - قبل استخدامه
+expected_return = risk_engine.expected_return(latest.Risk_Score)
+
+# ======================
+# KPI Row
+# ======================
+with perf.span("kpi_row"):
+    st.markdown("## 📊 **Key Performance Indicators**")
+    components.render_card_grid([
+        f"""
+        <div class="metric-card">
+            <h3>GDP</h3>
+            <h2>${latest.GDP/1e9:.1f}B</h2>
+            <p style="color: {'#10b981' if latest.GDP_Growth>0 else '#ef4444'};">{latest.GDP_Growth:.1f}% YoY</p>
+        </div>
+        """,
+        f"""
+        <div class="metric-card">
+            <h3>Inflation</h3>
+            <h2>{latest.Inflation:.1f}%</h2>
+            <p style="color: {'#f59e0b' if latest.Inflation>5 else '#10b981'};">Target: 2%</p>
+        </div>
+        """,
+        f"""
+        <div class="metric-card">
+            <h3>Credit Growth</h3>
+            <h2>{latest.Credit_Growth:.1f}%</h2>
+            <p style="color: {'#ef4444' if latest.Credit_Growth>15 else '#10b981'};">Risk Adjusted</p>
+        </div>
+        """,
+        f"""
+        <div class="metric-card">
+            <h3>Risk Score</h3>
+            <h2>{latest.Risk_Score:.1f}</h2>
+            <p style="color: {risk_color};">{risk_level}</p>
+        </div>
+        """
+    ], columns=4)
+
+# ======================
+# Cached Figure Builders
+# ======================
+@st.cache_data(max_entries=32)
+def market_analysis_chart(weights, country, x_range=None):
+    return charts.market_analysis_figure(load_panel_cube(weights).country_rows(country), x_range)
+
+@st.cache_data(max_entries=64)
+def risk_gauge_chart(risk_score, risk_color):
+    return charts.risk_gauge_figure(risk_score, risk_color)
+
+@st.cache_data(max_entries=64)
+def sensitivity_chart(rating, tier, environment, scenario):
+    depth_axis, liquidity_axis, surface = scenario_grid.surface(
+        "liquidity", "depth",
+        rating=rating, tier=tier, environment=environment, scenario=scenario
+    )
+    return charts.sensitivity_figure(depth_axis, liquidity_axis, surface)
+
+@st.cache_data(max_entries=32)
+def load_allocation(weights, capital, appetite_mult, alloc_mult, method):
+    # The Quick Actions job's computation (portfolio.allocation_run), for
+    # when no finished run of these inputs is cached
+    return portfolio.allocation_run(load_panel_cube(weights).year_rows(), load_risk_data(weights),
+                                    capital, appetite_mult, alloc_mult, method)
+
+@st.cache_data(max_entries=8)
+def allocation_charts(top_markets):
+    return charts.allocation_treemap(top_markets), charts.risk_return_scatter(top_markets)
+
+@st.cache_data(max_entries=8)
+def stress_charts(weights):
+    results = load_stress_results(weights)
+    return (
+        charts.stress_loss_figure(results["by_scenario"]),
+        charts.loss_distribution_figure(results["histogram"], len(results["losses"]), results["var"])
+    )
+
+@st.cache_data(max_entries=32)
+def comparison_chart(weights, countries, metric):
+    history = load_panel_cube(weights).metric(metric, countries)
+    return charts.comparison_figure(history, metric)
+
+@st.cache_resource(max_entries=risk_engine.DERIVED_CACHE_SIZE)
+def load_model_scores(weights):
+    # Every configured model over the whole panel in one matrix product,
+    # row-aligned with the cube's frame
+    models = scoring_model.configured_models()
+    return pd.DataFrame(models.scores(load_panel_cube(weights).frame), columns=models.names)
+
+@st.cache_data
+def risk_contribution_chart():
+    return charts.risk_contribution_figure()
+
+# ======================
+# Background Jobs
+# ======================
+@st.cache_resource
+def job_runner():
+    # One background executor for the whole server
+    return jobs.JobRunner()
+
+@st.cache_resource
+def optimizer_runner():
+    # Allocation runs get their own process each, so a stale one can be
+    # terminated; finished results are shared across sessions by input hash
+    return jobs.ProcessJobRunner()
+
+def session_id():
+    # Names this session as a holder of shared optimisation jobs
+    if "session_id" not in st.session_state:
+        st.session_state.session_id = uuid.uuid4().hex
+    return st.session_state.session_id
+
+def optimizer_name(method):
+    return "mean_variance" if method == "Mean-Variance" else "inverse_risk"
+
+def optimization_key(method):
+    inputs = (sample_data.SEED, weights, float(capital), appetite_multipliers[risk_appetite], alloc_mult, method)
+    return hashlib.sha1(repr(inputs).encode()).hexdigest()
+
+def current_allocation(method):
+    # The allocation for the current sidebar settings: a finished Quick
+    # Actions run if there is one, else the same computation inline
+    optimized = optimizer_runner().cached(optimization_key(method))
+    if optimized is not None:
+        return optimized.result()
+    return load_allocation(weights, float(capital), appetite_multipliers[risk_appetite], alloc_mult, method)
+
+def start_optimize_job():
+    method = optimizer_name(st.session_state.get("optimizer_method", "Inverse Risk (Capped)"))
+    key = optimization_key(method)
+    previous = st.session_state.get("optimize_job")
+    if previous is not None and previous.key != key and previous.status in ("queued", "running"):
+        # Other sessions may be waiting on the same run; it is terminated
+        # only once none of them holds it
+        optimizer_runner().detach(previous, session_id())
+    st.session_state.optimize_job = optimizer_runner().submit(
+        portfolio.allocation_run, cube.year_rows(), load_risk_data(weights),
+        capital, appetite_multipliers[risk_appetite], alloc_mult, method, key=key, holder=session_id()
+    )
+
+def job_active(name):
+    job = st.session_state.get(name)
+    return job is not None and job.status in ("queued", "running")
+
+def start_report_job():
+    method = optimizer_name(st.session_state.get("optimizer_method", "Inverse Risk (Capped)"))
+    settings = {
+        "capital": capital,
+        "risk_appetite": risk_appetite,
+        "appetite_mult": appetite_multipliers[risk_appetite],
+        "alloc_mult": alloc_mult,
+        "optimizer": method,
+        "scenario": scenario,
+        "rating": sovereign_rating,
+        "tier": market_tier,
+        "weights": weights
+    }
+    st.session_state.report_job = job_runner().submit(
+        risk_report.build_report, load_risk_data(weights), country, settings,
+        current_allocation(method), load_stress_results(weights)
+    )
+
+def render_job_status(job, label):
+    if job is None:
+        return
+    if job.status in ("queued", "running"):
+        st.progress(job.progress, text=f"{label}: {job.message}")
+    elif job.status == "failed":
+        st.markdown(f"<p style='color:#ef4444;'>❌ {label} failed: {job.error()}</p>", unsafe_allow_html=True)
+
+def any_job_active():
+    return job_active("report_job") or job_active("optimize_job")
+
+# ======================
+# Market Analysis Tab
+# ======================
+def render_market_tab():
+    st.markdown("## 📈 **Market Analysis**")
+    
+    col_left, col_right = st.columns([2, 1])
+    
+    with col_left:
+        # Multi-metric chart over the visible window only
+        year_min, year_max = int(country_df.Year.min()), int(country_df.Year.max())
+        x_range = None
+        if year_max > year_min:
+            x_range = st.slider("Visible Years", year_min, year_max, (year_min, year_max))
+        fig = market_analysis_chart(weights, country, x_range)
+        st.plotly_chart(fig, use_container_width=True)
+    
+    with col_right:
+        st.markdown("### 🎯 **Current Risk Level**")
+        
+        fig_gauge = risk_gauge_chart(float(latest.Risk_Score), risk_color)
+        st.plotly_chart(fig_gauge, use_container_width=True)
+        
+        # Market insights
+        st.markdown(f"""
+        <div style="background:#f8fafc; padding:20px; border-radius:15px; margin-top:20px;">
+            <h4>📊 Market Insights</h4>
+            <p><strong>Market Tier:</strong> {market_tier}</p>
+            <p><strong>Sovereign Rating:</strong> {sovereign_rating}</p>
+            <p><strong>5Y Avg Growth:</strong> {latest.GDP_Growth_MA:.1f}%</p>
+            <p><strong>5Y Volatility:</strong> {latest.GDP_Growth_Vol:.1f}%</p>
+            <p><strong>GDP Drawdown:</strong> {latest.GDP_Drawdown:.1f}%</p>
+            <p><strong>Credit-to-GDP Gap:</strong> {latest.Credit_GDP_Gap:+.1f} pts</p>
+        </div>
+        """, unsafe_allow_html=True)
+
+# ======================
+# Balanced Expansion Tab
+# ======================
+def render_balanced_tab():
+    st.markdown("## 🔄 **Balanced Expansion Analysis**")
+    
+    # Calculate expansion based on risk and appetite
+    expansion = decisions.expansion_amounts(
+        latest.Risk_Score, capital, appetite_multipliers[risk_appetite], alloc_mult
+    )
+    
+    safe_amount = expansion["Defensive"]
+    moderate_amount = expansion["Moderate"]
+    aggressive_amount = expansion["Aggressive"]
+    components.render_card_grid([
+        f"""
+        <div style="background:#f0fdf4; padding:30px; border-radius:20px; border:2px solid #86efac; text-align:center;">
+            <h3 style="color:#166534; font-size:1.8rem;">🛡️ DEFENSIVE</h3>
+            <h2 style="font-size:2.5rem; color:#0f172a;">${safe_amount:,.0f}</h2>
+            <p style="font-size:1.2rem;">{(safe_amount/capital)*100:.1f}% of Capital</p>
+            <p style="color:#64748b;">Capital Preservation Focus</p>
+        </div>
+        """,
+        f"""
+        <div style="background:#fefce8; padding:30px; border-radius:20px; border:2px solid #fde047; text-align:center;">
+            <h3 style="color:#854d0e; font-size:1.8rem;">⚖️ MODERATE</h3>
+            <h2 style="font-size:2.5rem; color:#0f172a;">${moderate_amount:,.0f}</h2>
+            <p style="font-size:1.2rem;">{(moderate_amount/capital)*100:.1f}% of Capital</p>
+            <p style="color:#64748b;">Balanced Growth Strategy</p>
+        </div>
+        """,
+        f"""
+        <div style="background:#fef2f2; padding:30px; border-radius:20px; border:2px solid #fca5a5; text-align:center;">
+            <h3 style="color:#991b1b; font-size:1.8rem;">🚀 AGGRESSIVE</h3>
+            <h2 style="font-size:2.5rem; color:#0f172a;">${aggressive_amount:,.0f}</h2>
+            <p style="font-size:1.2rem;">{(aggressive_amount/capital)*100:.1f}% of Capital</p>
+            <p style="color:#64748b;">Maximum Growth Focus</p>
+        </div>
+        """
+    ], columns=3)
+    
+    st.markdown(f"""
+    <div style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); padding: 30px; border-radius: 20px; color: white; margin-top: 20px;">
+        <h3 style="color:white; font-size:2rem; text-align:center;">🎯 RECOMMENDED STRATEGY</h3>
+        <p style="font-size:1.8rem; text-align:center; margin:20px 0;">Based on {risk_level} Risk Profile</p>
+        <div style="display:flex; justify-content:space-around; text-align:center;">
+            <div>
+                <p style="font-size:1.2rem;">Optimal Expansion</p>
+                <p style="font-size:2rem; font-weight:700;">${moderate_amount:,.0f}</p>
+            </div>
+            <div>
+                <p style="font-size:1.2rem;">Expected Return</p>
+                <p style="font-size:2rem; font-weight:700;">{expected_return:.1f}%</p>
+            </div>
+        </div>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    # Sensitivity of composite risk to market depth and liquidity
+    fig_surface = sensitivity_chart(sovereign_rating, market_tier, regulatory_env, scenario)
+    st.plotly_chart(fig_surface, use_container_width=True)
+
+# ======================
+# Portfolio Optimizer Tab
+# ======================
+def render_portfolio_tab():
+    st.markdown("## ⚖️ **Portfolio Optimizer**")
+    
+    method = st.radio(
+        "Optimization Method",
+        ["Inverse Risk (Capped)", "Mean-Variance"],
+        horizontal=True,
+        key="optimizer_method"
+    )
+    
+    # Full market universe under the sidebar's capital and cap: the same
+    # allocation Quick Actions optimises and the report exports
+    optimizer = optimizer_name(method)
+    allocation = current_allocation(optimizer)
+    top_markets = allocation[allocation['Allocation'] > 0.05]
+    fig, fig2 = allocation_charts(top_markets)
+    st.caption(f"Optimized for ${capital:,.0f} · {risk_appetite} appetite · "
+               f"{max(portfolio.MAX_WEIGHT * alloc_mult, 1 / len(allocation)):.0%} cap per market")
+    
+    col1, col2 = st.columns([1.5, 1])
+    
+    with col1:
+        # Treemap visualization
+        st.plotly_chart(fig, use_container_width=True)
+    
+    with col2:
+        # Risk-return scatter
+        st.plotly_chart(fig2, use_container_width=True)
+    
+    # Portfolio metrics
+    port_risk, port_return = portfolio.portfolio_metrics(top_markets)
+    
+    colm1, colm2, colm3 = st.columns(3)
+    with colm1:
+        st.metric("Portfolio Risk", f"{port_risk:.1f}")
+    with colm2:
+        st.metric("Expected Return", f"{port_return:.1f}%")
+    with colm3:
+        st.metric("Markets", f"{len(top_markets)}")
+
+# ======================
+# Risk Reports Tab
+# ======================
+def render_risk_tab():
+    st.markdown("## 🧪 **Economic Stress Testing**")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        # Monte Carlo stress test over every market
+        stress_results = load_stress_results(weights)
+        fig, fig_dist = stress_charts(weights)
+        
+        st.plotly_chart(fig, use_container_width=True)
+    
+    with col2:
+        # Simulated loss distribution
+        st.plotly_chart(fig_dist, use_container_width=True)
+    
+    col3, col4 = st.columns(2)
+    
+    with col3:
+        # Risk decomposition
+        fig2 = risk_contribution_chart()
+        st.plotly_chart(fig2, use_container_width=True)
+    
+    with col4:
+        st.markdown("### 📉 Tail Risk")
+        st.metric("Expected Loss", f"{stress_results['expected_loss']:.2f}%")
+        st.metric(f"VaR ({stress_results['alpha']:.0%})", f"{stress_results['var']:.2f}%")
+        st.metric(f"Expected Shortfall ({stress_results['alpha']:.0%})", f"{stress_results['es']:.2f}%")
+    
+    # Risk limits
+    st.markdown("### ⚠️ Risk Limits Dashboard")
+    
+    limits_data = pd.DataFrame({
+        'Indicator': ['NPL Ratio', 'Concentration', 'LTV', 'Debt Coverage'],
+        'Current': [3.2, 28.5, 65.0, 1.8],
+        'Limit': [5.0, 30.0, 80.0, 1.2],
+        'Status': ['🟢 Healthy', '🟡 Approaching', '🟢 Healthy', '🟢 Healthy']
+    })
+    st.dataframe(limits_data, use_container_width=True, hide_index=True)
+
+# ======================
+# Market Comparison Tab
+# ======================
+COMPARISON_METRICS = ["Risk_Score", "GDP_Growth", "Inflation", "Credit_Growth", "Unemployment", "GDP"]
+
+def render_comparison_tab():
+    st.markdown("## 🌐 **Market Comparison**")
+    
+    col1, col2 = st.columns([2, 1])
+    with col1:
+        default_peers = [country] + [c for c in cube.year_rows().nlargest(3, 'GDP').Country if c != country][:2]
+        selected = st.multiselect("Markets", cube.countries, default=default_peers)
+    with col2:
+        metric = st.selectbox("Metric", COMPARISON_METRICS,
+                              format_func=lambda m: m.replace("_", " "))
+    
+    if not selected:
+        st.info("Select at least one market to compare.")
+        return
+    
+    fig = comparison_chart(weights, tuple(selected), metric)
+    st.plotly_chart(fig, use_container_width=True)
+    
+    # Latest snapshot of every selected market, one take from the cube
+    snapshot = cube.latest_rows(selected)[
+        ["Country", "Year", "Risk_Score", "GDP_Growth", "Inflation", "Credit_Growth", "Sovereign_Rating", "Market_Tier"]
+    ].copy()
+    snapshot["Risk_Level"] = risk_engine.risk_levels(snapshot["Risk_Score"].to_numpy())
+    snapshot["Expected_Return"] = risk_engine.expected_return(snapshot["Risk_Score"].to_numpy())
+    st.dataframe(snapshot.round(2), use_container_width=True, hide_index=True)
+    
+    # Same markets under every configured scoring model
+    st.markdown("### 🧮 **Scoring Model Comparison**")
+    model_scores = load_model_scores(weights).iloc[cube.latest_positions(selected)]
+    model_scores.insert(0, "Country", selected)
+    st.dataframe(model_scores.round(1), use_container_width=True, hide_index=True)
+
+# ======================
+# Navigation Buttons
+# ======================
+# Runs as a fragment: switching tabs reruns only this block, and every
+# chart inside comes from a cached builder keyed by its real inputs
+@st.fragment
+def render_dashboard_tabs():
+    st.markdown('<div class="nav-container">', unsafe_allow_html=True)
+    st.markdown("## 📌 **Dashboard Navigation**")
+
+    nav_cols = st.columns(5)
+    with nav_cols[0]:
+        market_btn = st.button("📈 MARKET ANALYSIS", use_container_width=True)
+    with nav_cols[1]:
+        balanced_btn = st.button("🔄 BALANCED EXPANSION", use_container_width=True)
+    with nav_cols[2]:
+        portfolio_btn = st.button("⚖️ PORTFOLIO OPTIMIZER", use_container_width=True)
+    with nav_cols[3]:
+        risk_btn = st.button("📋 RISK REPORTS", use_container_width=True)
+    with nav_cols[4]:
+        compare_btn = st.button("🌐 MARKET COMPARISON", use_container_width=True)
+    st.markdown('</div>', unsafe_allow_html=True)
+
+    # Set active tab
+    if 'active_tab' not in st.session_state:
+        st.session_state.active_tab = 'market'
+
+    if market_btn:
+        st.session_state.active_tab = 'market'
+    elif balanced_btn:
+        st.session_state.active_tab = 'balanced'
+    elif portfolio_btn:
+        st.session_state.active_tab = 'portfolio'
+    elif risk_btn:
+        st.session_state.active_tab = 'risk'
+    elif compare_btn:
+        st.session_state.active_tab = 'compare'
+    
+    with perf.span(f"tab:{st.session_state.active_tab}"):
+        if st.session_state.active_tab == 'market':
+            render_market_tab()
+        elif st.session_state.active_tab == 'balanced':
+            render_balanced_tab()
+        elif st.session_state.active_tab == 'portfolio':
+            render_portfolio_tab()
+        elif st.session_state.active_tab == 'risk':
+            render_risk_tab()
+        elif st.session_state.active_tab == 'compare':
+            render_comparison_tab()
+
+render_dashboard_tabs()
+
+# ======================
+# Global Economic Overview
+# ======================
+st.markdown("---")
+st.markdown("## 🌍 **Global Economic Overview**")
+
+with perf.span("overview_cards"):
+    top_countries = cube.year_rows().nlargest(6, 'GDP')
+    components.render_country_cards(top_countries, columns=3)
+
+# ======================
+# Decision Matrix
+# ======================
+st.markdown("---")
+st.markdown("## 🎯 **Final Decision Matrix**")
+
+with perf.span("decision_matrix"):
+    scores = decisions.decision_scores(latest.GDP_Growth, latest.Risk_Score)
+    growth_score = scores["growth_score"]
+    safety_score = scores["safety_score"]
+    return_score = scores["return_score"]
+
+    components.render_card_grid([
+        f"""
+        <div class="decision-card">
+            <h3>📈 Growth Potential</h3>
+            <div style="font-size: 2.5rem; font-weight:700;">{growth_score:.0f}</div>
+            <div class="progress-bar">
+                <div class="progress-fill" style="background:#10b981; width:{growth_score}%;"></div>
+            </div>
+            <p>{'Strong' if growth_score > 70 else 'Moderate' if growth_score > 50 else 'Weak'} Growth Outlook</p>
+        </div>
+        """,
+        f"""
+        <div class="decision-card">
+            <h3>🛡️ Safety Score</h3>
+            <div style="font-size: 2.5rem; font-weight:700;">{safety_score:.0f}</div>
+            <div class="progress-bar">
+                <div class="progress-fill" style="background:#3b82f6; width:{safety_score}%;"></div>
+            </div>
+            <p>{risk_level} Risk Environment</p>
+        </div>
+        """,
+        f"""
+        <div class="decision-card">
+            <h3>💰 Return Potential</h3>
+            <div style="font-size: 2.5rem; font-weight:700;">{return_score:.0f}</div>
+            <div class="progress-bar">
+                <div class="progress-fill" style="background:#f59e0b; width:{return_score}%;"></div>
+            </div>
+            <p>Expected Return: {expected_return:.1f}%</p>
+        </div>
+        """
+    ], columns=3)
+
+    # Final verdict
+    final_score = scores["final_score"]
+
+    final = decisions.verdict(final_score)
+    verdict = final["verdict"]
+    verdict_color = final["color"]
+    verdict_bg = final["bg"]
+    action = final["action"]
+
+    st.markdown(f"""
+    <div style="background:{verdict_bg}; padding:25px; border-radius:20px; margin:20px 0; text-align:center; border:2px solid {verdict_color};">
+        <h2 style="color:{verdict_color};">🏁 FINAL VERDICT: {verdict}</h2>
+        <p style="font-size:1.3rem;">Composite Score: {final_score:.1f}/100 | Market: {country} | Risk Level: {risk_level}</p>
+        <div style="background:{verdict_color}; color:white; padding:15px 30px; border-radius:50px; display:inline-block; margin-top:10px; font-weight:700; font-size:1.3rem;">
+            {action}
+        </div>
+    </div>
+    """, unsafe_allow_html=True)
+
+# ======================
+# Quick Actions
+# ======================
+st.markdown("""
+<div class="quick-actions-container">
+    <h3>⚡ Quick Actions</h3>
+</div>
+""", unsafe_allow_html=True)
+
+# Polls once a second while a job is in flight; idle otherwise
+@st.fragment(run_every=1.0 if any_job_active() else None)
+def render_quick_actions():
+    qa_cols = st.columns(2)
+    with qa_cols[0]:
+        if st.button("📊 GENERATE COMPLETE RISK REPORT", use_container_width=True,
+                     disabled=job_active("report_job")):
+            start_report_job()
+            # Full rerun so this fragment is redefined with polling on
+            st.rerun()
+        report_job = st.session_state.get("report_job")
+        render_job_status(report_job, "Risk report")
+        if report_job is not None and report_job.status == "done":
+            st.download_button(
+                "⬇️ DOWNLOAD RISK REPORT (HTML + CSV)",
+                report_job.result(),
+                file_name=f"risk_report_{country}_{datetime.now():%Y%m%d_%H%M}.zip",
+                mime="application/zip",
+                use_container_width=True
+            )
+    with qa_cols[1]:
+        if st.button("🔄 OPTIMIZE PORTFOLIO ALLOCATION", use_container_width=True):
+            # A newer request replaces a stale run; see start_optimize_job
+            start_optimize_job()
+            st.rerun()
+        optimize_job = st.session_state.get("optimize_job")
+        render_job_status(optimize_job, "Portfolio optimization")
+        if optimize_job is not None and optimize_job.status == "done":
+            st.markdown(
+                f"<p style='color:#10b981; text-align:center;'>✅ Allocation ready across "
+                f"{len(optimize_job.result())} markets, shown in the Portfolio Optimizer tab</p>",
+                unsafe_allow_html=True
+            )
+    
+    # A job finished since the last full run: one more to refresh the page
+    # (the Portfolio tab picks up the result) and switch polling off
+    if not any_job_active() and st.session_state.get("job_polling"):
+        st.session_state.job_polling = False
+        st.rerun()
+    st.session_state.job_polling = any_job_active()
+
+render_quick_actions()
+
+# ======================
+# Developer Timing Panel
+# ======================
+def render_perf_panel():
+    with st.expander("🛠️ Section Timings (this session)", expanded=True):
+        timeline = startup.TIMELINE.to_dict()
+        if "first_run_s" in st.session_state:
+            st.caption(f"Process first paint {timeline['first_paint_s']:.2f}s after start · "
+                       f"this session's first run {st.session_state.first_run_s:.2f}s · "
+                       f"{timeline['sessions']} session(s) served")
+        timings = perf.frame()
+        if timings.empty:
+            st.caption("Timings appear from the next rerun.")
+            return
+        st.dataframe(timings.round(2), use_container_width=True, hide_index=True)
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.download_button("⬇️ JSON", perf.to_json(), "section_timings.json", "application/json")
+        with col2:
+            st.download_button("⬇️ Prometheus", perf.to_prometheus(), "section_timings.prom", "text/plain")
+        with col3:
+            if st.button("Reset Timings"):
+                perf.reset()
+
+if perf.enabled:
+    render_perf_panel()
+
+# Hide any success messages after 3 seconds
+st.markdown("""
+<script>
+    setTimeout(function() {
+        var alerts = window.parent.document.querySelectorAll('.stAlert');
+        alerts.forEach(function(alert) {
+            alert.style.display = 'none';
+        });
+    }, 3000);
+</script>
+""", unsafe_allow_html=True)
+
+# ======================
+# Startup Timing
+# ======================
+# A session's first complete run is its first paint; the process-wide
+# timeline keeps the first one since process start (see startup.py)
+if "first_run_s" not in st.session_state:
+    st.session_state.first_run_s = time.perf_counter() - run_started
+    startup.TIMELINE.paint(st.session_state.first_run_s)
@@ -0,0 +1,135 @@
+"""Compact dtypes for the panel and a per-stage memory report.
+
+    python frame_memory.py --countries 2000 --years 60 --extra 40
+"""
+import argparse
+import sys
+
+import numpy as np
+import pandas as pd
+
+# ======================
+# Compact Dtypes
+# ======================
+# Labels repeated on every row of a country block
+CATEGORICAL_COLUMNS = ("Country", "Market_Tier", "Sovereign_Rating")
+FLOAT_DTYPE = np.float32
+# A float column is downcast only if every value survives the round trip
+# within this relative tolerance
+FLOAT_RTOL = 1e-6
+
+
+def frame_bytes(df):
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+def float_fits(values, dtype=FLOAT_DTYPE, rtol=FLOAT_RTOL):
+    values = np.asarray(values)
+    with np.errstate(over="ignore", invalid="ignore"):
+        narrow = values.astype(dtype)
+    return bool(np.allclose(narrow, values, rtol=rtol, atol=0, equal_nan=True))
+
+
+def compact_dtypes(df, categoricals=CATEGORICAL_COLUMNS, float_dtype=FLOAT_DTYPE, rtol=FLOAT_RTOL):
+    # Target dtype per column; columns already compact are left out
+    dtypes = {}
+    for column in df.columns:
+        dtype = df[column].dtype
+        if column in categoricals:
+            if not isinstance(dtype, pd.CategoricalDtype):
+                dtypes[column] = "category"
+        elif dtype == np.float64:
+            if float_fits(df[column].to_numpy(), float_dtype, rtol):
+                dtypes[column] = float_dtype
+        elif pd.api.types.is_integer_dtype(dtype) and len(df):
+            narrow = pd.to_numeric(df[column], downcast="integer").dtype
+            if narrow != dtype:
+                dtypes[column] = narrow
+    return dtypes
+
+
+def compact_frame(df, categoricals=CATEGORICAL_COLUMNS, float_dtype=FLOAT_DTYPE, rtol=FLOAT_RTOL):
+    dtypes = compact_dtypes(df, categoricals, float_dtype, rtol)
+    return df.astype(dtypes) if dtypes else df
+
+
+# ======================
+# Shared Frames
+# ======================
+def read_only_frame(df):
+    # Copy of df whose numeric and categorical columns sit on read-only
+    # arrays, for frames shared across sessions: an in-place write
+    # (df.loc[...] = x, .to_numpy()[...] = x) raises instead of leaking into
+    # every other session. Adding or replacing a whole column still rebinds
+    # the shared object, so callers copy() before either.
+    columns = {}
+    for column in df.columns:
+        values = df[column].array
+        if isinstance(values, pd.Categorical):
+            codes = values.codes.copy()
+            codes.flags.writeable = False
+            columns[column] = pd.Categorical.from_codes(codes, dtype=values.dtype)
+            continue
+        values = df[column].to_numpy(copy=True)
+        if values.dtype != object:
+            values.flags.writeable = False
+        columns[column] = values
+    return pd.DataFrame(columns, index=df.index, copy=False)
+
+
+# ======================
+# Memory Report
+# ======================
+class MemoryReport:
+    # Deep footprint of each named stage of the data path
+    def __init__(self):
+        self.stages = []
+
+    def record(self, stage, obj):
+        if isinstance(obj, pd.DataFrame):
+            nbytes, rows = frame_bytes(obj), len(obj)
+        else:
+            nbytes, rows = int(np.asarray(obj).nbytes), len(obj)
+        self.stages.append({"Stage": stage, "Rows": rows, "Bytes": nbytes})
+        return obj
+
+    def frame(self):
+        out = pd.DataFrame(self.stages, columns=["Stage", "Rows", "Bytes"])
+        out["MB"] = out["Bytes"] / 2 ** 20
+        return out
+
+
+def pipeline_report(countries=None, years=None, n_extra=0, seed=None):
+    # Imported here so the dtype helpers stay importable on their own
+    import panel_cube
+    import risk_engine
+    import sample_data
+
+    seed = sample_data.SEED if seed is None else seed
+    report = MemoryReport()
+    raw = report.record("panel (object/float64)", sample_data.generate_panel(countries, years, n_extra, seed))
+    panel = report.record("panel (compact)", compact_frame(raw))
+    report.record("derived (float64)", risk_engine.compute_risk_frame(raw))
+    derived = report.record("derived (compact)", risk_engine.compute_risk_frame(panel))
+    report.record("cube values", panel_cube.PanelCube(derived).values)
+    return report.frame()
+
+
+def main(argv=None):
+    import sample_data
+
+    parser = argparse.ArgumentParser(description="Memory footprint of each stage of the panel pipeline.")
+    parser.add_argument("--countries", type=int, default=len(sample_data.COUNTRIES))
+    parser.add_argument("--years", type=int, default=len(sample_data.YEARS))
+    parser.add_argument("--extra", type=int, default=0, help="filler indicators per row")
+    parser.add_argument("--seed", type=int, default=sample_data.SEED)
+    args = parser.parse_args(argv)
+
+    years = list(range(2025 - args.years, 2025))
+    report = pipeline_report(sample_data.synthetic_countries(args.countries), years, args.extra, args.seed)
+    print(report.to_string(index=False, formatters={"MB": "{:.2f}".format}))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,244 @@
+import os
+import pickle
+import subprocess
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+
+# ======================
+# Background Jobs
+# ======================
+# Long-running work (reports, optimisation runs) goes to a shared executor
+# so a rerun only submits and polls; it never waits on the work itself.
+MAX_WORKERS = 2
+RESULT_CACHE_SIZE = 32
+
+# Worker processes alive at once; further process jobs queue for a slot.
+# Each is a fresh interpreter, never a fork: the Streamlit server is
+# multi-threaded, and a forked child inherits any lock another thread held
+# at that moment. multiprocessing's spawn/forkserver are no way out either,
+# since both re-run __main__ in the child, which under Streamlit is the
+# dashboard script itself.
+MAX_PROCESSES = 2
+CHILD_COMMAND = "import jobs; jobs._process_main()"
+
+
+class JobCancelled(Exception):
+    pass
+
+
+class Job:
+    def __init__(self, key=None):
+        self.key = key
+        self.future = None
+        self.progress = 0.0
+        self.message = "Queued"
+        self.submitted_at = time.time()
+        self.finished_at = None
+        self.process = None
+        # Sessions waiting on this job; see JobRunner.detach
+        self.holders = set()
+        self._cancel = threading.Event()
+
+    # ----- called from the worker -----
+    def update(self, fraction, message=None):
+        # Progress callback handed to thread jobs; also the cancellation
+        # point. A thread cannot be stopped from outside, so cancel() only
+        # takes effect at the job's next update() call; long loops (e.g.
+        # the stress chunks) call it once per iteration for that reason.
+        if self._cancel.is_set():
+            raise JobCancelled(self.key)
+        self.progress = min(max(float(fraction), 0.0), 1.0)
+        if message is not None:
+            self.message = message
+
+    # ----- called from the UI -----
+    def cancel(self):
+        self._cancel.set()
+        if self.future is not None:
+            self.future.cancel()
+        if self.process is not None and self.process.poll() is None:
+            self.process.terminate()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    @property
+    def status(self):
+        if self.cancelled:
+            return "cancelled"
+        if self.future is None or not self.future.done():
+            started = (self.progress > 0 or self.process is not None
+                       or (self.future is not None and self.future.running()))
+            return "running" if started else "queued"
+        return "failed" if self.future.exception() is not None else "done"
+
+    def result(self):
+        return self.future.result()
+
+    def error(self):
+        return self.future.exception() if self.future is not None and self.future.done() else None
+
+
+class JobRunner:
+    # One executor per runner; keyed jobs are shared while in flight and
+    # completed results are kept, so an identical request is answered
+    # without running again
+    def __init__(self, executor=None, result_cache_size=RESULT_CACHE_SIZE):
+        self._executor = executor
+        self.result_cache_size = result_cache_size
+        self._done = OrderedDict()
+        self._running = {}
+        self._lock = threading.Lock()
+
+    @property
+    def executor(self):
+        # Created on first submit
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="job")
+        return self._executor
+
+    def cached(self, key):
+        with self._lock:
+            job = self._done.get(key)
+            if job is not None:
+                self._done.move_to_end(key)
+            return job
+
+    def submit(self, fn, *args, key=None, progress=True, holder=None, **kwargs):
+        # progress=True passes job.update as fn's `progress` keyword; process
+        # executors cannot call back, so they run without it. holder (e.g. a
+        # session id) is recorded on the job, for detach() below.
+        if key is not None:
+            hit = self.cached(key)
+            if hit is not None:
+                return hit
+
+        job = Job(key)
+        if progress:
+            kwargs["progress"] = job.update
+        with self._lock:
+            if key is not None:
+                # A live run of the same request is returned rather than
+                # started twice (e.g. a double click, or another session)
+                running = self._running.get(key)
+                if running is not None and not running.cancelled:
+                    if holder is not None:
+                        running.holders.add(holder)
+                    return running
+                self._running[key] = job
+            if holder is not None:
+                job.holders.add(holder)
+        try:
+            job.future = self._launch(job, fn, args, kwargs)
+        except BaseException:
+            self._release(job)
+            raise
+        job.future.add_done_callback(lambda future: self._finished(job))
+        return job
+
+    def detach(self, job, holder):
+        # holder no longer needs job. A shared job is cancelled only once
+        # its last holder has gone; until then it keeps running for the
+        # other sessions. Returns True when the job was cancelled.
+        with self._lock:
+            job.holders.discard(holder)
+            orphaned = not job.holders and self._running.get(job.key) is job
+        if orphaned:
+            job.cancel()
+        return orphaned
+
+    def _launch(self, job, fn, args, kwargs):
+        return self.executor.submit(fn, *args, **kwargs)
+
+    def _release(self, job):
+        with self._lock:
+            if self._running.get(job.key) is job:
+                del self._running[job.key]
+
+    def _finished(self, job):
+        job.finished_at = time.time()
+        if job.key is None or job.cancelled or job.future.cancelled() or job.future.exception() is not None:
+            self._release(job)
+            return
+        job.progress, job.message = 1.0, "Done"
+        with self._lock:
+            # Moved from running to done in one step, so no submit in
+            # between can start a duplicate
+            if self._running.get(job.key) is job:
+                del self._running[job.key]
+            self._done[job.key] = job
+            self._done.move_to_end(job.key)
+            while len(self._done) > self.result_cache_size:
+                self._done.popitem(last=False)
+
+
+# ======================
+# Process Jobs
+# ======================
+def _process_main():
+    # Job process entry: (fn, args, kwargs) pickled on stdin, one
+    # (status, payload) pickle back on stdout. Anything fn prints goes to
+    # stderr so it cannot corrupt the result.
+    out = sys.stdout.buffer
+    sys.stdout = sys.stderr
+    fn, args, kwargs = pickle.load(sys.stdin.buffer)
+    try:
+        result = ("ok", fn(*args, **kwargs))
+    except Exception as exc:
+        result = ("error", exc)
+    try:
+        payload = pickle.dumps(result)
+    except Exception as exc:
+        payload = pickle.dumps(("error", RuntimeError(f"job result does not pickle: {exc!r}")))
+    out.write(payload)
+    out.flush()
+
+
+class ProcessJobRunner(JobRunner):
+    # One worker process per job, so cancel() can terminate a run that is
+    # already executing rather than only a queued one. At most max_processes
+    # run at once; the rest wait queued. Jobs get no progress callback; fn
+    # and its arguments must pickle and fn must be importable by name.
+    def __init__(self, result_cache_size=RESULT_CACHE_SIZE, max_processes=MAX_PROCESSES):
+        super().__init__(result_cache_size=result_cache_size)
+        self._slots = threading.BoundedSemaphore(max_processes)
+
+    def submit(self, fn, *args, key=None, holder=None, **kwargs):
+        return super().submit(fn, *args, key=key, progress=False, holder=holder, **kwargs)
+
+    def _launch(self, job, fn, args, kwargs):
+        # Pickled up front so a bad argument fails the submit, not the
+        # worker; the waiter thread then takes a slot and runs the process
+        request = pickle.dumps((fn, args, kwargs))
+        future = Future()
+        threading.Thread(target=self._run, args=(job, future, request), daemon=True).start()
+        return future
+
+    def _run(self, job, future, request):
+        with self._slots:
+            # Cancelled while queued: Job.cancel() already cancelled future
+            if not future.set_running_or_notify_cancel():
+                return
+            # The child finds this module and fn's module on the same path
+            env = {**os.environ, "PYTHONPATH": os.pathsep.join(p for p in sys.path if p)}
+            job.process = subprocess.Popen([sys.executable, "-c", CHILD_COMMAND], env=env,
+                                           stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+            if job.cancelled:
+                # cancel() landed between the two steps above
+                job.process.terminate()
+            job.message = "Running"
+            out, _ = job.process.communicate(request)
+        try:
+            status, payload = pickle.loads(out)
+        except (EOFError, pickle.UnpicklingError):
+            # Terminated (cancelled) or crashed before sending a result
+            status = "error"
+            payload = JobCancelled(job.key) if job.cancelled else RuntimeError("worker process exited")
+        if status == "ok":
+            future.set_result(payload)
+        else:
+            future.set_exception(payload)
@@ -0,0 +1,194 @@
+import functools
+import hashlib
+import json
+import os
+import threading
+import time
+import types
+from concurrent.futures import Future
+
+import pandas as pd
+
+# ======================
+# Settings
+# ======================
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "macro_cache")
+
+# Panels younger than TTL are served as-is; up to STALE_TTL past that they are
+# still served while a background refresh runs; older ones block on a fetch.
+DEFAULT_TTL = 24 * 3600
+DEFAULT_STALE_TTL = 7 * 24 * 3600
+
+
+def _code_digest(code):
+    # Bytecode, constants (nested code included) and referenced names; stable
+    # across processes, unlike the repr of a code object
+    consts = [_code_digest(c) if isinstance(c, types.CodeType) else repr(c) for c in code.co_consts]
+    body = repr((code.co_code, consts, code.co_names))
+    return hashlib.sha1(body.encode()).hexdigest()[:12]
+
+
+def _value_id(value):
+    # Plain values by repr; anything else (sessions, logs, clients) by
+    # identity, since its repr may change between calls
+    if isinstance(value, (str, bytes, int, float, bool, type(None))):
+        return repr(value)
+    if isinstance(value, (tuple, frozenset)):
+        return f"{type(value).__name__}({', '.join(sorted(map(_value_id, value)))})"
+    if isinstance(value, (types.FunctionType, types.MethodType, functools.partial)):
+        return fetcher_id(value)
+    return f"{type(value).__qualname__}@{id(value):x}"
+
+
+def fetcher_id(fetcher):
+    # Names the data source so panels from different sources (e.g. a test
+    # stand-in and the live API) never share a key. A `cache_key` attribute
+    # on the fetcher takes precedence.
+    if fetcher is None:
+        return None
+    explicit = getattr(fetcher, "cache_key", None)
+    if explicit is not None:
+        return str(explicit)
+    if isinstance(fetcher, functools.partial):
+        args = [_value_id(a) for a in fetcher.args]
+        args += [f"{k}={_value_id(v)}" for k, v in sorted(fetcher.keywords.items())]
+        return f"partial({fetcher_id(fetcher.func)}, {', '.join(args)})"
+
+    if isinstance(fetcher, types.MethodType):
+        return f"{fetcher_id(fetcher.__func__)}:{_value_id(fetcher.__self__)}"
+
+    name = getattr(fetcher, "__qualname__", type(fetcher).__qualname__)
+    name = f"{getattr(fetcher, '__module__', None) or type(fetcher).__module__}.{name}"
+    if not isinstance(fetcher, types.FunctionType):
+        # Callable instance without a cache_key: only this object is known
+        # to be this source
+        return f"{name}@{id(fetcher):x}"
+    if "<" in name:
+        # Lambdas and nested functions share a qualname; their code and
+        # captured values do not
+        captured = [cell.cell_contents for cell in fetcher.__closure__ or ()] + list(fetcher.__defaults__ or ())
+        extra = hashlib.sha1(repr([_value_id(v) for v in captured]).encode()).hexdigest()[:12]
+        return f"{name}@{_code_digest(fetcher.__code__)}.{extra}"
+    return name
+
+
+def panel_key(indicators, economies, years, fetcher=None):
+    parts = {
+        "indicators": sorted(indicators),
+        "economies": sorted(economies),
+        "years": sorted(int(y) for y in years),
+        "fetcher": fetcher_id(fetcher)
+    }
+    return hashlib.sha1(json.dumps(parts).encode()).hexdigest()
+
+
+def frame_digest(frame):
+    return hashlib.sha1(pd.util.hash_pandas_object(frame, index=True).to_numpy().tobytes()).hexdigest()
+
+
+# ======================
+# Disk Cache
+# ======================
+class PanelCache:
+    def __init__(self, cache_dir=CACHE_DIR, ttl=DEFAULT_TTL, stale_ttl=DEFAULT_STALE_TTL, clock=time.time):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._in_flight = {}
+
+    def _paths(self, key):
+        base = os.path.join(self.cache_dir, key)
+        return base + ".pkl", base + ".json"
+
+    def read(self, key):
+        data_path, meta_path = self._paths(key)
+        if not (os.path.exists(data_path) and os.path.exists(meta_path)):
+            return None, None
+        with open(meta_path, encoding="utf-8") as fh:
+            meta = json.load(fh)
+        return pd.read_pickle(data_path), meta
+
+    def write(self, key, frame):
+        # Conditional write: an unchanged panel only gets its timestamp bumped
+        os.makedirs(self.cache_dir, exist_ok=True)
+        data_path, meta_path = self._paths(key)
+        digest = frame_digest(frame)
+
+        meta = None
+        if os.path.exists(meta_path):
+            with open(meta_path, encoding="utf-8") as fh:
+                meta = json.load(fh)
+        if meta is None or meta.get("digest") != digest or not os.path.exists(data_path):
+            tmp = data_path + ".tmp"
+            frame.to_pickle(tmp)
+            os.replace(tmp, data_path)
+
+        tmp = meta_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump({"fetched_at": self.clock(), "digest": digest}, fh)
+        os.replace(tmp, meta_path)
+
+    def age(self, meta):
+        return self.clock() - meta["fetched_at"]
+
+    def get_or_fetch(self, key, fetch):
+        frame, meta = self.read(key)
+        if frame is not None:
+            age = self.age(meta)
+            if age < self.ttl:
+                return frame
+            if age < self.ttl + self.stale_ttl:
+                self.refresh_async(key, fetch)
+                return frame
+
+        # Blocking fetch, shared with any refresh or fetch already in flight
+        # for this key
+        with self._lock:
+            flight = self._in_flight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._in_flight[key] = Future()
+        if leader:
+            self._fetch_into(key, fetch, flight)
+
+        try:
+            return flight.result()
+        except Exception:
+            # Network down: an expired panel still beats no panel
+            if frame is not None:
+                return frame
+            raise
+
+    def refresh_async(self, key, fetch):
+        # One fetch per key at a time; a refresh already in flight is reused
+        with self._lock:
+            running = self._in_flight.get(key)
+            if running is not None:
+                return running
+            flight = self._in_flight[key] = Future()
+        threading.Thread(target=self._fetch_into, args=(key, fetch, flight), daemon=True).start()
+        return flight
+
+    def _fetch_into(self, key, fetch, flight):
+        # A failed refresh keeps the stale copy on disk; the next stale read
+        # retries
+        try:
+            fresh = fetch()
+            self.write(key, fresh)
+        except Exception as exc:
+            with self._lock:
+                self._in_flight.pop(key, None)
+            flight.set_exception(exc)
+        else:
+            with self._lock:
+                self._in_flight.pop(key, None)
+            flight.set_result(fresh)
+
+    def invalidate(self, key=None):
+        if not os.path.isdir(self.cache_dir):
+            return
+        for name in os.listdir(self.cache_dir):
+            if key is None or name.startswith(key):
+                os.remove(os.path.join(self.cache_dir, name))
@@ -0,0 +1,91 @@
+import pandas as pd
+
+import macro_cache
+import macro_fetch
+import wdi_store
+
+INDICATORS = {
+    "GDP": "NY.GDP.MKTP.CD",
+    "Inflation": "FP.CPI.TOTL.ZG",
+    "Credit": "FS.AST.PRVT.GD.ZS"
+}
+
+COUNTRIES = ["SAU","USA","GBR"]
+
+YEARS = range(2015,2024)
+
+_default_cache = None
+
+def default_cache():
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = macro_cache.PanelCache()
+    return _default_cache
+
+def wbgapi_fetcher(series, economies, years):
+    # Fetcher contract: Country, Year and one column per series code
+    import wbgapi as wb
+
+    # An explicit index keeps both dimensions even when only one economy or
+    # one year is requested (wbgapi drops single-valued ones otherwise)
+    raw = wb.data.DataFrame(
+        list(series),
+        economy=list(economies),
+        time=list(years),
+        index=["economy", "time"],
+        columns="series",
+        numericTimeKeys=True
+    )
+
+    raw = raw.reset_index()
+    raw = raw.rename(columns={"economy": "Country", "time": "Year"})
+
+    return raw
+
+def all_economies():
+    import wbgapi as wb
+
+    return [row["id"] for row in wb.economy.list() if not row.get("aggregate")]
+
+def load_macro_data(indicators=None, countries=None, years=YEARS, fetcher=None, cache=None,
+                    max_workers=macro_fetch.MAX_WORKERS):
+    indicators = INDICATORS if indicators is None else indicators
+    countries = COUNTRIES if countries is None else countries
+    fetcher = wbgapi_fetcher if fetcher is None else fetcher
+    cache = default_cache() if cache is None else cache
+
+    # Cache entries are keyed on the underlying source, not the chunked wrapper
+    source = fetcher
+
+    # Large universes are split into economy/indicator chunks fetched in parallel
+    fetcher = macro_fetch.chunked_fetcher(fetcher, max_workers=max_workers)
+
+    codes = list(indicators.values())
+
+    def fetch():
+        return fetcher(codes, countries, years)
+
+    if cache is False:
+        raw = fetch()
+    else:
+        key = macro_cache.panel_key(codes, countries, years, source)
+        raw = cache.get_or_fetch(key, fetch)
+
+    macro_df = raw.rename(columns={code: name for name, code in indicators.items()})
+    macro_df = macro_df[["Country","Year"] + list(indicators)]
+    macro_df = macro_df.dropna()
+
+    return macro_df
+
+def load_local_macro_data(countries=None, years=YEARS):
+    # Same frame as load_macro_data, served from the offline WDI store
+    store = wdi_store.open_store()
+
+    macro_df = store.frame(
+        countries=countries,
+        years=years,
+        indicators=["GDP","Inflation","Credit"]
+    )
+    macro_df = macro_df.dropna().reset_index(drop=True)
+
+    return macro_df
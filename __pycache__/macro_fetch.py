@@ -0,0 +1,89 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import pandas as pd
+
+# ======================
+# Settings
+# ======================
+ECONOMY_CHUNK = 40
+SERIES_CHUNK = 4
+MAX_WORKERS = 8
+RETRIES = 3
+BACKOFF = 0.5
+
+
+def _chunks(items, size):
+    items = list(items)
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+# ======================
+# Fetch Planning
+# ======================
+def plan_chunks(series, economies, economy_chunk=ECONOMY_CHUNK, series_chunk=SERIES_CHUNK):
+    # One request per (series block, economy block)
+    return [
+        (s_block, e_block)
+        for s_block in _chunks(series, series_chunk)
+        for e_block in _chunks(economies, economy_chunk)
+    ]
+
+
+def fetch_with_retry(fetcher, series, economies, years, retries=RETRIES, backoff=BACKOFF, sleep=time.sleep):
+    for attempt in range(retries + 1):
+        try:
+            return fetcher(series, economies, years)
+        except Exception:
+            if attempt == retries:
+                raise
+            # Exponential backoff between attempts: 0.5s, 1s, 2s, ...
+            sleep(backoff * (2 ** attempt))
+
+
+# ======================
+# Concurrent Fetch
+# ======================
+def fetch_panel(fetcher, series, economies, years,
+                max_workers=MAX_WORKERS, economy_chunk=ECONOMY_CHUNK, series_chunk=SERIES_CHUNK,
+                retries=RETRIES, backoff=BACKOFF, on_chunk=None, sleep=time.sleep):
+    series = list(series)
+    years = list(years)
+    plan = plan_chunks(series, economies, economy_chunk, series_chunk)
+    if not plan:
+        return pd.DataFrame(columns=["Country", "Year"] + series)
+
+    # Each chunk is folded into the panel as it lands: rows from other
+    # economy blocks and columns from other series blocks line up on the
+    # (Country, Year) index
+    merged = None
+    done = 0
+
+    # Explicit shutdown rather than a with block: on failure the caller gets
+    # the error without waiting for chunks already in flight, and queued
+    # chunks are cancelled. Running requests finish in the background and
+    # their results are dropped.
+    pool = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        futures = {
+            pool.submit(fetch_with_retry, fetcher, s_block, e_block, years, retries, backoff, sleep): s_block
+            for s_block, e_block in plan
+        }
+        for future in as_completed(futures):
+            part = future.result()
+            part = part.set_index(["Country", "Year"]).reindex(columns=futures[future])
+            merged = part if merged is None else merged.combine_first(part)
+            done += 1
+            if on_chunk is not None:
+                on_chunk(done, len(plan), part)
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    return merged.reindex(columns=series).sort_index().reset_index()
+
+
+def chunked_fetcher(fetcher, **options):
+    # Same contract as the wrapped fetcher, so it drops into load_macro_data
+    def fetch(series, economies, years):
+        return fetch_panel(fetcher, series, economies, years, **options)
+    return fetch
@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+
+
+def _is_sorted(frame):
+    # Sorted by Country then Year, as risk_engine.derived_frame leaves it
+    if not frame["Country"].is_monotonic_increasing:
+        return False
+    same = frame["Country"].to_numpy()[1:] == frame["Country"].to_numpy()[:-1]
+    return bool((np.diff(frame["Year"].to_numpy())[same] > 0).all())
+
+
+# ======================
+# Country x Year x Metric Store
+# ======================
+class PanelCube:
+    # Index over a derived panel: each country's rows are one contiguous
+    # block, so per-country and per-year access is a slice or a take rather
+    # than a boolean scan of the whole frame
+    def __init__(self, frame, metrics=None):
+        if not _is_sorted(frame):
+            frame = frame.sort_values(["Country", "Year"], kind="stable")
+        # An already clean frame is kept as is (e.g. a read-only shared one)
+        self.frame = frame if frame.index.equals(pd.RangeIndex(len(frame))) else frame.reset_index(drop=True)
+
+        codes, countries = pd.factorize(self.frame["Country"], sort=True)
+        self.countries = [str(c) for c in countries]
+        self.country_index = {c: i for i, c in enumerate(self.countries)}
+
+        years = self.frame["Year"].to_numpy()
+        self.years = np.unique(years)
+        self.year_index = {int(y): i for i, y in enumerate(self.years)}
+        y_idx = np.searchsorted(self.years, years)
+
+        # Block bounds per country
+        self.starts = np.searchsorted(codes, np.arange(len(self.countries)), side="left")
+        self.stops = np.searchsorted(codes, np.arange(len(self.countries)), side="right")
+
+        # Row position of every (country, year) cell; -1 where missing
+        self.rows = np.full((len(self.countries), len(self.years)), -1, dtype=np.int64)
+        self.rows[codes, y_idx] = np.arange(len(self.frame))
+
+        if metrics is None:
+            metrics = [c for c in self.frame.select_dtypes("number").columns if c != "Year"]
+        self.metrics = list(metrics)
+        self.metric_index = {m: i for i, m in enumerate(self.metrics)}
+
+        # Same precision as the frame (float32 for a compact panel)
+        dtype = np.result_type(np.float32, *self.frame[self.metrics].dtypes)
+        self.values = np.full((len(self.countries), len(self.years), len(self.metrics)), np.nan, dtype=dtype)
+        self.values[codes, y_idx] = self.frame[self.metrics].to_numpy(dtype=dtype)
+
+        for arr in (self.starts, self.stops, self.rows, self.values):
+            arr.setflags(write=False)
+
+    # ----- frame access -----
+    def country_rows(self, country):
+        c = self.country_index[country]
+        return self.frame.iloc[self.starts[c]:self.stops[c]]
+
+    def latest(self, country):
+        return self.frame.iloc[self.stops[self.country_index[country]] - 1]
+
+    def latest_positions(self, countries=None):
+        # Row position of each country's most recent year, in the order given
+        countries = self.countries if countries is None else countries
+        return self.stops[[self.country_index[c] for c in countries]] - 1
+
+    def latest_rows(self, countries=None):
+        return self.frame.iloc[self.latest_positions(countries)]
+
+    def year_rows(self, year=None):
+        # Cross-section for one year (latest year by default)
+        year = int(self.years[-1]) if year is None else int(year)
+        positions = self.rows[:, self.year_index[year]]
+        return self.frame.iloc[positions[positions >= 0]]
+
+    # ----- cube access -----
+    def metric(self, metric, countries=None, years=None):
+        # Year x Country matrix for one metric
+        countries = self.countries if countries is None else list(countries)
+        c_idx = [self.country_index[c] for c in countries]
+        y_idx = slice(None) if years is None else [self.year_index[int(y)] for y in years]
+        block = self.values[c_idx][:, y_idx, self.metric_index[metric]]
+        index = self.years if years is None else np.asarray(years)
+        return pd.DataFrame(block.T, index=pd.Index(index, name="Year"), columns=countries)
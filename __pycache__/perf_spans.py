@@ -0,0 +1,120 @@
+import json
+import time
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+# ======================
+# Histogram Buckets
+# ======================
+# Upper bounds in seconds (Prometheus convention); the last bucket is +Inf
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+class _NullSpan:
+    # Shared no-op context manager handed out while recording is off
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+NULL_SPAN = _NullSpan()
+
+
+# ======================
+# Span Recorder
+# ======================
+class SpanRecorder:
+    # Per-section latency histograms. While disabled, span() returns the
+    # shared no-op manager, so an instrumented section costs one call.
+    def __init__(self, enabled=False, buckets=BUCKETS):
+        self.enabled = enabled
+        self.buckets = np.asarray(buckets, dtype=float)
+        self.sections = {}
+
+    def span(self, name):
+        if not self.enabled:
+            return NULL_SPAN
+        return self._timed(name)
+
+    @contextmanager
+    def _timed(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started)
+
+    def record(self, name, seconds):
+        section = self.sections.get(name)
+        if section is None:
+            section = self.sections[name] = {
+                "counts": np.zeros(len(self.buckets) + 1, dtype=np.int64),
+                "count": 0, "sum": 0.0, "max": 0.0, "last": 0.0
+            }
+        section["counts"][np.searchsorted(self.buckets, seconds, side="left")] += 1
+        section["count"] += 1
+        section["sum"] += seconds
+        section["max"] = max(section["max"], seconds)
+        section["last"] = seconds
+
+    def reset(self):
+        self.sections.clear()
+
+    # ----- summaries -----
+    def quantile(self, name, q):
+        # Upper bound of the bucket holding the q-quantile
+        section = self.sections[name]
+        cumulative = np.cumsum(section["counts"])
+        idx = int(np.searchsorted(cumulative, q * section["count"], side="left"))
+        return float(self.buckets[idx]) if idx < len(self.buckets) else section["max"]
+
+    def frame(self):
+        rows = [
+            {
+                "Section": name,
+                "Runs": s["count"],
+                "Last (ms)": s["last"] * 1000,
+                "Mean (ms)": s["sum"] / s["count"] * 1000,
+                "p95 ≤ (ms)": self.quantile(name, 0.95) * 1000,
+                "Max (ms)": s["max"] * 1000,
+                "Total (s)": s["sum"]
+            }
+            for name, s in self.sections.items()
+        ]
+        columns = ["Section", "Runs", "Last (ms)", "Mean (ms)", "p95 ≤ (ms)", "Max (ms)", "Total (s)"]
+        return pd.DataFrame(rows, columns=columns).sort_values("Total (s)", ascending=False)
+
+    # ----- export -----
+    def to_dict(self):
+        return {
+            "buckets": self.buckets.tolist(),
+            "sections": {
+                name: {
+                    "count": s["count"], "sum": s["sum"], "max": s["max"], "last": s["last"],
+                    "bucket_counts": s["counts"].tolist()
+                }
+                for name, s in self.sections.items()
+            }
+        }
+
+    def to_json(self):
+        return json.dumps(self.to_dict(), indent=2)
+
+    def to_prometheus(self, metric="dashboard_section_seconds"):
+        lines = [
+            f"# HELP {metric} Wall time of each dashboard section per rerun.",
+            f"# TYPE {metric} histogram"
+        ]
+        for name, s in self.sections.items():
+            label = name.replace("\\", "\\\\").replace('"', '\\"')
+            cumulative = np.cumsum(s["counts"])
+            for bound, count in zip(self.buckets, cumulative):
+                lines.append(f'{metric}_bucket{{section="{label}",le="{bound:g}"}} {count}')
+            lines.append(f'{metric}_bucket{{section="{label}",le="+Inf"}} {cumulative[-1]}')
+            lines.append(f'{metric}_sum{{section="{label}"}} {s["sum"]:.6f}')
+            lines.append(f'{metric}_count{{section="{label}"}} {s["count"]}')
+        return "\n".join(lines) + "\n"
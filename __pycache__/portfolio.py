@@ -0,0 +1,157 @@
+import numpy as np
+
+import risk_engine
+
+# ======================
+# Settings
+# ======================
+MAX_WEIGHT = 0.25
+SHRINKAGE = 0.2
+MV_ITERATIONS = 500
+MV_TOLERANCE = 1e-7
+
+# Risk appetite multipliers scale down this aversion in the mean-variance solve
+BASE_RISK_AVERSION = 0.5
+
+
+def _batch(x):
+    x = np.asarray(x, dtype=float)
+    return x[None, :] if x.ndim == 1 else x
+
+
+def _feasible_cap(cap, n):
+    # A cap below 1/N cannot sum to one; fall back to equal weights
+    return max(cap, 1.0 / n)
+
+
+# ======================
+# Capped Water-Filling
+# ======================
+def capped_weights(scores, cap=MAX_WEIGHT):
+    # Weights proportional to scores, no weight above cap, summing to one.
+    # Markets that hit the cap are frozen and the leftover budget is
+    # re-poured over the rest until nothing exceeds the cap (<= N passes).
+    # Once no positive score is left uncapped, the leftover budget is spread
+    # evenly over the zero-score markets; the feasible cap (>= 1/N) keeps
+    # that even share within the cap.
+    scores = np.clip(_batch(scores), 0, None)
+    n = scores.shape[1]
+    cap = _feasible_cap(cap, n)
+
+    weights = np.zeros_like(scores)
+    capped = np.zeros(scores.shape, dtype=bool)
+    for _ in range(n):
+        budget = 1.0 - capped.sum(axis=1, keepdims=True) * cap
+        free = np.where(capped, 0.0, scores)
+        total = free.sum(axis=1, keepdims=True)
+        uncapped = (~capped).astype(float)
+        even = uncapped / np.maximum(uncapped.sum(axis=1, keepdims=True), 1)
+        share = np.divide(free, total, out=even, where=total > 0)
+        weights = np.where(capped, cap, share * budget)
+
+        over = (weights > cap + 1e-12) & ~capped
+        if not over.any():
+            break
+        capped |= over
+    return weights
+
+
+def inverse_risk_weights(risk_scores, cap=MAX_WEIGHT):
+    return capped_weights(1 / (_batch(risk_scores) + 1), cap)
+
+
+# ======================
+# Mean-Variance
+# ======================
+def growth_covariance(df, countries, column="GDP_Growth", shrinkage=SHRINKAGE):
+    # Country x Country covariance of the growth series, shrunk towards its
+    # diagonal so short histories over many markets stay well conditioned
+    panel = df.pivot_table(index="Year", columns="Country", values=column, observed=True)
+    panel = panel.reindex(columns=countries)
+    values = panel.to_numpy(dtype=float)
+    values = np.where(np.isnan(values), np.nanmean(values, axis=0), values)
+
+    if len(values) < 2:
+        return np.eye(len(countries))
+    cov = np.cov(values, rowvar=False)
+    cov = np.atleast_2d(cov)
+    return (1 - shrinkage) * cov + shrinkage * np.diag(np.diag(cov))
+
+
+def project_capped_simplex(v, cap=MAX_WEIGHT, iterations=60):
+    # Euclidean projection of each row onto {0 <= w <= cap, sum w = 1},
+    # bisecting on the shift tau in w = clip(v - tau, 0, cap)
+    v = _batch(v)
+    cap = _feasible_cap(cap, v.shape[1])
+    lo = v.min(axis=1, keepdims=True) - 1.0
+    hi = v.max(axis=1, keepdims=True)
+    for _ in range(iterations):
+        tau = (lo + hi) / 2
+        total = np.clip(v - tau, 0, cap).sum(axis=1, keepdims=True)
+        lo = np.where(total > 1, tau, lo)
+        hi = np.where(total > 1, hi, tau)
+    return np.clip(v - (lo + hi) / 2, 0, cap)
+
+
+def mean_variance_weights(mu, cov, risk_aversion, cap=MAX_WEIGHT, iterations=MV_ITERATIONS, tol=MV_TOLERANCE):
+    # max mu.w - lambda/2 w'Cw  s.t. box and budget constraints, solved by
+    # projected gradient for a whole batch of lambdas (and mus) at once
+    risk_aversion = np.atleast_1d(np.asarray(risk_aversion, dtype=float))[:, None]
+    mu = np.broadcast_to(_batch(mu), (len(risk_aversion), len(cov)))
+    cov = np.asarray(cov, dtype=float)
+
+    lipschitz = risk_aversion * max(np.linalg.eigvalsh(cov).max(), 1e-12)
+    step = 1.0 / np.maximum(lipschitz, 1e-12)
+    w = project_capped_simplex(np.full(mu.shape, 1.0 / mu.shape[1]), cap)
+    for _ in range(iterations):
+        grad = mu - risk_aversion * (w @ cov)
+        w_next = project_capped_simplex(w + step * grad, cap)
+        converged = np.abs(w_next - w).max() < tol
+        w = w_next
+        if converged:
+            break
+    return w
+
+
+# ======================
+# Batched Allocation
+# ======================
+def optimize_allocations(latest, history, capitals, appetites, method="inverse_risk", cap=MAX_WEIGHT):
+    # One solve per (capital, appetite) pair over every market in `latest`.
+    # Returns weights (configs x markets) and the matching dollar amounts.
+    countries = list(latest["Country"])
+    capitals = np.atleast_1d(np.asarray(capitals, dtype=float))
+    appetites = np.atleast_1d(np.asarray(appetites, dtype=float))
+    capitals, appetites = np.broadcast_arrays(capitals, appetites)
+
+    if method == "mean_variance":
+        mu = risk_engine.expected_return(latest["Risk_Score"].to_numpy())
+        cov = growth_covariance(history, countries)
+        weights = mean_variance_weights(mu, cov, BASE_RISK_AVERSION / appetites, cap)
+    else:
+        base = inverse_risk_weights(latest["Risk_Score"].to_numpy(), cap)
+        weights = np.repeat(base, len(capitals), axis=0)
+
+    return weights, weights * capitals[:, None]
+
+
+def allocation_frame(latest, weights, capital=None):
+    out = latest.copy()
+    out["Allocation"] = np.asarray(weights).ravel() * 100
+    if capital is not None:
+        out["Amount"] = out["Allocation"] / 100 * capital
+    return out
+
+
+def portfolio_metrics(frame):
+    port_risk = (frame["Allocation"] * frame["Risk_Score"]).sum() / 100
+    port_return = (frame["Allocation"] * risk_engine.expected_return(frame["Risk_Score"])).sum() / 100
+    return port_risk, port_return
+
+
+def allocation_run(latest, history, capital, appetite_mult, alloc_mult=1.0, method="inverse_risk"):
+    # Quick Actions optimiser (runs in a worker process): the sidebar's
+    # allocation multiplier scales the per-market cap
+    weights, _ = optimize_allocations(latest, history, capital, appetite_mult,
+                                      method=method, cap=MAX_WEIGHT * alloc_mult)
+    return allocation_frame(latest, weights[0], capital)
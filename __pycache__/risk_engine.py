@@ -0,0 +1,356 @@
+import bisect
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+import risk_features
+import scoring_model
+
+# ======================
+# Scoring Weights
+# ======================
+# The default model from risk_models.json; other configured models are
+# scored side by side through scoring_model.configured_models()
+RISK_WEIGHTS = scoring_model.model_weights()
+
+# Terms that count against the score in both directions
+ABS_TERMS = tuple(t for t, tr in scoring_model.load_config()["terms"].items() if tr == "abs")
+
+# Optional weights on the rolling features; zero unless a caller adds
+# them to the weights
+FACTOR_WEIGHTS = {name: 0.0 for name in risk_features.FEATURES}
+
+
+# ======================
+# NumPy Kernels
+# ======================
+def group_starts(groups):
+    # groups must already be sorted so each group is one contiguous block
+    groups = np.asarray(groups)
+    starts = np.ones(len(groups), dtype=bool)
+    if len(groups) > 1:
+        starts[1:] = groups[1:] != groups[:-1]
+    return starts
+
+
+def growth_rates(values, groups):
+    # Year-over-year % change inside each group, 0 on the first row of a group
+    values = np.asarray(values, dtype=float)
+    prev = np.empty_like(values)
+    prev[0:1] = np.nan
+    prev[1:] = values[:-1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        growth = (values / prev - 1) * 100
+    growth[group_starts(groups)] = 0.0
+    return np.nan_to_num(growth, nan=0.0, posinf=np.inf, neginf=-np.inf)
+
+
+def raw_risk_scores(gdp_growth, inflation, credit_growth, unemployment, weights=None, factors=None):
+    # Elementwise form of the compiled model for arrays of any shape (the
+    # stress engine passes paths x markets); factors: feature name -> values
+    model = scoring_model.compile_weights(weights_key(weights))
+    columns = {
+        "GDP_Growth": gdp_growth,
+        "Inflation": inflation,
+        "Credit_Growth": credit_growth,
+        "Unemployment": unemployment,
+        **(factors or {})
+    }
+    raw = np.zeros(np.shape(gdp_growth))
+    for term, weight, is_abs in zip(model.terms, model.weights[:, 0], model.abs_mask):
+        values = np.nan_to_num(np.asarray(columns[term], dtype=float), nan=0.0)
+        raw = raw + weight * (np.abs(values) if is_abs else values)
+    return raw
+
+
+def factor_terms(weights=None):
+    # Rolling-feature terms with a non-zero weight
+    w = RISK_WEIGHTS if weights is None else weights
+    return [name for name in risk_features.FEATURES if w.get(name, 0)]
+
+
+def normalize_scores(scores):
+    # Min-max onto 0-100; a flat panel sits in the middle
+    scores = np.asarray(scores, dtype=float)
+    if len(scores) == 0:
+        return scores
+    risk_min = scores.min()
+    risk_max = scores.max()
+    if risk_max > risk_min:
+        return (scores - risk_min) / (risk_max - risk_min) * 100
+    return np.full(len(scores), 50.0)
+
+
+# ======================
+# DataFrame Pipeline
+# ======================
+def _group_keys(column):
+    # Category codes compare faster than the labels they stand for
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        return column.cat.codes.to_numpy()
+    return column.to_numpy()
+
+
+def _output_dtype(*columns):
+    # Derived columns keep the precision of their inputs (float32 panels
+    # stay float32); the kernels themselves always run in float64
+    return np.result_type(np.float32, *(c.dtype for c in columns))
+
+
+def add_growth(df):
+    out = df.sort_values(["Country", "Year"]).reset_index(drop=True)
+    country = _group_keys(out["Country"])
+    dtype = _output_dtype(out["GDP"], out["Credit"])
+    out["GDP_Growth"] = growth_rates(out["GDP"].to_numpy(), country).astype(dtype, copy=False)
+    out["Credit_Growth"] = growth_rates(out["Credit"].to_numpy(), country).astype(dtype, copy=False)
+    return out
+
+
+def add_risk_score(df, weights=None):
+    out = df.copy()
+    # One matrix-vector product of the panel with the compiled weights
+    model = scoring_model.compile_weights(weights_key(weights))
+    dtype = _output_dtype(*(out[t] for t in model.terms))
+    out["Risk_Score"] = normalize_scores(model.raw(out)[:, 0]).astype(dtype, copy=False)
+    return out
+
+
+def compute_risk_frame(df, weights=None):
+    # Full derived panel: sorted, growth rates, rolling features and
+    # normalised Risk_Score
+    return add_risk_score(risk_features.add_features(add_growth(df)), weights)
+
+
+# ======================
+# Derived Frame Cache
+# ======================
+# Keyed on (dataset fingerprint, weights) so reruns that do not touch the
+# data are a dictionary lookup; least recently used entries are evicted.
+DERIVED_CACHE_SIZE = 16
+
+_derived_cache = OrderedDict()
+_derived_lock = threading.Lock()
+
+
+def dataset_fingerprint(df):
+    row_hashes = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    digest = hashlib.sha1(row_hashes.tobytes())
+    digest.update(",".join(map(str, df.columns)).encode())
+    return digest.hexdigest()
+
+
+def weights_key(weights=None):
+    return tuple(sorted((RISK_WEIGHTS if weights is None else weights).items()))
+
+
+def derived_frame(df, weights=None, fingerprint=None):
+    key = (fingerprint or dataset_fingerprint(df), weights_key(weights))
+    with _derived_lock:
+        if key in _derived_cache:
+            _derived_cache.move_to_end(key)
+            return _derived_cache[key]
+
+    out = compute_risk_frame(df, weights)
+
+    with _derived_lock:
+        _derived_cache[key] = out
+        _derived_cache.move_to_end(key)
+        while len(_derived_cache) > DERIVED_CACHE_SIZE:
+            _derived_cache.popitem(last=False)
+    return out
+
+
+def clear_derived_cache():
+    with _derived_lock:
+        _derived_cache.clear()
+
+
+# ======================
+# Incremental Updates
+# ======================
+class IncrementalRiskPanel:
+    # Keeps raw scores and their extrema next to the panel so a single
+    # (Country, Year) upsert only touches that row and the next year of the
+    # same country; the panel is renormalised only when the global min/max
+    # actually move. Rows live in append-order column arrays and each
+    # country keeps its own sorted list of years, so an insert appends one
+    # row and bisects one short list. `frame` rebuilds the sorted DataFrame
+    # (original dtypes restored) on first read after a change, so a batch
+    # of upserts pays for that once.
+    SCORE_INPUTS = ("GDP", "Credit", "Inflation", "Unemployment")
+
+    def __init__(self, df, weights=None):
+        self.weights = RISK_WEIGHTS if weights is None else weights
+        if factor_terms(self.weights):
+            raise ValueError("Rolling-feature weights need a full recompute; use derived_frame")
+        frame = add_growth(df)
+        frame["Risk_Score"] = np.zeros(len(frame), dtype=_output_dtype(frame["GDP_Growth"]))
+
+        self._dtypes = frame.dtypes.to_dict()
+        self._n = len(frame)
+        self._columns = {
+            column: (frame[column].astype(object) if self._is_label(column) else frame[column]).to_numpy(copy=True)
+            for column in frame.columns
+        }
+        self._row = {}
+        self._years = {}
+        for row, (country, year) in enumerate(zip(self._columns["Country"], self._columns["Year"].tolist())):
+            self._row[(country, year)] = row
+            self._years.setdefault(country, []).append(year)
+
+        self.raw = self._raw_scores(np.arange(self._n))
+        self.raw_min = self.raw.min() if self._n else np.nan
+        self.raw_max = self.raw.max() if self._n else np.nan
+        self._columns["Risk_Score"][:self._n] = normalize_scores(self.raw)
+        self.full_renormalisations = 0
+        self._frame = None
+
+    def _is_label(self, column):
+        dtype = self._dtypes[column]
+        return isinstance(dtype, pd.CategoricalDtype) or not pd.api.types.is_numeric_dtype(dtype)
+
+    # ----- storage -----
+    @property
+    def frame(self):
+        if self._frame is None:
+            columns = {}
+            for column, values in self._columns.items():
+                dtype = self._dtypes[column]
+                values = pd.Series(values[:self._n])
+                if isinstance(dtype, pd.CategoricalDtype):
+                    # Labels added by upserts become new categories
+                    new = pd.Index(values.dropna().unique()).difference(dtype.categories)
+                    categories = dtype.categories.append(new)
+                    if dtype.categories.is_monotonic_increasing:
+                        categories = categories.sort_values()
+                    dtype = pd.CategoricalDtype(categories, ordered=dtype.ordered)
+                columns[column] = values.astype(dtype)
+            frame = pd.DataFrame(columns)
+            self._frame = frame.sort_values(["Country", "Year"], kind="stable").reset_index(drop=True)
+        return self._frame
+
+    def _append(self, country, year):
+        # Amortised O(1): column arrays grow by doubling
+        if self._n == len(self.raw):
+            capacity = max(2 * self._n, 16)
+            for column, values in self._columns.items():
+                grown = np.empty(capacity, dtype=values.dtype)
+                grown[:self._n] = values[:self._n]
+                grown[self._n:] = None if values.dtype == object else 0
+                self._columns[column] = grown
+            raw = np.full(capacity, np.nan)
+            raw[:self._n] = self.raw[:self._n]
+            self.raw = raw
+
+        row = self._n
+        self._n += 1
+        for column, values in self._columns.items():
+            if values.dtype.kind == "f":
+                values[row] = np.nan
+        self._columns["Country"][row] = country
+        self._columns["Year"][row] = year
+        self._row[(country, year)] = row
+        bisect.insort(self._years.setdefault(country, []), year)
+        return row
+
+    def _neighbour(self, country, year, step):
+        # Row of the previous (step=-1) or next (step=1) year of this country
+        years = self._years[country]
+        i = bisect.bisect_left(years, year) + step
+        return self._row[(country, years[i])] if 0 <= i < len(years) else None
+
+    # ----- scoring -----
+    def _raw_scores(self, rows):
+        c = self._columns
+        return raw_risk_scores(
+            c["GDP_Growth"][rows],
+            c["Inflation"][rows],
+            c["Credit_Growth"][rows],
+            c["Unemployment"][rows],
+            self.weights
+        )
+
+    def _growth_at(self, row, prev, column):
+        if prev is None:
+            return 0.0
+        values = self._columns[column]
+        return float(growth_rates([values[prev], values[row]], [0, 0])[1])
+
+    def upsert(self, country, year, **values):
+        # Returns the (Country, Year) keys whose growth and score were redone
+        key = (country, int(year))
+        unknown = [c for c in values if c not in self._columns or c in ("Country", "Year")]
+        if unknown:
+            raise ValueError(f"Cannot set {unknown} on {key}")
+        row = self._row.get(key)
+        if row is None:
+            missing = [c for c in self.SCORE_INPUTS if c not in values]
+            if missing:
+                raise ValueError(f"New row {key} is missing {missing}")
+            row = self._append(*key)
+        for column, value in values.items():
+            self._columns[column][row] = value
+        self._frame = None
+
+        # Only this year and the following year of the same country change
+        keys, rows = [key], [row]
+        following = self._neighbour(country, key[1], 1)
+        if following is not None:
+            keys.append((country, self._columns["Year"][following].item()))
+            rows.append(following)
+
+        for r, (c, y) in zip(rows, keys):
+            prev = self._neighbour(c, y, -1)
+            self._columns["GDP_Growth"][r] = self._growth_at(r, prev, "GDP")
+            self._columns["Credit_Growth"][r] = self._growth_at(r, prev, "Credit")
+
+        rows = np.asarray(rows)
+        old = self.raw[rows].copy()
+        new = self._raw_scores(rows)
+        self.raw[rows] = new
+
+        # Extrema move when a new value is outside them or a row that held
+        # one of them was revised inwards
+        held_extreme = np.any((old == self.raw_min) | (old == self.raw_max))
+        if new.min() < self.raw_min or new.max() > self.raw_max or held_extreme:
+            raw = self.raw[:self._n]
+            raw_min, raw_max = raw.min(), raw.max()
+            if raw_min != self.raw_min or raw_max != self.raw_max:
+                self.raw_min, self.raw_max = raw_min, raw_max
+                self._columns["Risk_Score"][:self._n] = normalize_scores(raw)
+                self.full_renormalisations += 1
+                return keys
+
+        if self.raw_max > self.raw_min:
+            scores = (new - self.raw_min) / (self.raw_max - self.raw_min) * 100
+        else:
+            scores = np.full(len(rows), 50.0)
+        self._columns["Risk_Score"][rows] = scores
+        return keys
+
+
+# ======================
+# Per-Market Helpers
+# ======================
+RISK_LEVELS = ["LOW", "MODERATE", "HIGH", "CRITICAL"]
+RISK_LEVEL_THRESHOLDS = [30, 50, 70]
+
+
+def risk_label(x):
+    if x < 30: return "LOW", "#10b981"
+    if x < 50: return "MODERATE", "#f59e0b"
+    if x < 70: return "HIGH", "#f97316"
+    return "CRITICAL", "#ef4444"
+
+
+def risk_levels(risk_scores):
+    # Vectorized risk_label names for a whole column
+    idx = np.searchsorted(RISK_LEVEL_THRESHOLDS, risk_scores, side="right")
+    return np.asarray(RISK_LEVELS, dtype=object)[idx]
+
+
+def expected_return(risk_score):
+    return 8 + (100 - risk_score) * 0.15
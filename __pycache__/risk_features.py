@@ -0,0 +1,111 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+
+# ======================
+# Feature Settings
+# ======================
+WINDOW = 5
+# Trend window for the credit-to-GDP gap (trailing mean of the ratio)
+GAP_WINDOW = 10
+
+# Feature columns; how each enters Risk_Score is set in risk_models.json
+FEATURES = ("GDP_Growth_MA", "GDP_Growth_Vol", "Inflation_Vol", "GDP_Drawdown", "Credit_GDP_Gap")
+
+
+# ======================
+# Grouped Layout
+# ======================
+def block_layout(groups):
+    # groups sorted so each group is one contiguous block; returns the
+    # block id and the offset inside the block for every row
+    groups = np.asarray(groups)
+    n = len(groups)
+    starts = np.ones(n, dtype=bool)
+    if n > 1:
+        starts[1:] = groups[1:] != groups[:-1]
+    block = np.cumsum(starts) - 1
+    first = np.flatnonzero(starts)
+    offset = np.arange(n) - first[block]
+    return block, offset
+
+
+def to_blocks(values, block, offset):
+    # Rows -> (blocks x longest block) matrix, NaN-padded on the right
+    n_blocks = int(block[-1]) + 1 if len(block) else 0
+    width = int(offset.max()) + 1 if len(offset) else 0
+    out = np.full((n_blocks, width), np.nan)
+    out[block, offset] = values
+    return out
+
+
+# ======================
+# Window Kernels
+# ======================
+def _windows(matrix, window):
+    padded = np.pad(matrix, ((0, 0), (window - 1, 0)), constant_values=np.nan)
+    return np.lib.stride_tricks.sliding_window_view(padded, window, axis=1)
+
+
+def rolling_mean(matrix, window=WINDOW):
+    # Trailing mean over the last `window` observations of each row
+    with warnings.catch_warnings():
+        # All-NaN windows (padding) are expected and come back as NaN
+        warnings.simplefilter("ignore", RuntimeWarning)
+        return np.nanmean(_windows(matrix, window), axis=-1)
+
+
+def rolling_std(matrix, window=WINDOW):
+    # Sample standard deviation (ddof=1); NaN until two observations exist
+    with warnings.catch_warnings():
+        # All-NaN windows (padding) are expected and come back as NaN
+        warnings.simplefilter("ignore", RuntimeWarning)
+        return np.nanstd(_windows(matrix, window), axis=-1, ddof=1)
+
+
+def drawdown(matrix):
+    # % below the running peak of each row
+    peak = np.fmax.accumulate(matrix, axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return (matrix / peak - 1) * 100
+
+
+# ======================
+# Feature Stage
+# ======================
+def rolling_features(df, window=WINDOW, gap_window=GAP_WINDOW):
+    # One pass over a Country/Year sorted panel with GDP_Growth already set;
+    # returns the feature columns aligned with df's rows
+    country = df["Country"]
+    groups = country.cat.codes.to_numpy() if isinstance(country.dtype, pd.CategoricalDtype) else country.to_numpy()
+    block, offset = block_layout(groups)
+
+    def blocks(column):
+        return to_blocks(df[column].to_numpy(dtype=float), block, offset)
+
+    growth = blocks("GDP_Growth")
+    gdp = blocks("GDP")
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = blocks("Credit") / gdp * 100
+
+    features = {
+        "GDP_Growth_MA": rolling_mean(growth, window),
+        "GDP_Growth_Vol": rolling_std(growth, window),
+        "Inflation_Vol": rolling_std(blocks("Inflation"), window),
+        "GDP_Drawdown": drawdown(gdp),
+        "Credit_GDP_Gap": ratio - rolling_mean(ratio, gap_window)
+    }
+    dtype = np.result_type(np.float32, df["GDP_Growth"].dtype)
+    return pd.DataFrame(
+        {name: values[block, offset].astype(dtype, copy=False) for name, values in features.items()},
+        index=df.index
+    )
+
+
+def add_features(df, window=WINDOW, gap_window=GAP_WINDOW):
+    out = df.copy()
+    features = rolling_features(out, window, gap_window)
+    for name in features.columns:
+        out[name] = features[name]
+    return out
@@ -0,0 +1,177 @@
+import html
+import io
+import zipfile
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+import charts
+import decisions
+import panel_cube
+import portfolio
+import risk_engine
+
+# ======================
+# Report Settings
+# ======================
+REPORT_CSS = """
+body { font-family: Inter, Arial, sans-serif; color: #0f172a; margin: 32px; }
+h1 { color: #1e3a8a; } h2 { color: #1e40af; border-bottom: 2px solid #e2e8f0; padding-bottom: 6px; }
+table { border-collapse: collapse; margin: 12px 0; font-size: 13px; }
+th, td { border: 1px solid #e2e8f0; padding: 6px 10px; text-align: right; }
+th { background: #f1f5f9; } td:first-child, th:first-child { text-align: left; }
+.kpis { display: grid; grid-template-columns: repeat(4, 1fr); gap: 12px; }
+.kpi { background: #f8fafc; border-radius: 12px; padding: 14px; }
+.kpi b { display: block; font-size: 22px; margin-top: 4px; }
+.muted { color: #64748b; }
+"""
+
+
+# ======================
+# Report Tables
+# ======================
+def market_table(latest):
+    # Every market's latest KPIs, scores and verdict in one vectorized pass
+    risk = latest["Risk_Score"].to_numpy(dtype=float)
+    growth = latest["GDP_Growth"].to_numpy(dtype=float)
+    scores = decisions.decision_scores(growth, risk)
+    verdicts = np.array([v["verdict"] for v in decisions.VERDICTS], dtype=object)
+    return pd.DataFrame({
+        "Country": latest["Country"].astype(str).to_numpy(),
+        "Year": latest["Year"].to_numpy(),
+        "Rating": latest["Sovereign_Rating"].astype(str).to_numpy(),
+        "Tier": latest["Market_Tier"].astype(str).to_numpy(),
+        "GDP ($B)": latest["GDP"].to_numpy(dtype=float) / 1e9,
+        "GDP Growth (%)": growth,
+        "Inflation (%)": latest["Inflation"].to_numpy(dtype=float),
+        "Credit Growth (%)": latest["Credit_Growth"].to_numpy(dtype=float),
+        "Risk Score": risk,
+        "Risk Level": risk_engine.risk_levels(risk),
+        "Expected Return (%)": risk_engine.expected_return(risk),
+        "Growth Score": scores["growth_score"],
+        "Safety Score": scores["safety_score"],
+        "Return Score": scores["return_score"],
+        "Final Score": scores["final_score"],
+        "Verdict": verdicts[decisions.verdict_index(scores["final_score"])]
+    }).sort_values("Final Score", ascending=False)
+
+
+def allocation_table(allocation):
+    # allocation: the dashboard's portfolio.allocation_run result, so the
+    # export carries the same cap, method and capital as the Portfolio tab
+    frame = allocation[["Country", "Risk_Score", "GDP_Growth", "Allocation", "Amount"]]
+    frame = frame.assign(Country=frame["Country"].astype(str))
+    return frame.sort_values("Allocation", ascending=False)
+
+
+# ======================
+# HTML
+# ======================
+def _table(frame, digits=2):
+    return frame.round(digits).to_html(index=False, border=0, escape=True)
+
+
+def _figure(fig):
+    return fig.to_html(include_plotlyjs="cdn", full_html=False)
+
+
+def _kpis(items):
+    cells = "".join(f'<div class="kpi"><span class="muted">{html.escape(k)}</span><b>{html.escape(v)}</b></div>'
+                    for k, v in items)
+    return f'<div class="kpis">{cells}</div>'
+
+
+def render_html(settings, markets, selected, allocation, stress_results):
+    risk_level, _ = risk_engine.risk_label(selected["Risk Score"])
+    verdict = decisions.verdict(selected["Final Score"])
+    port_risk, port_return = portfolio.portfolio_metrics(allocation)
+
+    sections = [
+        f"<h1>Complete Risk Report</h1>"
+        f"<p class='muted'>Generated {datetime.now():%Y-%m-%d %H:%M} · {len(markets)} markets · "
+        f"model weights {html.escape(str(dict(settings['weights'])))}</p>",
+
+        "<h2>Settings</h2>" + _table(pd.DataFrame(
+            [(k, str(v)) for k, v in settings.items() if k != "weights"], columns=["Setting", "Value"]
+        )),
+
+        f"<h2>Primary Market: {html.escape(str(selected['Country']))}</h2>" + _kpis([
+            ("GDP", f"${selected['GDP ($B)']:.1f}B"),
+            ("Inflation", f"{selected['Inflation (%)']:.1f}%"),
+            ("Credit Growth", f"{selected['Credit Growth (%)']:.1f}%"),
+            ("Risk Score", f"{selected['Risk Score']:.1f} ({risk_level})")
+        ]) + _kpis([
+            ("Growth Potential", f"{selected['Growth Score']:.0f}"),
+            ("Safety Score", f"{selected['Safety Score']:.0f}"),
+            ("Return Potential", f"{selected['Return Score']:.0f}"),
+            ("Final Verdict", f"{verdict['verdict']} · {verdict['action']}")
+        ]),
+
+        "<h2>Market Scorecard</h2>" + _table(markets),
+
+        "<h2>Portfolio Allocation</h2>"
+        f"<p>Portfolio risk {port_risk:.1f} · expected return {port_return:.1f}%</p>"
+        + _figure(charts.allocation_treemap(allocation[allocation["Allocation"] > 0.05]))
+        + _table(allocation),
+
+        "<h2>Stress Testing</h2>" + _kpis([
+            ("Expected Loss", f"{stress_results['expected_loss']:.2f}%"),
+            (f"VaR {stress_results['alpha']:.0%}", f"{stress_results['var']:.2f}%"),
+            (f"ES {stress_results['alpha']:.0%}", f"{stress_results['es']:.2f}%"),
+            ("Paths", f"{len(stress_results['losses']):,}")
+        ]) + _figure(charts.loss_distribution_figure(
+            stress_results["histogram"], len(stress_results["losses"]), stress_results["var"]
+        )) + _table(stress_results["by_scenario"]),
+
+        "<p class='muted'>CSV appendices: markets.csv, allocation.csv, stress_scenarios.csv, "
+        "loss_histogram.csv, panel_history.csv</p>"
+    ]
+    body = "\n".join(f"<section>{s}</section>" for s in sections)
+    return (f"<!DOCTYPE html><html><head><meta charset='utf-8'><title>Complete Risk Report</title>"
+            f"<style>{REPORT_CSS}</style></head><body>{body}</body></html>")
+
+
+# ======================
+# Report Job
+# ======================
+def build_report(frame, country, settings, allocation, stress_results, progress=None):
+    # Runs on a background worker; returns a zip (report.html + CSV
+    # appendices) as bytes. allocation and stress_results are the ones the
+    # dashboard already shows (portfolio.allocation_run, stress.run_stress),
+    # so nothing is recomputed. progress(fraction, message) is optional.
+    progress = progress or (lambda fraction, message=None: None)
+
+    progress(0.05, "Indexing panel")
+    cube = panel_cube.PanelCube(frame)
+    latest = cube.year_rows()
+
+    progress(0.15, "Scoring markets")
+    markets = market_table(latest)
+    selected = markets[markets["Country"] == str(country)]
+    if selected.empty:
+        raise ValueError(f"{country} has no data for {int(cube.years[-1])}, the panel's latest year")
+    selected = selected.iloc[0]
+
+    progress(0.30, "Formatting allocation")
+    allocation = allocation_table(allocation)
+
+    progress(0.60, "Rendering HTML")
+    report_html = render_html(settings, markets, selected, allocation, stress_results)
+
+    progress(0.90, "Writing appendices")
+    appendices = {
+        "markets.csv": markets,
+        "allocation.csv": allocation,
+        "stress_scenarios.csv": stress_results["by_scenario"],
+        "loss_histogram.csv": stress_results["histogram"],
+        "panel_history.csv": frame
+    }
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_DEFLATED) as bundle:
+        bundle.writestr("report.html", report_html)
+        for name, table in appendices.items():
+            bundle.writestr(name, table.to_csv(index=False))
+
+    progress(1.0, "Report ready")
+    return buffer.getvalue()
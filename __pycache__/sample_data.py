@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+
+# ======================
+# Sample Universe
+# ======================
+COUNTRIES = ['USA', 'UAE', 'KSA', 'UK', 'Germany', 'France', 'Japan', 'China', 'India', 'Brazil']
+YEARS = list(range(2018, 2025))
+SEED = 42
+
+# Market classifications
+MARKET_TIERS = {
+    'USA': 'Core Market', 'UK': 'Core Market', 'Germany': 'Core Market',
+    'UAE': 'Secondary Market', 'KSA': 'Secondary Market', 'France': 'Secondary Market',
+    'Japan': 'Secondary Market', 'China': 'Opportunistic Market',
+    'India': 'Opportunistic Market', 'Brazil': 'Monitor Only'
+}
+
+# Sovereign ratings
+SOVEREIGN_RATINGS = {
+    'USA': 'AAA', 'UK': 'AA', 'Germany': 'AAA',
+    'UAE': 'AA', 'KSA': 'A', 'France': 'AA',
+    'Japan': 'A', 'China': 'A+', 'India': 'BBB',
+    'Brazil': 'BB'
+}
+
+
+def synthetic_countries(n):
+    # Named sample markets first, then generated codes
+    named = COUNTRIES[:n]
+    return named + [f"C{i:05d}" for i in range(len(named), n)]
+
+
+# ======================
+# Panel Generator
+# ======================
+def generate_panel_arrays(countries=None, years=None, n_extra=0, seed=SEED, rng=None):
+    # Country-level levels drawn once, then per-row noise around them,
+    # all as (countries x years) blocks flattened country-major
+    countries = COUNTRIES if countries is None else list(countries)
+    years = YEARS if years is None else list(years)
+    rng = np.random.default_rng(seed) if rng is None else rng
+    n_c, n_y = len(countries), len(years)
+    shape = (n_c, n_y)
+
+    gdp = rng.uniform(200, 2500, n_c)[:, None] * 1e9
+    credit = rng.uniform(50, 1200, n_c)[:, None] * 1e6
+    infl = rng.uniform(2, 5, n_c)[:, None]
+    unemp = rng.uniform(3, 8, n_c)[:, None]
+
+    arrays = {
+        "Country": np.repeat(np.asarray(countries, dtype=object), n_y),
+        "Year": np.tile(np.asarray(years), n_c),
+        "GDP": (gdp * rng.uniform(.9, 1.1, shape)).ravel(),
+        "Credit": (credit * rng.uniform(.9, 1.1, shape)).ravel(),
+        "Inflation": (infl + rng.uniform(-1, 1, shape)).ravel(),
+        "Unemployment": (unemp + rng.uniform(-1, 1, shape)).ravel()
+    }
+
+    # Optional filler indicators for sizing tests
+    if n_extra:
+        levels = rng.uniform(0, 100, (n_c, 1, n_extra))
+        extra = levels + rng.normal(0, 5, (n_c, n_y, n_extra))
+        for k in range(n_extra):
+            arrays[f"Indicator_{k + 1}"] = extra[:, :, k].ravel()
+
+    return arrays
+
+
+def generate_panel(countries=None, years=None, n_extra=0, seed=SEED, rng=None):
+    countries = COUNTRIES if countries is None else list(countries)
+    df = pd.DataFrame(generate_panel_arrays(countries, years, n_extra, seed, rng))
+
+    tiers = np.array([MARKET_TIERS.get(c, "Secondary Market") for c in countries], dtype=object)
+    ratings = np.array([SOVEREIGN_RATINGS.get(c, "BBB") for c in countries], dtype=object)
+    n_y = len(df) // max(len(countries), 1)
+    df["Market_Tier"] = np.repeat(tiers, n_y)
+    df["Sovereign_Rating"] = np.repeat(ratings, n_y)
+    return df
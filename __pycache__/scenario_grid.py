@@ -0,0 +1,165 @@
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+import scoring_model
+
+# ======================
+# Sidebar Inputs
+# ======================
+# Multipliers come from the "grid" section of risk_models.json; option
+# lists follow the config order
+RATING_MULTIPLIERS = scoring_model.grid_multipliers("rating")
+TIER_MULTIPLIERS = scoring_model.grid_multipliers("tier")
+ENV_MULTIPLIERS = scoring_model.grid_multipliers("environment")
+SCENARIO_RISK_ADJUST = scoring_model.grid_multipliers("scenario_adjust")
+APPETITE_MULTIPLIERS = scoring_model.grid_multipliers("appetite")
+
+RATINGS = list(RATING_MULTIPLIERS)
+TIERS = list(TIER_MULTIPLIERS)
+ENVIRONMENTS = list(ENV_MULTIPLIERS)
+DEPTHS = list(range(1, 11))
+LIQUIDITY = list(range(1, 11))
+SCENARIOS = list(SCENARIO_RISK_ADJUST)
+APPETITES = list(APPETITE_MULTIPLIERS)
+
+# Sidebar starting points for depth and liquidity
+DEEP_MARKETS = ['USA', 'UK', 'Germany']
+LIQUID_MARKETS = ['USA', 'UK']
+
+
+def default_depth(country):
+    return 7 if country in DEEP_MARKETS else 5
+
+
+def default_liquidity(country):
+    return 8 if country in LIQUID_MARKETS else 5
+
+
+# ======================
+# Recommendations
+# ======================
+# Composite risk below each threshold falls in that band; the last band
+# catches everything above
+RECOMMENDATION_THRESHOLDS = [0.8, 1.2, 1.6]
+
+RECOMMENDATIONS = [
+    {"name": "AGGRESSIVE EXPANSION", "style": "success", "title": "✅ **AGGRESSIVE EXPANSION**",
+     "detail": "• Allocation: 15-20% of portfolio\n• All sectors\n• Maximum limits", "alloc_mult": 1.3},
+    {"name": "CONTROLLED GROWTH", "style": "info", "title": "📈 **CONTROLLED GROWTH**",
+     "detail": "• Allocation: 8-12% of portfolio\n• Selective sectors\n• Standard limits", "alloc_mult": 1.0},
+    {"name": "SELECTIVE LENDING", "style": "warning", "title": "⚠️ **SELECTIVE LENDING**",
+     "detail": "• Allocation: 4-6% of portfolio\n• High quality only\n• Tightened limits", "alloc_mult": 0.7},
+    {"name": "MONITOR ONLY / EXIT", "style": "error", "title": "🔴 **MONITOR ONLY / EXIT**",
+     "detail": "• Allocation: 0-2% of portfolio\n• Existing exposure only\n• Maximum restrictions", "alloc_mult": 0.3}
+]
+
+# Axis order of every grid tensor
+AXES = {
+    "rating": RATINGS,
+    "tier": TIERS,
+    "environment": ENVIRONMENTS,
+    "depth": DEPTHS,
+    "liquidity": LIQUIDITY,
+    "scenario": SCENARIOS
+}
+
+
+# ======================
+# Grid Build
+# ======================
+def _axis(values, position):
+    shape = [1] * len(AXES)
+    shape[position] = len(values)
+    return np.asarray(values, dtype=float).reshape(shape)
+
+
+@lru_cache(maxsize=1)
+def build_grid():
+    # Every sidebar combination in one broadcast product:
+    # 14 ratings x 4 tiers x 5 environments x 10 depths x 10 liquidity x 4 scenarios
+    composite = (
+        _axis([RATING_MULTIPLIERS[r] for r in RATINGS], 0) *
+        _axis([TIER_MULTIPLIERS[t] for t in TIERS], 1) *
+        _axis([ENV_MULTIPLIERS[e] for e in ENVIRONMENTS], 2) *
+        _axis([(11 - d) / 5 for d in DEPTHS], 3) *
+        _axis([(11 - l) / 5 for l in LIQUIDITY], 4) *
+        _axis([1 + SCENARIO_RISK_ADJUST[s] for s in SCENARIOS], 5)
+    )
+    band = np.searchsorted(RECOMMENDATION_THRESHOLDS, composite, side="right").astype(np.int8)
+    alloc = np.array([r["alloc_mult"] for r in RECOMMENDATIONS])[band]
+
+    for arr in (composite, band, alloc):
+        arr.setflags(write=False)
+    return {"composite": composite, "band": band, "alloc_mult": alloc}
+
+
+def cell(rating, tier, environment, depth, liquidity, scenario):
+    # Sidebar lookups: unknown labels land on the 1.0-multiplier cell
+    # (no scenario adjustment), as the inline formula's .get(..., 1.0) did
+    return (
+        RATINGS.index(rating) if rating in RATINGS else RATINGS.index("BBB"),
+        TIERS.index(tier) if tier in TIERS else TIERS.index("Secondary Market"),
+        ENVIRONMENTS.index(environment) if environment in ENVIRONMENTS else ENVIRONMENTS.index("Strict"),
+        DEPTHS.index(int(depth)),
+        LIQUIDITY.index(int(liquidity)),
+        SCENARIOS.index(scenario) if scenario in SCENARIOS else 0
+    )
+
+
+# ======================
+# Lookups
+# ======================
+def lookup(rating, tier, environment, depth, liquidity, scenario):
+    grid = build_grid()
+    idx = cell(rating, tier, environment, depth, liquidity, scenario)
+    band = int(grid["band"][idx])
+    return {
+        "composite_risk": float(grid["composite"][idx]),
+        "band": band,
+        "alloc_mult": float(grid["alloc_mult"][idx]),
+        "recommendation": RECOMMENDATIONS[band]
+    }
+
+
+def _positions(name, values, axis):
+    idx = pd.Index(axis).get_indexer(np.asarray(values, dtype=object))
+    missing = idx < 0
+    if missing.any():
+        unknown = sorted({str(v) for v in np.asarray(values, dtype=object)[missing]})
+        raise ValueError(f"Unknown {name} {unknown}; expected one of {list(axis)}")
+    return idx
+
+
+def lookup_many(ratings, tiers, environments, depths, liquidity, scenarios):
+    # Vectorized lookup for batches of sidebar states (equal-length
+    # sequences). Unlike lookup, a value outside the grid raises instead of
+    # falling back to a default cell.
+    grid = build_grid()
+    idx = (
+        _positions("rating", ratings, RATINGS),
+        _positions("tier", tiers, TIERS),
+        _positions("environment", environments, ENVIRONMENTS),
+        _positions("depth", np.asarray(depths), DEPTHS),
+        _positions("liquidity", np.asarray(liquidity), LIQUIDITY),
+        _positions("scenario", scenarios, SCENARIOS)
+    )
+    return grid["composite"][idx], grid["band"][idx], grid["alloc_mult"][idx]
+
+
+def surface(x_axis, y_axis, metric="composite", **fixed):
+    # 2-D slice of the grid over two axes with every other axis pinned;
+    # returns (y values, x values, matrix) ready for a heatmap
+    grid = build_grid()[metric]
+    names = list(AXES)
+    pinned = cell(
+        fixed.get("rating", "BBB"), fixed.get("tier", "Secondary Market"),
+        fixed.get("environment", "Moderate"), fixed.get("depth", 5),
+        fixed.get("liquidity", 5), fixed.get("scenario", "Base Case")
+    )
+    index = [slice(None) if name in (x_axis, y_axis) else pinned[i] for i, name in enumerate(names)]
+    matrix = grid[tuple(index)]
+    if names.index(x_axis) < names.index(y_axis):
+        matrix = matrix.T
+    return AXES[y_axis], AXES[x_axis], matrix
@@ -0,0 +1,96 @@
+import json
+import os
+from functools import lru_cache
+
+import numpy as np
+
+# ======================
+# Model Config
+# ======================
+MODEL_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "risk_models.json")
+
+# How a term's column enters the raw score
+TRANSFORMS = ("abs", "level")
+
+
+@lru_cache(maxsize=4)
+def load_config(path=MODEL_FILE):
+    with open(path, encoding="utf-8") as fh:
+        config = json.load(fh)
+    bad = {t: tr for t, tr in config["terms"].items() if tr not in TRANSFORMS}
+    if bad:
+        raise ValueError(f"Unknown term transforms in {path}: {bad}")
+    return config
+
+
+def model_weights(name=None, path=MODEL_FILE):
+    config = load_config(path)
+    return dict(config["models"][config["default_model"] if name is None else name])
+
+
+def grid_multipliers(axis, path=MODEL_FILE):
+    return dict(load_config(path)["grid"][axis])
+
+
+# ======================
+# Compiled Models
+# ======================
+def normalize_columns(raw):
+    # Min-max of every column onto 0-100; a flat column sits in the middle
+    raw = np.asarray(raw, dtype=float)
+    if len(raw) == 0:
+        return raw
+    lo = raw.min(axis=0)
+    span = raw.max(axis=0) - lo
+    flat = span <= 0
+    out = (raw - lo) / np.where(flat, 1.0, span) * 100
+    out[:, flat] = 50.0
+    return out
+
+
+class ScoringModels:
+    # One or more weight sets over a shared term list: weights is a
+    # (terms x models) matrix, so scoring every model is one product of the
+    # (rows x terms) design matrix with it
+    def __init__(self, models, terms):
+        unknown = sorted({t for w in models.values() for t in w} - set(terms))
+        if unknown:
+            raise ValueError(f"Unknown risk weight terms: {unknown}")
+
+        self.names = list(models)
+        self.terms = [t for t in terms if any(models[m].get(t, 0) for m in self.names)]
+        self.weights = np.array(
+            [[float(models[m].get(t, 0.0)) for m in self.names] for t in self.terms]
+        ).reshape(len(self.terms), len(self.names))
+        self.abs_mask = np.array([terms[t] == "abs" for t in self.terms], dtype=bool)
+
+        for arr in (self.weights, self.abs_mask):
+            arr.setflags(write=False)
+
+    def design(self, frame):
+        # Missing values contribute nothing to the score
+        x = np.nan_to_num(frame[self.terms].to_numpy(dtype=float), nan=0.0)
+        x[:, self.abs_mask] = np.abs(x[:, self.abs_mask])
+        return x
+
+    def raw(self, frame):
+        return self.design(frame) @ self.weights
+
+    def scores(self, frame):
+        # (rows x models) normalised scores, each model min-maxed on its own
+        return normalize_columns(self.raw(frame))
+
+
+def compile_models(models, path=MODEL_FILE):
+    return ScoringModels(models, load_config(path)["terms"])
+
+
+@lru_cache(maxsize=1)
+def configured_models():
+    return compile_models(load_config()["models"])
+
+
+@lru_cache(maxsize=64)
+def compile_weights(weights_key):
+    # Single-model compile for a weights_key tuple, kept for reuse
+    return compile_models({"Risk_Score": dict(weights_key)})
@@ -0,0 +1,372 @@
+"""Local HTTP/JSON scoring service over the dashboard's precomputed panel.
+
+    python scoring_service.py --host 127.0.0.1 --port 8000 --workers 4
+
+or under any ASGI server: ``uvicorn scoring_service:app``. Endpoints:
+
+    GET  /health        panel size and scoring models
+    GET  /v1/markets    latest row per market
+    GET  /v1/score      one tuple from the query string (?country=USA&scenario=...)
+    POST /v1/score      {"model": ..., "capital": ..., "items": [{"country": ..., "scenario": ...,
+                         "rating": ..., "appetite": ...}, ...]}
+
+Every number is the dashboard's own: Risk_Score from the derived panel,
+composite risk and the allocation band from scenario_grid, expansion
+amounts and the verdict from decisions. Omitted item fields take the
+sidebar defaults for that market.
+"""
+import argparse
+import json
+import os
+import sys
+from urllib.parse import parse_qsl
+
+import numpy as np
+
+import decisions
+import frame_memory
+import panel_cube
+import risk_engine
+import sample_data
+import scenario_grid
+import scoring_model
+
+DEFAULT_CAPITAL = 2_000_000
+DEFAULT_SCENARIO = "Base Case"
+DEFAULT_APPETITE = "Moderate"
+DEFAULT_ENVIRONMENT = "Moderate"
+MAX_BATCH = 10_000
+MAX_BODY_BYTES = 8 * 2 ** 20
+
+# Read by every server worker, so `--countries`/`--seed` reach processes
+# that uvicorn starts from the import string
+ENV_COUNTRIES = "SCORING_SERVICE_COUNTRIES"
+ENV_SEED = "SCORING_SERVICE_SEED"
+
+ITEM_FIELDS = ("country", "scenario", "rating", "appetite", "tier", "environment", "depth", "liquidity")
+
+
+class RequestError(ValueError):
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+# ======================
+# Scoring
+# ======================
+def _axis_positions(axis):
+    return {value: i for i, value in enumerate(axis)}
+
+
+def _positions(field, values, positions):
+    # Plain dict lookups: per request this is far cheaper than building a
+    # pandas Index for a handful of items
+    idx = []
+    for value in values:
+        try:
+            idx.append(positions.get(value, -1))
+        except TypeError:
+            idx.append(-1)
+    idx = np.asarray(idx, dtype=np.int64)
+    bad = np.flatnonzero(idx < 0)
+    if len(bad):
+        shown = ", ".join(f"items[{i}]={values[i]!r}" for i in bad[:5])
+        raise RequestError(f"Unknown {field}: {shown}" + (f" (+{len(bad) - 5} more)" if len(bad) > 5 else ""))
+    return idx
+
+
+def _levels(field, values):
+    # One finite scalar per item: booleans, lists and objects are rejected
+    # rather than coerced or broadcast into extra dimensions
+    message = f"{field} must be an integer from 1 to 10"
+    nested = [i for i, v in enumerate(values) if isinstance(v, (bool, list, dict))]
+    if nested:
+        raise RequestError(f"{message}: items{nested[:5]}")
+    try:
+        levels = np.asarray(values, dtype=float)
+    except (TypeError, ValueError):
+        raise RequestError(message) from None
+    if levels.shape != (len(values),):
+        raise RequestError(message)
+    bad = np.flatnonzero(~np.isfinite(levels) | (levels < 1) | (levels > 10) | (levels != np.round(levels)))
+    if len(bad):
+        raise RequestError(f"{message}: items{bad[:5].tolist()}")
+    return levels.astype(int)
+
+
+class ScoringService:
+    # Latest row per market as flat arrays, with one Risk_Score column per
+    # configured model; a batch is a few index lookups into those arrays and
+    # the scenario grid, then the shared decisions kernels over whole arrays
+    def __init__(self, frame, models=None):
+        config = scoring_model.load_config()
+        self.models = list(config["models"] if models is None else models)
+        self.default_model = config["default_model"] if config["default_model"] in self.models else self.models[0]
+
+        latest = None
+        self.risk = {}
+        for name in self.models:
+            cube = panel_cube.PanelCube(risk_engine.derived_frame(frame, scoring_model.model_weights(name)))
+            rows = cube.latest_rows()
+            if latest is None:
+                latest = rows
+                self.countries = list(cube.countries)
+            self.risk[name] = rows["Risk_Score"].to_numpy(dtype=float)
+
+        self.years = latest["Year"].to_numpy(dtype=int)
+        self.growth = latest["GDP_Growth"].to_numpy(dtype=float)
+        self.ratings = latest["Sovereign_Rating"].astype(str).to_numpy(dtype=object)
+        self.tiers = latest["Market_Tier"].astype(str).to_numpy(dtype=object)
+        self.depths = np.array([scenario_grid.default_depth(c) for c in self.countries], dtype=int)
+        self.liquidity = np.array([scenario_grid.default_liquidity(c) for c in self.countries], dtype=int)
+
+        self.country_positions = _axis_positions(self.countries)
+        self.axis_positions = {name: _axis_positions(axis) for name, axis in scenario_grid.AXES.items()}
+        self.axis_positions["appetite"] = _axis_positions(scenario_grid.APPETITES)
+        self.appetite_mult = np.array([scenario_grid.APPETITE_MULTIPLIERS[a] for a in scenario_grid.APPETITES])
+        self.verdicts = np.array([v["verdict"] for v in decisions.VERDICTS], dtype=object)
+        self.actions = np.array([v["action"] for v in decisions.VERDICTS], dtype=object)
+        self.recommendations = np.array([r["name"] for r in scenario_grid.RECOMMENDATIONS], dtype=object)
+        self.grid = scenario_grid.build_grid()
+
+    def health(self):
+        return {"status": "ok", "markets": len(self.countries), "models": self.models,
+                "default_model": self.default_model}
+
+    def markets(self, model=None):
+        risk = self.risk[self._model(model)]
+        return [
+            {"country": c, "year": y, "rating": r, "tier": t, "gdp_growth": g, "risk_score": s}
+            for c, y, r, t, g, s in zip(self.countries, self.years.tolist(), self.ratings.tolist(),
+                                        self.tiers.tolist(), self.growth.tolist(), risk.tolist())
+        ]
+
+    def _model(self, model):
+        model = self.default_model if model is None else model
+        if not isinstance(model, str) or model not in self.risk:
+            raise RequestError(f"Unknown model {model!r}; expected one of {self.models}")
+        return model
+
+    def score(self, items, capital=DEFAULT_CAPITAL, model=None):
+        model = self._model(model)
+        if not isinstance(items, list) or not all(isinstance(item, dict) for item in items):
+            raise RequestError("items must be a list of objects")
+        if len(items) > MAX_BATCH:
+            raise RequestError(f"At most {MAX_BATCH} items per request", status=413)
+        if isinstance(capital, bool):
+            raise RequestError("capital must be a number")
+        try:
+            capital = float(capital)
+        except (TypeError, ValueError):
+            raise RequestError("capital must be a number") from None
+        if not (np.isfinite(capital) and capital > 0):
+            raise RequestError("capital must be a positive finite number")
+        if not items:
+            return []
+
+        m_idx = _positions("country", [item.get("country") for item in items], self.country_positions)
+        markets = m_idx.tolist()
+
+        def column(field, default):
+            # Missing or null fields take the default (a per-market array or a constant)
+            per_market = isinstance(default, np.ndarray)
+            return [
+                v if (v := item.get(field)) is not None else (default[m] if per_market else default)
+                for item, m in zip(items, markets)
+            ]
+
+        scenarios = column("scenario", DEFAULT_SCENARIO)
+        ratings = column("rating", self.ratings)
+        appetites = column("appetite", DEFAULT_APPETITE)
+        tiers = column("tier", self.tiers)
+        environments = column("environment", DEFAULT_ENVIRONMENT)
+        depths = _levels("depth", column("depth", self.depths))
+        liquidity = _levels("liquidity", column("liquidity", self.liquidity))
+
+        # Same cell scenario_grid.lookup_many resolves, with errors that
+        # name the offending item
+        axes = self.axis_positions
+        cell = (
+            _positions("rating", ratings, axes["rating"]),
+            _positions("tier", tiers, axes["tier"]),
+            _positions("environment", environments, axes["environment"]),
+            depths - scenario_grid.DEPTHS[0],
+            liquidity - scenario_grid.LIQUIDITY[0],
+            _positions("scenario", scenarios, axes["scenario"])
+        )
+        a_idx = _positions("appetite", appetites, axes["appetite"])
+        composite = self.grid["composite"][cell]
+        band = self.grid["band"][cell]
+        alloc_mult = self.grid["alloc_mult"][cell]
+
+        risk = self.risk[model][m_idx]
+        expansion = decisions.expansion_amounts(risk, capital, self.appetite_mult[a_idx], alloc_mult)
+        scores = decisions.decision_scores(self.growth[m_idx], risk)
+        verdict_idx = decisions.verdict_index(scores["final_score"])
+
+        columns = {
+            "country": [self.countries[m] for m in markets],
+            "year": self.years[m_idx].tolist(),
+            "scenario": scenarios,
+            "rating": ratings,
+            "appetite": appetites,
+            "tier": tiers,
+            "environment": environments,
+            "depth": depths.tolist(),
+            "liquidity": liquidity.tolist(),
+            "risk_score": risk.tolist(),
+            "risk_level": risk_engine.risk_levels(risk).tolist(),
+            "expected_return": risk_engine.expected_return(risk).tolist(),
+            "composite_risk": composite.tolist(),
+            "recommendation": self.recommendations[band].tolist(),
+            "alloc_mult": alloc_mult.tolist(),
+            "defensive_amount": expansion["Defensive"].tolist(),
+            "moderate_amount": expansion["Moderate"].tolist(),
+            "aggressive_amount": expansion["Aggressive"].tolist(),
+            "final_score": scores["final_score"].tolist(),
+            "verdict": self.verdicts[verdict_idx].tolist(),
+            "action": self.actions[verdict_idx].tolist()
+        }
+        names = list(columns)
+        return [dict(zip(names, row)) for row in zip(*columns.values())]
+
+
+def load_service(n_countries=None, seed=None):
+    # Same panel the dashboard loads (compact dtypes, fingerprint-cached
+    # derived frames), optionally widened to a synthetic universe
+    n_countries = int(os.environ.get(ENV_COUNTRIES, len(sample_data.COUNTRIES))) if n_countries is None else n_countries
+    seed = int(os.environ.get(ENV_SEED, sample_data.SEED)) if seed is None else seed
+    panel = sample_data.generate_panel(sample_data.synthetic_countries(n_countries), seed=seed)
+    return ScoringService(frame_memory.compact_frame(panel))
+
+
+# ======================
+# ASGI App
+# ======================
+def _json_bytes(payload):
+    return json.dumps(payload, separators=(",", ":"), allow_nan=False).encode()
+
+
+async def _read_body(receive):
+    chunks, size = [], 0
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            raise RequestError("Client disconnected")
+        chunk = message.get("body", b"")
+        size += len(chunk)
+        if size > MAX_BODY_BYTES:
+            raise RequestError(f"Request body over {MAX_BODY_BYTES} bytes", status=413)
+        chunks.append(chunk)
+        if not message.get("more_body", False):
+            return b"".join(chunks)
+
+
+async def _send(send, status, payload):
+    body = _json_bytes(payload)
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())]
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+class ScoringApp:
+    # Plain ASGI callable, no framework. Scoring runs inline on the event
+    # loop: a batch is a few milliseconds of NumPy, cheaper than handing it
+    # to a thread; scale out with server workers instead.
+    ROUTES = {"/health": ("GET",), "/v1/markets": ("GET",), "/v1/score": ("GET", "POST")}
+
+    def __init__(self, service=None, loader=load_service):
+        self.service = service
+        self.loader = loader
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+        elif scope["type"] == "http":
+            await self._http(scope, receive, send)
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                try:
+                    # Build the panel before the server accepts traffic
+                    if self.service is None:
+                        self.service = self.loader()
+                except Exception as exc:
+                    await send({"type": "lifespan.startup.failed", "message": repr(exc)})
+                    return
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def _http(self, scope, receive, send):
+        path, method = scope["path"].rstrip("/") or "/", scope["method"]
+        if path not in self.ROUTES:
+            return await _send(send, 404, {"error": f"No route {path}"})
+        if method not in self.ROUTES[path]:
+            return await _send(send, 405, {"error": f"{method} not allowed on {path}"})
+
+        if self.service is None:
+            # Servers without lifespan support load on first request
+            self.service = self.loader()
+        try:
+            if path == "/health":
+                payload = self.service.health()
+            elif path == "/v1/markets":
+                query = dict(parse_qsl(scope.get("query_string", b"").decode()))
+                payload = {"markets": self.service.markets(query.get("model"))}
+            elif method == "GET":
+                query = dict(parse_qsl(scope.get("query_string", b"").decode()))
+                item = {k: query[k] for k in ITEM_FIELDS if k in query}
+                results = self.service.score([item], query.get("capital", DEFAULT_CAPITAL), query.get("model"))
+                payload = results[0]
+            else:
+                try:
+                    request = json.loads(await _read_body(receive))
+                except (UnicodeDecodeError, json.JSONDecodeError) as exc:
+                    raise RequestError(f"Invalid JSON body: {exc}") from None
+                if not isinstance(request, dict):
+                    raise RequestError("Body must be a JSON object with an items list")
+                results = self.service.score(request.get("items", []),
+                                             request.get("capital", DEFAULT_CAPITAL), request.get("model"))
+                payload = {"count": len(results), "results": results}
+        except RequestError as exc:
+            return await _send(send, exc.status, {"error": str(exc)})
+        await _send(send, 200, payload)
+
+
+app = ScoringApp()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve dashboard risk scores over HTTP/JSON.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=1, help="server processes, each with its own panel")
+    parser.add_argument("--countries", type=int, default=len(sample_data.COUNTRIES),
+                        help="synthetic universe size (the named sample markets come first)")
+    parser.add_argument("--seed", type=int, default=sample_data.SEED)
+    args = parser.parse_args(argv)
+
+    try:
+        import uvicorn
+    except ImportError:
+        print("uvicorn is not installed; run `pip install uvicorn` or serve scoring_service:app "
+              "with another ASGI server", file=sys.stderr)
+        return 1
+
+    os.environ[ENV_COUNTRIES] = str(args.countries)
+    os.environ[ENV_SEED] = str(args.seed)
+    uvicorn.run("scoring_service:app", host=args.host, port=args.port, workers=args.workers,
+                log_level="warning", access_log=False)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
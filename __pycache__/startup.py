@@ -0,0 +1,257 @@
+"""Cold start for the dashboard: deferred imports, cache warm-up and a
+startup timeline.
+
+    python startup.py serve [--no-warmup] [-- <streamlit run options>]
+    python startup.py measure --runs 3 --release v1.4 --output startup.jsonl
+
+`serve` runs the dashboard headlessly once per tab so the process-wide
+st.cache_* entries (panel, derived frames, cube, stress results, figures)
+exist before the Streamlit server in the same process accepts traffic.
+`measure` times cold imports, the first (cold) and warm runs in fresh
+interpreters and appends one JSON line per run, so time-to-first-paint
+can be tracked across releases.
+"""
+import argparse
+import importlib
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import types
+from datetime import datetime, timezone
+
+DASHBOARD = os.path.join(os.path.dirname(os.path.abspath(__file__)), "financial.py")
+WARMUP_TABS = ["market", "balanced", "portfolio", "risk", "compare"]
+WARMUP_TIMEOUT = 120
+DEFAULT_RUNS = 3
+
+# Appended to by `serve` once warm-up finishes, when set
+ENV_STARTUP_LOG = "DASHBOARD_STARTUP_LOG"
+ENV_RELEASE = "DASHBOARD_RELEASE"
+
+
+# ======================
+# Deferred Imports
+# ======================
+class DeferredModule(types.ModuleType):
+    # Stand-in bound where the module would be; the real import runs on the
+    # first public attribute access. It stays out of sys.modules, because
+    # Streamlit's source watcher and inspect.getmodule read __file__ off
+    # every entry there, which would trigger the import straight away.
+    def __init__(self, name):
+        super().__init__(name)
+        self._module = None
+
+    def __getattr__(self, attr):
+        # Reached only for names the stand-in does not have itself
+        if attr.startswith("__"):
+            raise AttributeError(attr)
+        if self._module is None:
+            self._module = importlib.import_module(self.__name__)
+        return getattr(self._module, attr)
+
+
+def lazy_import(name):
+    return sys.modules.get(name) or DeferredModule(name)
+
+
+# ======================
+# Startup Timeline
+# ======================
+def process_started():
+    # Wall-clock creation time of this process from /proc (Linux); falls
+    # back to the import of this module elsewhere
+    try:
+        with open("/proc/self/stat", encoding="ascii") as fh:
+            ticks = float(fh.read().rsplit(")", 1)[1].split()[19])
+        with open("/proc/stat", encoding="ascii") as fh:
+            boot = next(float(line.split()[1]) for line in fh if line.startswith("btime"))
+        return boot + ticks / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, IndexError, StopIteration):
+        return time.time()
+
+
+class StartupTimeline:
+    # Process-wide, like the derived-frame cache: named marks in seconds
+    # since process start, plus each session's first complete run
+    def __init__(self, started=None):
+        self.started = process_started() if started is None else started
+        self.marks = {}
+        self.first_paint = None
+        self.session_paints = []
+
+    def elapsed(self):
+        return time.time() - self.started
+
+    def mark(self, name):
+        self.marks[name] = self.elapsed()
+        return self.marks[name]
+
+    def paint(self, run_seconds):
+        # Called once per session at the end of its first run; the first
+        # call in the process is time-to-first-paint
+        if self.first_paint is None:
+            self.first_paint = self.elapsed()
+        self.session_paints.append(run_seconds)
+
+    def to_dict(self):
+        paints = self.session_paints
+        return {
+            "process_started": datetime.fromtimestamp(self.started, timezone.utc).isoformat(),
+            "marks": dict(self.marks),
+            "first_paint_s": self.first_paint,
+            "sessions": len(paints),
+            "first_session_run_s": paints[0] if paints else None,
+            "last_session_run_s": paints[-1] if paints else None
+        }
+
+
+TIMELINE = StartupTimeline()
+
+
+def append_log(path, record):
+    with open(path, "a", encoding="utf-8") as fh:
+        fh.write(json.dumps(record) + "\n")
+
+
+def _meta(release):
+    import numpy as np
+    import pandas as pd
+    import streamlit as st
+    return {
+        "release": release,
+        "recorded_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "streamlit": st.__version__,
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "platform": platform.platform()
+    }
+
+
+# ======================
+# Warm-Up
+# ======================
+def warm_up(script=DASHBOARD, tabs=WARMUP_TABS, timeout=WARMUP_TIMEOUT):
+    # One headless session per tab, default sidebar. st.cache_resource and
+    # st.cache_data are process-wide, so the server started afterwards in
+    # this process finds every entry filled. Returns one row per run.
+    from streamlit.testing.v1 import AppTest
+
+    rows = []
+    for tab in tabs:
+        app = AppTest.from_file(script, default_timeout=timeout)
+        app.session_state["active_tab"] = tab
+        started = time.perf_counter()
+        app.run()
+        rows.append({
+            "tab": tab,
+            "run_s": time.perf_counter() - started,
+            "errors": [e.message for e in app.exception]
+        })
+        TIMELINE.mark(f"warmup:{tab}")
+    return rows
+
+
+def measure_once(script=DASHBOARD):
+    # Cold imports, the first (cold) run of each tab, then one warm rerun,
+    # all inside this fresh interpreter
+    started = time.perf_counter()
+    import streamlit  # noqa: F401
+    import pandas  # noqa: F401
+    imports = time.perf_counter() - started
+
+    cold = warm_up(script)
+    warm = warm_up(script, tabs=WARMUP_TABS[:1])
+    return {
+        "imports_s": imports,
+        "cold_runs": cold,
+        "warm_run_s": warm[0]["run_s"],
+        "first_paint_s": TIMELINE.first_paint,
+        "warm_up_s": TIMELINE.marks[f"warmup:{WARMUP_TABS[-1]}"],
+        "errors": sum(len(row["errors"]) for row in cold + warm)
+    }
+
+
+# ======================
+# Commands
+# ======================
+def serve(args):
+    TIMELINE.mark("imports")
+    if not args.no_warmup:
+        rows = warm_up(args.script)
+        for row in rows:
+            status = "ok" if not row["errors"] else f"{len(row['errors'])} error(s): {row['errors'][0]}"
+            print(f"warm-up {row['tab']:<10} {row['run_s']:.2f}s {status}", file=sys.stderr)
+        TIMELINE.mark("warm")
+        log = os.environ.get(ENV_STARTUP_LOG)
+        if log:
+            append_log(log, {**_meta(os.environ.get(ENV_RELEASE, "dev")), "serve": TIMELINE.to_dict(),
+                             "warm_up": rows})
+
+    from streamlit.web import cli
+    sys.argv = ["streamlit", "run", args.script, *args.streamlit_args]
+    return cli.main()
+
+
+def measure(args):
+    records = []
+    for run in range(args.runs):
+        # A fresh interpreter per run, so every import and cache is cold
+        proc = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "_measure-once", "--script", args.script],
+            capture_output=True, text=True, check=False
+        )
+        if proc.returncode != 0:
+            print(proc.stderr, file=sys.stderr)
+            return proc.returncode
+        result = json.loads(proc.stdout.strip().splitlines()[-1])
+        records.append({**_meta(args.release), "run": run, **result})
+        print(f"run {run}: imports {result['imports_s']:.2f}s, first paint {result['first_paint_s']:.2f}s, "
+              f"warm-up {result['warm_up_s']:.2f}s, warm rerun {result['warm_run_s']:.2f}s", file=sys.stderr)
+
+    if args.output:
+        for record in records:
+            append_log(args.output, record)
+        print(f"{len(records)} startup records -> {args.output}")
+    else:
+        print(json.dumps(records, indent=2))
+    return 1 if any(r["errors"] for r in records) else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Warm up and serve the dashboard, or measure its cold start.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve_cmd = commands.add_parser("serve", help="warm the caches, then start the Streamlit server")
+    serve_cmd.add_argument("--script", default=DASHBOARD)
+    serve_cmd.add_argument("--no-warmup", action="store_true")
+    serve_cmd.add_argument("streamlit_args", nargs=argparse.REMAINDER,
+                           help="passed to `streamlit run` (after --)")
+
+    measure_cmd = commands.add_parser("measure", help="time cold start in fresh interpreters")
+    measure_cmd.add_argument("--script", default=DASHBOARD)
+    measure_cmd.add_argument("--runs", type=int, default=DEFAULT_RUNS)
+    measure_cmd.add_argument("--release", default=os.environ.get(ENV_RELEASE, "dev"))
+    measure_cmd.add_argument("--output", help="append JSON lines here instead of printing")
+
+    once_cmd = commands.add_parser("_measure-once")
+    once_cmd.add_argument("--script", default=DASHBOARD)
+
+    args = parser.parse_args(argv)
+    if args.command == "serve":
+        args.streamlit_args = [a for a in args.streamlit_args if a != "--"]
+        return serve(args)
+    if args.command == "measure":
+        return measure(args)
+    print(json.dumps(measure_once(args.script)))
+    return 0
+
+
+if __name__ == "__main__":
+    # The dashboard's `import startup` must see this module's TIMELINE,
+    # not a second copy
+    sys.modules.setdefault("startup", sys.modules[__name__])
+    sys.exit(main())
@@ -0,0 +1,182 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+import risk_engine
+
+# ======================
+# Scenarios
+# ======================
+# Regime mix and mean shocks (percentage points) applied to each market's
+# latest GDP growth, inflation and credit growth
+SCENARIOS = {
+    "Base Case": {"probability": 0.60, "gdp": 0.0, "inflation": 0.0, "credit": 0.0},
+    "Mild Recession": {"probability": 0.25, "gdp": -3.0, "inflation": 1.0, "credit": -5.0},
+    "Severe Recession": {"probability": 0.10, "gdp": -8.0, "inflation": 2.0, "credit": -15.0},
+    "Inflation Shock": {"probability": 0.05, "gdp": -2.0, "inflation": 6.0, "credit": -3.0}
+}
+
+# Shock volatility: common (per path) and idiosyncratic (per market)
+COMMON_VOL = {"gdp": 1.5, "inflation": 0.8, "credit": 3.0}
+IDIO_VOL = {"gdp": 1.0, "inflation": 0.5, "credit": 2.0}
+
+# Okun-style pass-through from GDP shock to unemployment
+UNEMPLOYMENT_BETA = -0.3
+
+# Loss model: PD rises convexly with the stressed Risk_Score
+BASE_PD = 0.005
+MAX_PD = 0.20
+LGD = 0.45
+
+N_PATHS = 100_000
+MEMORY_BUDGET = 64 * 1024 ** 2
+WORK_ARRAYS = 12
+ALPHA = 0.99
+HISTOGRAM_BINS = 60
+
+
+# ======================
+# Inputs
+# ======================
+def market_inputs(df, weights=None):
+    # Latest row per market plus the panel's raw-score range under the same
+    # weights, so stressed scores land on the dashboard's 0-100 scale.
+    # Rolling-feature terms enter at their latest level and are not shocked.
+    latest = df.sort_values(["Country", "Year"]).groupby("Country", observed=True).tail(1)
+    terms = risk_engine.factor_terms(weights)
+    raw = risk_engine.raw_risk_scores(
+        df["GDP_Growth"].to_numpy(),
+        df["Inflation"].to_numpy(),
+        df["Credit_Growth"].to_numpy(),
+        df["Unemployment"].to_numpy(),
+        weights=weights,
+        factors={name: df[name].to_numpy() for name in terms}
+    )
+    return {
+        "countries": latest["Country"].to_numpy(),
+        "gdp_growth": latest["GDP_Growth"].to_numpy(dtype=float),
+        "inflation": latest["Inflation"].to_numpy(dtype=float),
+        "credit_growth": latest["Credit_Growth"].to_numpy(dtype=float),
+        "unemployment": latest["Unemployment"].to_numpy(dtype=float),
+        "factors": {name: latest[name].to_numpy(dtype=float) for name in terms},
+        "raw_min": float(raw.min()),
+        "raw_max": float(raw.max())
+    }
+
+
+def chunk_size(n_markets, memory_budget=MEMORY_BUDGET):
+    return max(1, int(memory_budget // (max(n_markets, 1) * 8 * WORK_ARRAYS)))
+
+
+# ======================
+# Simulation Kernel
+# ======================
+def default_of(scores):
+    return BASE_PD + (MAX_PD - BASE_PD) * (np.clip(scores, 0, 100) / 100) ** 2
+
+
+def simulate_chunk(inputs, exposures, n_paths, seed, weights=None):
+    # Losses (fraction of total exposure) and regime index for n_paths
+    rng = np.random.default_rng(seed)
+    names = list(SCENARIOS)
+    probs = np.array([SCENARIOS[s]["probability"] for s in names])
+    regimes = rng.choice(len(names), size=n_paths, p=probs / probs.sum())
+
+    n = len(exposures)
+    shocked = {}
+    for factor in ("gdp", "inflation", "credit"):
+        means = np.array([SCENARIOS[s][factor] for s in names])[regimes][:, None]
+        common = rng.normal(0, COMMON_VOL[factor], (n_paths, 1))
+        idio = rng.normal(0, IDIO_VOL[factor], (n_paths, n))
+        shocked[factor] = means + common + idio
+    unemployment = inputs["unemployment"] + UNEMPLOYMENT_BETA * shocked["gdp"]
+
+    raw = risk_engine.raw_risk_scores(
+        inputs["gdp_growth"] + shocked["gdp"],
+        inputs["inflation"] + shocked["inflation"],
+        inputs["credit_growth"] + shocked["credit"],
+        unemployment,
+        weights=weights,
+        factors=inputs["factors"]
+    )
+    span = inputs["raw_max"] - inputs["raw_min"]
+    scores = (raw - inputs["raw_min"]) / span * 100 if span > 0 else np.full(raw.shape, 50.0)
+
+    exposure_weights = np.asarray(exposures, dtype=float)
+    exposure_weights = exposure_weights / exposure_weights.sum()
+    losses = (default_of(scores) * LGD) @ exposure_weights
+    return losses, regimes.astype(np.int8)
+
+
+def _simulate_task(args):
+    return simulate_chunk(*args)
+
+
+# ======================
+# Engine
+# ======================
+def run_stress(df, exposures=None, n_paths=N_PATHS, seed=0, memory_budget=MEMORY_BUDGET,
+               processes=None, alpha=ALPHA, weights=None, progress=None):
+    # weights: the scoring model df was scored with (default model if None).
+    # progress(fraction) is called after every chunk; a job's update() raises
+    # there once the job is cancelled, which stops the run between chunks.
+    progress = progress or (lambda fraction: None)
+    inputs = market_inputs(df, weights)
+    n = len(inputs["countries"])
+    exposures = np.ones(n) if exposures is None else np.asarray(exposures, dtype=float)
+
+    size = chunk_size(n, memory_budget)
+    sizes = [min(size, n_paths - start) for start in range(0, n_paths, size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    tasks = [(inputs, exposures, k, s, weights) for k, s in zip(sizes, seeds)]
+
+    parts = []
+    if processes and len(tasks) > 1:
+        pool = ProcessPoolExecutor(max_workers=processes)
+        try:
+            for part in pool.map(_simulate_task, tasks):
+                parts.append(part)
+                progress(len(parts) / len(tasks))
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+    else:
+        for task in tasks:
+            parts.append(_simulate_task(task))
+            progress(len(parts) / len(tasks))
+
+    losses = np.concatenate([p[0] for p in parts]) * 100
+    regimes = np.concatenate([p[1] for p in parts])
+    return summarize(losses, regimes, alpha)
+
+
+def summarize(losses, regimes, alpha=ALPHA):
+    var = float(np.quantile(losses, alpha))
+    tail = losses[losses >= var]
+    names = list(SCENARIOS)
+
+    rows = []
+    for i, name in enumerate(names):
+        hit = regimes == i
+        expected = float(losses[hit].mean()) if hit.any() else 0.0
+        share = float(hit.mean() * 100)
+        rows.append({
+            "Scenario": name,
+            "Expected Loss": expected,
+            "Probability": share,
+            "Weighted Loss": expected * share / 100
+        })
+
+    # Binned here so charts never ship every path to the browser
+    counts, edges = np.histogram(losses, bins=HISTOGRAM_BINS)
+
+    return {
+        "losses": losses,
+        "histogram": pd.DataFrame({"Loss": (edges[:-1] + edges[1:]) / 2, "Paths": counts}),
+        "regimes": regimes,
+        "expected_loss": float(losses.mean()),
+        "var": var,
+        "es": float(tail.mean()) if len(tail) else var,
+        "alpha": alpha,
+        "by_scenario": pd.DataFrame(rows)
+    }
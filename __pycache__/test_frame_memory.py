@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import frame_memory
+import panel_cube
+import risk_engine
+import sample_data
+
+
+@pytest.fixture
+def frozen():
+    return frame_memory.read_only_frame(frame_memory.compact_frame(sample_data.generate_panel()))
+
+
+# ======================
+# Shared Frames
+# ======================
+def write_float(df):
+    df.loc[0, "GDP"] = 1.0
+
+
+def write_int(df):
+    df.iloc[0, df.columns.get_loc("Year")] = 1999
+
+
+def write_masked(df):
+    df.loc[df["Inflation"] > 0, "Inflation"] = 0.0
+
+
+def write_categorical(df):
+    df.loc[0, "Country"] = "USA"
+
+
+def write_array(df):
+    df["Unemployment"].to_numpy()[0] = 0.0
+
+
+@pytest.mark.parametrize("write", [write_float, write_int, write_masked, write_categorical, write_array])
+def test_in_place_writes_raise(frozen, write):
+    before = frozen.copy(deep=True)
+    with pytest.raises(ValueError, match="read-only"):
+        write(frozen)
+    pd.testing.assert_frame_equal(frozen, before)
+
+
+def test_copy_is_writable(frozen):
+    mine = frozen.copy()
+    mine.loc[0, "GDP"] = 1.0
+    mine.loc[0, "Country"] = "USA"
+    mine["Extra"] = 1
+
+    assert mine.loc[0, "GDP"] == 1.0
+    assert "Extra" not in frozen
+    assert frozen.loc[0, "GDP"] != 1.0
+
+
+def test_derived_frame_reads_a_frozen_panel(frozen):
+    thawed = frame_memory.compact_frame(sample_data.generate_panel())
+    derived = frame_memory.read_only_frame(risk_engine.compute_risk_frame(frozen))
+
+    pd.testing.assert_frame_equal(derived, risk_engine.compute_risk_frame(thawed))
+    assert not derived["Risk_Score"].to_numpy().flags.writeable
+    assert np.isfinite(derived["Risk_Score"].to_numpy()).all()
+
+
+def test_panel_cube_keeps_the_read_only_frame():
+    shared = frame_memory.read_only_frame(risk_engine.compute_risk_frame(sample_data.generate_panel()))
+    cube = panel_cube.PanelCube(shared)
+
+    assert cube.frame is shared
+    with pytest.raises(ValueError, match="read-only"):
+        write_float(cube.frame)
@@ -0,0 +1,175 @@
+import sys
+import threading
+import time
+import types
+
+import pytest
+
+import jobs
+import risk_engine
+import sample_data
+import stress
+
+
+def wait_for(predicate, timeout=10):
+    deadline = time.time() + timeout
+    while not predicate():
+        if time.time() > deadline:
+            raise AssertionError("timed out")
+        time.sleep(0.01)
+
+
+def gated(gate, progress):
+    # Thread job that polls for cancellation until the gate opens
+    while not gate.wait(0.01):
+        progress(0.5)
+    return "done"
+
+
+def sleep_and_return(value, seconds):
+    # Process job: must be importable by name in the child
+    time.sleep(seconds)
+    return value
+
+
+def fail_with(message):
+    raise ValueError(message)
+
+
+@pytest.fixture
+def runner():
+    return jobs.JobRunner()
+
+
+@pytest.fixture
+def gate():
+    # Always opened at teardown, so no pool thread outlives its test
+    gate = threading.Event()
+    yield gate
+    gate.set()
+
+
+# ======================
+# Shared Jobs
+# ======================
+def test_two_sessions_share_a_key(runner, gate):
+    first = runner.submit(gated, gate, key="k", holder="session-a")
+    second = runner.submit(gated, gate, key="k", holder="session-b")
+
+    assert first is second
+    assert first.holders == {"session-a", "session-b"}
+
+
+def test_detach_keeps_job_running_for_other_holders(runner, gate):
+    job = runner.submit(gated, gate, key="k", holder="session-a")
+    runner.submit(gated, gate, key="k", holder="session-b")
+
+    # Session A moves on to another key; B still waits on this run
+    assert not runner.detach(job, "session-a")
+    assert not job.cancelled
+
+    gate.set()
+    assert job.future.result(5) == "done"
+    wait_for(lambda: runner.cached("k") is job)
+
+
+def test_last_holder_detaching_cancels(runner, gate):
+    job = runner.submit(gated, gate, key="k", holder="session-a")
+    runner.submit(gated, gate, key="k", holder="session-b")
+
+    runner.detach(job, "session-a")
+    assert runner.detach(job, "session-b")
+
+    with pytest.raises(jobs.JobCancelled):
+        job.future.result(5)
+    assert job.status == "cancelled"
+
+    # The next request for the key starts a fresh run
+    gate.set()
+    again = runner.submit(gated, gate, key="k", holder="session-a")
+    assert again is not job
+    assert again.future.result(5) == "done"
+
+
+def test_detach_after_finish_does_not_cancel(runner, gate):
+    gate.set()
+    job = runner.submit(gated, gate, key="k", holder="session-a")
+    job.future.result(5)
+    wait_for(lambda: runner.cached("k") is job)
+
+    assert not runner.detach(job, "session-a")
+    assert job.status == "done"
+
+
+# ======================
+# Process Jobs
+# ======================
+def test_process_job_does_not_rerun_main(monkeypatch, tmp_path):
+    # Under Streamlit __main__ is the dashboard script; a spawned child
+    # would run it again
+    script = tmp_path / "dashboard.py"
+    script.write_text("raise SystemExit('dashboard ran in the worker')\n")
+    main = types.ModuleType("__main__")
+    main.__file__ = str(script)
+    monkeypatch.setitem(sys.modules, "__main__", main)
+
+    job = jobs.ProcessJobRunner().submit(sleep_and_return, "ok", 0.0)
+    assert job.future.result(30) == "ok"
+
+
+def test_process_job_error_reaches_the_caller():
+    job = jobs.ProcessJobRunner().submit(fail_with, "bad input")
+    with pytest.raises(ValueError, match="bad input"):
+        job.future.result(30)
+
+
+def test_process_job_cancel_terminates_the_run():
+    job = jobs.ProcessJobRunner().submit(sleep_and_return, "late", 30.0)
+    wait_for(lambda: job.process is not None)
+    job.cancel()
+
+    with pytest.raises(jobs.JobCancelled):
+        job.future.result(10)
+
+
+def test_process_runner_caps_concurrent_processes():
+    runner = jobs.ProcessJobRunner(max_processes=1)
+    first = runner.submit(sleep_and_return, "a", 1.0, key="a")
+    second = runner.submit(sleep_and_return, "b", 0.0, key="b")
+
+    wait_for(lambda: first.process is not None)
+    assert second.status == "queued"
+    assert second.process is None
+
+    assert first.future.result(30) == "a"
+    assert second.future.result(30) == "b"
+
+
+def test_process_job_cancelled_while_queued_never_starts():
+    runner = jobs.ProcessJobRunner(max_processes=1)
+    first = runner.submit(sleep_and_return, "a", 1.0, key="a")
+    second = runner.submit(sleep_and_return, "b", 0.0, key="b")
+
+    second.cancel()
+    assert first.future.result(30) == "a"
+    time.sleep(0.1)
+    assert second.process is None
+    assert second.status == "cancelled"
+
+
+# ======================
+# Cancellation Points
+# ======================
+def test_stress_run_stops_at_the_next_chunk():
+    frame = risk_engine.compute_risk_frame(sample_data.generate_panel())
+    calls = []
+
+    def progress(fraction):
+        calls.append(fraction)
+        if len(calls) == 2:
+            raise jobs.JobCancelled("stress")
+
+    # Tiny memory budget: many chunks
+    with pytest.raises(jobs.JobCancelled):
+        stress.run_stress(frame, n_paths=10_000, memory_budget=64 * 1024, progress=progress)
+    assert len(calls) == 2
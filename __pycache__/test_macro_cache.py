@@ -0,0 +1,339 @@
+import functools
+import os
+import sys
+import threading
+import types
+from concurrent.futures import wait
+
+import pandas as pd
+import pytest
+
+import macro_cache
+import macro_df
+
+TTL = 100
+STALE_TTL = 1000
+
+
+class Clock:
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class CountingFetch:
+    # Returns a new panel version on each call; `gate` holds a call open
+    def __init__(self, gate=None, fail=False):
+        self.calls = 0
+        self.gate = gate
+        self.fail = fail
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        with self._lock:
+            self.calls += 1
+            version = self.calls
+        if self.gate is not None:
+            self.gate.wait(5)
+        if self.fail:
+            raise ConnectionError("offline")
+        return pd.DataFrame({"Country": ["USA"], "Year": [2020], "GDP": [float(version)]})
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+@pytest.fixture
+def cache(tmp_path, clock):
+    return macro_cache.PanelCache(cache_dir=str(tmp_path), ttl=TTL, stale_ttl=STALE_TTL, clock=clock)
+
+
+def gdp(frame):
+    return frame["GDP"].iloc[0]
+
+
+def join_refreshes(cache):
+    wait(list(cache._in_flight.values()), timeout=5)
+
+
+# ======================
+# TTL
+# ======================
+def test_fresh_panel_is_served_from_disk(cache, clock):
+    fetch = CountingFetch()
+    cache.get_or_fetch("k", fetch)
+    clock.now = TTL - 1
+
+    assert gdp(cache.get_or_fetch("k", fetch)) == 1
+    assert fetch.calls == 1
+
+
+def test_expired_panel_blocks_on_fetch(cache, clock):
+    fetch = CountingFetch()
+    cache.get_or_fetch("k", fetch)
+    clock.now = TTL + STALE_TTL + 1
+
+    assert gdp(cache.get_or_fetch("k", fetch)) == 2
+    assert fetch.calls == 2
+
+
+def test_expired_panel_is_served_when_fetch_fails(cache, clock):
+    cache.get_or_fetch("k", CountingFetch())
+    clock.now = TTL + STALE_TTL + 1
+
+    assert gdp(cache.get_or_fetch("k", CountingFetch(fail=True))) == 1
+
+
+def test_missing_panel_fetch_failure_raises(cache):
+    with pytest.raises(ConnectionError):
+        cache.get_or_fetch("k", CountingFetch(fail=True))
+
+
+# ======================
+# Stale-While-Revalidate
+# ======================
+def test_stale_panel_is_served_while_refreshing(cache, clock):
+    fetch = CountingFetch()
+    cache.get_or_fetch("k", fetch)
+    clock.now = TTL + 1
+
+    # Stale copy comes back at once; the refresh lands in the background
+    assert gdp(cache.get_or_fetch("k", fetch)) == 1
+    join_refreshes(cache)
+    assert fetch.calls == 2
+    assert gdp(cache.get_or_fetch("k", fetch)) == 2
+
+
+def test_failed_refresh_keeps_stale_panel(cache, clock):
+    cache.get_or_fetch("k", CountingFetch())
+    clock.now = TTL + 1
+
+    cache.get_or_fetch("k", CountingFetch(fail=True))
+    join_refreshes(cache)
+    assert gdp(cache.read("k")[0]) == 1
+
+
+def test_refresh_is_single_flight(cache, clock):
+    cache.get_or_fetch("k", CountingFetch())
+    clock.now = TTL + 1
+
+    gate = threading.Event()
+    fetch = CountingFetch(gate=gate)
+    for _ in range(5):
+        assert gdp(cache.get_or_fetch("k", fetch)) == 1
+    gate.set()
+    join_refreshes(cache)
+
+    assert fetch.calls == 1
+    assert cache._in_flight == {}
+
+
+def concurrent_gets(cache, fetch, n=5):
+    results, errors = [], []
+
+    def get():
+        try:
+            results.append(cache.get_or_fetch("k", fetch))
+        except Exception as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=get) for _ in range(n)]
+    for thread in threads:
+        thread.start()
+    return threads, results, errors
+
+
+def test_blocking_fetch_is_single_flight(cache):
+    gate = threading.Event()
+    fetch = CountingFetch(gate=gate)
+    threads, results, errors = concurrent_gets(cache, fetch)
+    gate.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert fetch.calls == 1
+    assert not errors and [gdp(r) for r in results] == [1] * 5
+    assert cache._in_flight == {}
+
+
+def test_blocking_fetch_failure_reaches_every_waiter(cache):
+    gate = threading.Event()
+    fetch = CountingFetch(gate=gate, fail=True)
+    threads, results, errors = concurrent_gets(cache, fetch)
+    gate.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert fetch.calls == 1
+    assert not results and len(errors) == 5
+    assert all(isinstance(e, ConnectionError) for e in errors)
+
+
+def test_expired_read_joins_a_running_refresh(cache, clock):
+    cache.get_or_fetch("k", CountingFetch())
+    clock.now = TTL + 1
+    gate = threading.Event()
+    refresh = CountingFetch(gate=gate)
+    cache.get_or_fetch("k", refresh)
+
+    # Past the stale window while the refresh is still running: wait for it
+    # instead of fetching again
+    clock.now = TTL + STALE_TTL + 2
+    blocking = CountingFetch()
+    threads, results, errors = concurrent_gets(cache, blocking, n=1)
+    gate.set()
+    threads[0].join(5)
+
+    assert refresh.calls == 1 and blocking.calls == 0
+    assert not errors and gdp(results[0]) == 1
+
+
+def test_unchanged_refresh_only_bumps_timestamp(cache, clock):
+    same = lambda: pd.DataFrame({"Country": ["USA"], "Year": [2020], "GDP": [1.0]})
+    cache.get_or_fetch("k", same)
+    data_path, _ = cache._paths("k")
+    written = os.stat(data_path).st_mtime_ns
+
+    clock.now = TTL + STALE_TTL + 1
+    cache.get_or_fetch("k", same)
+
+    assert os.stat(data_path).st_mtime_ns == written
+    assert cache.read("k")[1]["fetched_at"] == clock.now
+
+
+# ======================
+# Keys
+# ======================
+def test_key_depends_on_fetcher():
+    def fake_fetcher(series, economies, years):
+        pass
+
+    live = macro_cache.panel_key(["NY.GDP.MKTP.CD"], ["USA"], [2020], macro_df.wbgapi_fetcher)
+    fake = macro_cache.panel_key(["NY.GDP.MKTP.CD"], ["USA"], [2020], fake_fetcher)
+    assert live != fake
+
+
+def test_key_tells_partials_apart():
+    def fetch(series, economies, years, source="wdi"):
+        pass
+
+    def key(fetcher):
+        return macro_cache.panel_key(["NY.GDP.MKTP.CD"], ["USA"], [2020], fetcher)
+
+    assert key(functools.partial(fetch, source="wdi")) != key(functools.partial(fetch, source="imf"))
+    assert key(functools.partial(fetch, source="wdi")) == key(functools.partial(fetch, source="wdi"))
+    assert key(functools.partial(fetch, source="wdi")) != key(fetch)
+    assert key(functools.partial(macro_df.wbgapi_fetcher)) != key(functools.partial(fetch))
+
+
+def test_key_tells_lambdas_apart():
+    def key(fetcher):
+        return macro_cache.panel_key(["NY.GDP.MKTP.CD"], ["USA"], [2020], fetcher)
+
+    by_source = [(lambda series, economies, years, s=source: s) for source in ("wdi", "imf")]
+    closures = [(lambda series, economies, years: source) for source in ("wdi",)] + \
+               [(lambda series, economies, years: source) for source in ("imf",)]
+    offline = lambda series, economies, years: None
+    online = lambda series, economies, years: macro_df.wbgapi_fetcher(series, economies, years)
+
+    assert key(by_source[0]) != key(by_source[1])
+    assert key(closures[0]) != key(closures[1])
+    assert key(offline) != key(online)
+    # Same code and captured values: same source
+    assert key(by_source[0]) == key([(lambda series, economies, years, s=source: s) for source in ("wdi",)][0])
+
+
+def test_key_follows_captured_objects_not_their_state():
+    log = []
+    fetch = lambda series, economies, years: log.append(series)
+
+    def key(fetcher):
+        return macro_cache.panel_key(["NY.GDP.MKTP.CD"], ["USA"], [2020], fetcher)
+
+    before = key(fetch)
+    fetch(["A"], ["USA"], [2020])
+    assert key(fetch) == before
+    other = []
+    assert key(lambda series, economies, years: other.append(series)) != before
+
+
+def test_key_uses_an_explicit_cache_key():
+    class Source:
+        def __init__(self, url):
+            self.url = url
+            self.cache_key = f"rest:{url}"
+
+        def __call__(self, series, economies, years):
+            pass
+
+    def key(fetcher):
+        return macro_cache.panel_key(["NY.GDP.MKTP.CD"], ["USA"], [2020], fetcher)
+
+    assert key(Source("a")) == key(Source("a"))
+    assert key(Source("a")) != key(Source("b"))
+
+
+def test_key_for_callable_instances_and_methods():
+    class Source:
+        def __call__(self, series, economies, years):
+            pass
+
+    def key(fetcher):
+        return macro_cache.panel_key(["NY.GDP.MKTP.CD"], ["USA"], [2020], fetcher)
+
+    # Without a cache_key an instance only matches itself; methods key on it
+    first, second = Source(), Source()
+    assert key(first) == key(first) != key(second)
+    assert key(first.__call__) == key(first.__call__) != key(second.__call__)
+
+
+def test_key_ignores_argument_order():
+    assert macro_cache.panel_key(["b", "a"], ["USA", "GBR"], [2021, 2020]) == \
+        macro_cache.panel_key(["a", "b"], ["GBR", "USA"], [2020, 2021])
+
+
+# ======================
+# wbgapi Fetcher
+# ======================
+def test_wbgapi_fetcher_keeps_country_and_year_for_one_economy(monkeypatch):
+    seen = {}
+
+    def DataFrame(series, economy, time, index=None, columns=None, numericTimeKeys=False):
+        # wbgapi drops single-valued dimensions unless the index is explicit
+        seen["index"] = index
+        index = index or [d for d, values in (("economy", economy), ("time", time)) if len(values) > 1]
+        frame = pd.DataFrame([
+            {"economy": e, "time": t, **{s: 1.0 for s in series}} for e in economy for t in time
+        ])
+        return frame.set_index(index) if index else frame[list(series)]
+
+    fake = types.ModuleType("wbgapi")
+    fake.data = types.SimpleNamespace(DataFrame=DataFrame)
+    monkeypatch.setitem(sys.modules, "wbgapi", fake)
+
+    out = macro_df.wbgapi_fetcher(["NY.GDP.MKTP.CD"], ["USA"], [2020])
+
+    assert seen["index"] == ["economy", "time"]
+    assert out[["Country", "Year"]].values.tolist() == [["USA", 2020]]
+
+
+def test_load_macro_data_cache_roundtrip(tmp_path, clock):
+    cache = macro_cache.PanelCache(cache_dir=str(tmp_path), ttl=TTL, stale_ttl=STALE_TTL, clock=clock)
+    calls = []
+
+    def fetcher(series, economies, years):
+        calls.append(list(economies))
+        return pd.DataFrame([
+            {"Country": e, "Year": y, **{s: 1.0 for s in series}} for e in economies for y in years
+        ])
+
+    first = macro_df.load_macro_data(countries=["USA"], years=[2020, 2021], fetcher=fetcher, cache=cache)
+    second = macro_df.load_macro_data(countries=["USA"], years=[2020, 2021], fetcher=fetcher, cache=cache)
+
+    pd.testing.assert_frame_equal(first, second)
+    assert first.columns.tolist() == ["Country", "Year", "GDP", "Inflation", "Credit"]
+    assert len(calls) == 1
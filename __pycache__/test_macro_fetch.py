@@ -0,0 +1,162 @@
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+import macro_fetch
+
+
+class FakeWDI:
+    # Stand-in for the World Bank API: deterministic values per
+    # (series, economy, year), optional failures, and a log of calls
+    def __init__(self, fail=None, failures=0, delay=0.0):
+        self.fail = fail or (lambda series, economies: False)
+        self.failures = failures
+        self.delay = delay
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def value(self, series, economy, year):
+        return float(sum(map(ord, series + economy)) + year % 100)
+
+    def __call__(self, series, economies, years):
+        with self._lock:
+            self.calls.append((list(series), list(economies)))
+            if self.failures:
+                self.failures -= 1
+                raise ConnectionError("transient")
+        if self.fail(series, economies):
+            raise ConnectionError(f"chunk {economies} failed")
+        time.sleep(self.delay)
+        return pd.DataFrame([
+            {"Country": e, "Year": y, **{s: self.value(s, e, y) for s in series}}
+            for e in economies for y in years
+        ])
+
+
+def expected(fake, series, economies, years):
+    return fake(series, economies, years).sort_values(["Country", "Year"]).reset_index(drop=True)
+
+
+def no_sleep(seconds):
+    pass
+
+
+# ======================
+# Chunked Merge
+# ======================
+def test_chunks_merge_into_full_panel():
+    fake = FakeWDI()
+    series, economies, years = ["A", "B", "C"], [f"E{i}" for i in range(7)], [2020, 2021]
+    seen = []
+
+    out = macro_fetch.fetch_panel(fake, series, economies, years, economy_chunk=3, series_chunk=2,
+                                  on_chunk=lambda done, total, part: seen.append((done, total)))
+
+    pd.testing.assert_frame_equal(out, expected(FakeWDI(), series, economies, years))
+    # 2 series blocks x 3 economy blocks, reported as each one lands
+    assert len(fake.calls) == 6
+    assert seen == [(i, 6) for i in range(1, 7)]
+
+
+def test_single_economy_chunk():
+    fake = FakeWDI()
+    # Last economy block holds one economy
+    out = macro_fetch.fetch_panel(fake, ["A"], ["E0", "E1", "E2"], [2020], economy_chunk=2)
+
+    assert ["E2"] in [economies for _, economies in fake.calls]
+    pd.testing.assert_frame_equal(out, expected(FakeWDI(), ["A"], ["E0", "E1", "E2"], [2020]))
+
+
+def test_single_economy_request():
+    out = macro_fetch.fetch_panel(FakeWDI(), ["A", "B"], ["USA"], [2020, 2021])
+    assert out["Country"].tolist() == ["USA", "USA"]
+    assert out.columns.tolist() == ["Country", "Year", "A", "B"]
+
+
+def test_empty_series_returns_empty_panel():
+    fake = FakeWDI()
+    out = macro_fetch.fetch_panel(fake, [], ["USA"], [2020])
+
+    assert out.empty
+    assert out.columns.tolist() == ["Country", "Year"]
+    assert fake.calls == []
+
+
+def test_empty_economies_returns_empty_panel():
+    out = macro_fetch.fetch_panel(FakeWDI(), ["A"], [], [2020])
+    assert out.empty
+    assert out.columns.tolist() == ["Country", "Year", "A"]
+
+
+# ======================
+# Retry / Backoff
+# ======================
+def test_retry_backs_off_exponentially():
+    fake = FakeWDI(failures=2)
+    delays = []
+
+    out = macro_fetch.fetch_with_retry(fake, ["A"], ["USA"], [2020], retries=3, backoff=0.5, sleep=delays.append)
+
+    assert delays == [0.5, 1.0]
+    assert len(fake.calls) == 3
+    assert len(out) == 1
+
+
+def test_retry_gives_up_after_retries():
+    fake = FakeWDI(failures=10)
+    delays = []
+
+    with pytest.raises(ConnectionError):
+        macro_fetch.fetch_with_retry(fake, ["A"], ["USA"], [2020], retries=2, backoff=1.0, sleep=delays.append)
+
+    assert delays == [1.0, 2.0]
+    assert len(fake.calls) == 3
+
+
+def test_transient_failures_are_retried_inside_fetch_panel():
+    fake = FakeWDI(failures=1)
+    out = macro_fetch.fetch_panel(fake, ["A"], ["E0", "E1"], [2020], economy_chunk=1, sleep=no_sleep)
+    assert len(out) == 2
+
+
+def test_failed_chunk_cancels_pending_chunks():
+    fake = FakeWDI(fail=lambda series, economies: economies == ["E0"], delay=0.05)
+
+    with pytest.raises(ConnectionError, match="E0"):
+        macro_fetch.fetch_panel(fake, ["A"], [f"E{i}" for i in range(20)], [2020],
+                                economy_chunk=1, max_workers=1, retries=0, sleep=no_sleep)
+
+    # One worker: the failing first chunk runs, the queued rest never do
+    assert len(fake.calls) <= 3
+
+
+def test_failure_does_not_wait_for_running_chunks():
+    started, release = threading.Event(), threading.Event()
+
+    def fetcher(series, economies, years):
+        if economies == ["E0"]:
+            # Fail only once E1 is in flight
+            started.wait(5)
+            raise ConnectionError("chunk E0 failed")
+        started.set()
+        release.wait(5)
+        return FakeWDI()(series, economies, years)
+
+    try:
+        start = time.perf_counter()
+        with pytest.raises(ConnectionError, match="E0"):
+            macro_fetch.fetch_panel(fetcher, ["A"], ["E0", "E1"], [2020],
+                                    economy_chunk=1, max_workers=2, retries=0, sleep=no_sleep)
+        # E1 is still blocked: the error is raised without joining it
+        assert time.perf_counter() - start < 2
+    finally:
+        release.set()
+
+
+def test_chunked_fetcher_keeps_fetcher_contract():
+    fetch = macro_fetch.chunked_fetcher(FakeWDI(), economy_chunk=1)
+    out = fetch(["A"], ["E0", "E1"], range(2020, 2022))
+    assert out.columns.tolist() == ["Country", "Year", "A"]
+    assert len(out) == 4
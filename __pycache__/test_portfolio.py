@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+
+import panel_cube
+import portfolio
+import risk_engine
+import sample_data
+
+
+@pytest.fixture(scope="module")
+def frame():
+    return risk_engine.compute_risk_frame(sample_data.generate_panel())
+
+
+@pytest.fixture(scope="module")
+def latest(frame):
+    return panel_cube.PanelCube(frame).year_rows()
+
+
+def assert_valid(weights, cap):
+    weights = np.atleast_2d(weights)
+    np.testing.assert_allclose(weights.sum(axis=1), 1.0)
+    assert (weights >= 0).all()
+    assert (weights <= portfolio._feasible_cap(cap, weights.shape[1]) + 1e-9).all()
+
+
+# ======================
+# Capped Water-Filling
+# ======================
+@pytest.mark.parametrize("scores, cap", [
+    ([1.0, 1.0, 1.0, 1.0, 1.0], 0.25),
+    ([10.0, 1.0, 1.0, 1.0, 1.0, 1.0], 0.25),
+    ([100.0, 50.0, 1.0, 1.0, 1.0, 1.0, 1.0], 0.2),
+    ([3.0, 2.0, 1.0], 0.1),
+    ([0.0, 0.0, 0.0, 0.0], 0.25),
+])
+def test_weights_sum_to_one_within_the_cap(scores, cap):
+    assert_valid(portfolio.capped_weights(scores, cap), cap)
+
+
+def test_uncapped_weights_stay_proportional():
+    weights = portfolio.capped_weights([4.0, 3.0, 2.0, 1.0, 1.0, 1.0, 1.0, 1.0], cap=0.5)
+    np.testing.assert_allclose(weights[0], np.array([4, 3, 2, 1, 1, 1, 1, 1]) / 14)
+
+
+def test_leftover_budget_goes_to_zero_score_markets():
+    # Two positive scores cap out at 0.25 each; the remaining half is
+    # spread evenly over the zero-score markets
+    weights = portfolio.capped_weights([5.0, 1.0, 0.0, 0.0, 0.0, 0.0], cap=0.25)
+    assert_valid(weights, 0.25)
+    np.testing.assert_allclose(weights[0], [0.25, 0.25, 0.125, 0.125, 0.125, 0.125])
+
+
+def test_batched_rows_are_independent():
+    scores = np.array([[10.0, 1.0, 1.0, 1.0, 1.0], [0.0, 0.0, 0.0, 1.0, 1.0]])
+    weights = portfolio.capped_weights(scores, cap=0.3)
+
+    assert_valid(weights, 0.3)
+    for row, expected in zip(scores, weights):
+        np.testing.assert_allclose(portfolio.capped_weights(row, cap=0.3)[0], expected)
+
+
+# ======================
+# Allocation Run
+# ======================
+@pytest.mark.parametrize("method", ["inverse_risk", "mean_variance"])
+@pytest.mark.parametrize("alloc_mult", [0.2, 0.6, 1.0, 1.5])
+def test_allocation_run_honours_the_scaled_cap(frame, latest, method, alloc_mult):
+    cap = portfolio.MAX_WEIGHT * alloc_mult
+    out = portfolio.allocation_run(latest, frame, 2_000_000, 1.0, alloc_mult, method)
+
+    assert_valid(out["Allocation"].to_numpy() / 100, cap)
+    assert out["Amount"].sum() == pytest.approx(2_000_000)
+    assert list(out["Country"]) == list(latest["Country"])
+
+
+def test_allocation_run_matches_the_batched_solve(frame, latest):
+    weights, amounts = portfolio.optimize_allocations(latest, frame, [1_000_000, 5_000_000], [0.5, 1.5],
+                                                      method="mean_variance", cap=portfolio.MAX_WEIGHT * 0.6)
+    out = portfolio.allocation_run(latest, frame, 5_000_000, 1.5, 0.6, "mean_variance")
+
+    # The batch stops when its slowest row converges, so agree to the solver tolerance
+    np.testing.assert_allclose(out["Allocation"].to_numpy() / 100, weights[1], atol=1e-6)
+    np.testing.assert_allclose(out["Amount"].to_numpy(), amounts[1], atol=10)
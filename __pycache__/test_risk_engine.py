@@ -0,0 +1,128 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import frame_memory
+import risk_engine
+import sample_data
+
+DERIVED = ["GDP_Growth", "Credit_Growth", "Risk_Score"]
+
+
+@pytest.fixture
+def panel():
+    return frame_memory.compact_frame(sample_data.generate_panel())
+
+
+def upsert_both(incremental, truth, country, year, **values):
+    # Applies the same change to the panel and to a plain frame that is
+    # rescored from scratch
+    incremental.upsert(country, year, **values)
+    hit = (truth["Country"] == country) & (truth["Year"] == year)
+    if hit.any():
+        for column, value in values.items():
+            truth.loc[hit, column] = value
+        return truth
+    row = truth[truth["Country"] == truth["Country"].iloc[0]].iloc[[0]].copy()
+    row["Country"], row["Year"] = country, year
+    for column, value in values.items():
+        row[column] = value
+    return pd.concat([truth.astype({"Country": object}), row.astype({"Country": object})], ignore_index=True)
+
+
+def assert_matches_full_recompute(incremental, truth):
+    expected = risk_engine.compute_risk_frame(truth)
+    got = incremental.frame
+
+    assert got[["Country", "Year"]].astype(str).equals(expected[["Country", "Year"]].astype(str))
+    for column in DERIVED:
+        np.testing.assert_allclose(got[column].to_numpy(dtype=float), expected[column].to_numpy(dtype=float),
+                                   rtol=1e-4, atol=1e-3, err_msg=column)
+
+
+# ======================
+# Incremental Updates
+# ======================
+def test_initial_frame_matches_full_recompute(panel):
+    assert_matches_full_recompute(risk_engine.IncrementalRiskPanel(panel), panel)
+
+
+def value(frame, country, year, column):
+    return float(frame.loc[(frame["Country"] == country) & (frame["Year"] == year), column].iloc[0])
+
+
+def test_revisions_match_full_recompute(panel):
+    incremental, truth = risk_engine.IncrementalRiskPanel(panel), panel.copy()
+    # Small revisions of mid-range markets leave the extrema in place
+    for country, year, column, scale in [("USA", 2021, "GDP", 1.01), ("France", 2019, "Credit", 0.99),
+                                         ("UK", 2023, "Inflation", 1.02)]:
+        truth = upsert_both(incremental, truth, country, year, **{column: value(truth, country, year, column) * scale})
+        assert_matches_full_recompute(incremental, truth)
+    assert incremental.full_renormalisations == 0
+
+
+def test_inserts_match_full_recompute(panel):
+    incremental, truth = risk_engine.IncrementalRiskPanel(panel), panel.copy()
+    usa = panel[panel["Country"] == "USA"].iloc[-1]
+    inputs = {c: float(usa[c]) for c in risk_engine.IncrementalRiskPanel.SCORE_INPUTS}
+    truth = truth[~((truth["Country"] == "USA") & (truth["Year"] == 2021))]
+    incremental = risk_engine.IncrementalRiskPanel(truth)
+
+    # Mid-history gap, a year before the first, a year after the last, a new market
+    for country, year in [("USA", 2021), ("USA", 2017), ("USA", 2025), ("Atlantis", 2024)]:
+        truth = upsert_both(incremental, truth, country, year, **inputs)
+        assert_matches_full_recompute(incremental, truth)
+
+
+def test_extremum_revisions_renormalise(panel):
+    incremental, truth = risk_engine.IncrementalRiskPanel(panel), panel.copy()
+    riskiest = incremental.frame.loc[incremental.frame["Risk_Score"].idxmax()]
+    country, year = str(riskiest["Country"]), int(riskiest["Year"])
+
+    # Push the maximum further out, then pull it back inside the range
+    truth = upsert_both(incremental, truth, country, year, Inflation=80.0)
+    assert_matches_full_recompute(incremental, truth)
+    truth = upsert_both(incremental, truth, country, year, Inflation=2.0, Unemployment=4.0)
+    assert_matches_full_recompute(incremental, truth)
+    assert incremental.full_renormalisations == 2
+
+
+def test_upserts_keep_the_compact_dtypes(panel):
+    incremental = risk_engine.IncrementalRiskPanel(panel)
+    incremental.upsert("USA", 2022, GDP=30_000.0)
+    incremental.upsert("Atlantis", 2024, GDP=1.0, Credit=1.0, Inflation=1.0, Unemployment=1.0)
+    frame = incremental.frame
+
+    assert frame["Year"].dtype == panel["Year"].dtype
+    assert frame["GDP"].dtype == panel["GDP"].dtype
+    assert isinstance(frame["Country"].dtype, pd.CategoricalDtype)
+    assert "Atlantis" in frame["Country"].cat.categories
+    assert list(frame["Country"].cat.categories) == sorted(frame["Country"].cat.categories)
+    assert frame["Market_Tier"].dtype == panel["Market_Tier"].dtype
+
+
+def test_upsert_returns_the_rescored_rows(panel):
+    incremental = risk_engine.IncrementalRiskPanel(panel)
+    assert incremental.upsert("USA", 2021, GDP=25_000.0) == [("USA", 2021), ("USA", 2022)]
+    assert incremental.upsert("USA", 2024, GDP=25_000.0) == [("USA", 2024)]
+
+
+# ======================
+# Rejected Updates
+# ======================
+def test_new_row_needs_score_inputs(panel):
+    incremental = risk_engine.IncrementalRiskPanel(panel)
+    with pytest.raises(ValueError, match="missing"):
+        incremental.upsert("Atlantis", 2024, GDP=1.0)
+
+
+def test_unknown_column(panel):
+    incremental = risk_engine.IncrementalRiskPanel(panel)
+    with pytest.raises(ValueError, match="Cannot set"):
+        incremental.upsert("USA", 2021, Colour=1.0)
+
+
+def test_factor_weights_need_a_full_recompute(panel):
+    weights = {**risk_engine.RISK_WEIGHTS, next(iter(risk_engine.FACTOR_WEIGHTS)): 1.0}
+    with pytest.raises(ValueError, match="full recompute"):
+        risk_engine.IncrementalRiskPanel(panel, weights)
@@ -0,0 +1,63 @@
+import io
+import zipfile
+
+import pandas as pd
+import pytest
+
+import panel_cube
+import portfolio
+import risk_engine
+import risk_report
+import sample_data
+import stress
+
+
+@pytest.fixture(scope="module")
+def frame():
+    return risk_engine.compute_risk_frame(sample_data.generate_panel())
+
+
+@pytest.fixture(scope="module")
+def stress_results(frame):
+    return stress.run_stress(frame, n_paths=2_000)
+
+
+def settings(**overrides):
+    return {"capital": 1_000_000, "risk_appetite": "Moderate", "appetite_mult": 1.0, "alloc_mult": 0.6,
+            "optimizer": "mean_variance", "weights": risk_engine.RISK_WEIGHTS, **overrides}
+
+
+def allocation_for(frame, s):
+    latest = panel_cube.PanelCube(frame).year_rows()
+    return portfolio.allocation_run(latest, frame, s["capital"], s["appetite_mult"], s["alloc_mult"], s["optimizer"])
+
+
+def unzip(report):
+    with zipfile.ZipFile(io.BytesIO(report)) as bundle:
+        return {name: bundle.read(name).decode() for name in bundle.namelist()}
+
+
+def test_report_exports_the_given_allocation_and_stress(frame, stress_results):
+    s = settings()
+    allocation = allocation_for(frame, s)
+    files = unzip(risk_report.build_report(frame, "USA", s, allocation, stress_results))
+
+    exported = pd.read_csv(io.StringIO(files["allocation.csv"]))
+    expected = risk_report.allocation_table(allocation)
+    assert exported["Country"].tolist() == expected["Country"].tolist()
+    assert exported["Amount"].to_numpy() == pytest.approx(expected["Amount"].to_numpy())
+    # Non-default multiplier: the export honours the tighter cap
+    assert exported["Allocation"].max() <= 100 * max(portfolio.MAX_WEIGHT * s["alloc_mult"], 1 / len(exported)) + 1e-9
+
+    histogram = pd.read_csv(io.StringIO(files["loss_histogram.csv"]))
+    assert histogram["Paths"].sum() == len(stress_results["losses"])
+
+
+def test_report_without_latest_row_for_country(frame, stress_results):
+    # Drop the market's latest year: nothing to report on
+    last = frame["Year"].max()
+    trimmed = frame[~((frame["Country"] == "USA") & (frame["Year"] == last))]
+    s = settings()
+
+    with pytest.raises(ValueError, match=f"USA has no data for {last}"):
+        risk_report.build_report(trimmed, "USA", s, allocation_for(trimmed, s), stress_results)
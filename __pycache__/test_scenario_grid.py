@@ -0,0 +1,86 @@
+import itertools
+
+import numpy as np
+import pytest
+
+import scenario_grid
+
+# The sidebar's inline calculation the grid replaced
+SCENARIO_RISK_ADJUST = {"Base Case": 0, "Optimistic": -0.2, "Pessimistic": 0.3, "Stress Test": 0.5}
+RATING_MULTIPLIERS = {
+    "AAA": 0.5, "AA+": 0.55, "AA": 0.6, "AA-": 0.65,
+    "A+": 0.7, "A": 0.75, "A-": 0.8,
+    "BBB+": 0.9, "BBB": 1.0, "BBB-": 1.1,
+    "BB+": 1.2, "BB": 1.3, "B": 1.5, "CCC": 1.8
+}
+TIER_MULTIPLIERS = {"Core Market": 0.8, "Secondary Market": 1.0, "Opportunistic Market": 1.3, "Monitor Only": 1.6}
+ENV_MULTIPLIERS = {"Very Strict": 0.9, "Strict": 1.0, "Moderate": 1.1, "Flexible": 1.2, "Very Flexible": 1.3}
+
+
+def inline_recommendation(rating, tier, environment, depth, liquidity, scenario):
+    composite_risk = (
+        RATING_MULTIPLIERS.get(rating, 1.0) *
+        TIER_MULTIPLIERS.get(tier, 1.0) *
+        ENV_MULTIPLIERS.get(environment, 1.0) *
+        ((11 - depth) / 5) *
+        ((11 - liquidity) / 5)
+    )
+    composite_risk = composite_risk * (1 + SCENARIO_RISK_ADJUST.get(scenario, 0))
+    if composite_risk < 0.8:
+        alloc_mult = 1.3
+    elif composite_risk < 1.2:
+        alloc_mult = 1.0
+    elif composite_risk < 1.6:
+        alloc_mult = 0.7
+    else:
+        alloc_mult = 0.3
+    return composite_risk, alloc_mult
+
+
+def every_cell():
+    return list(itertools.product(*scenario_grid.AXES.values()))
+
+
+# ======================
+# Grid Values
+# ======================
+def test_grid_matches_the_inline_formula():
+    grid = scenario_grid.build_grid()
+    for state in every_cell():
+        composite_risk, alloc_mult = inline_recommendation(*state)
+        idx = scenario_grid.cell(*state)
+        assert grid["composite"][idx] == pytest.approx(composite_risk), state
+        assert grid["alloc_mult"][idx] == alloc_mult, state
+
+
+def test_lookup_many_matches_lookup():
+    columns = [np.array(axis, dtype=object) for axis in zip(*every_cell())]
+    composite, band, alloc_mult = scenario_grid.lookup_many(*columns)
+
+    for i in range(0, len(composite), 97):
+        one = scenario_grid.lookup(*(column[i] for column in columns))
+        assert composite[i] == one["composite_risk"]
+        assert band[i] == one["band"]
+        assert alloc_mult[i] == one["alloc_mult"]
+
+
+def test_sidebar_lookup_keeps_the_inline_fallbacks():
+    # The inline formula treated unknown labels as multiplier 1.0
+    one = scenario_grid.lookup("NR", "Frontier", "Lawless", 5, 5, "Unknown")
+    assert one["composite_risk"] == pytest.approx(inline_recommendation("NR", "Frontier", "Lawless", 5, 5, "Unknown")[0])
+
+
+# ======================
+# Batch Misses
+# ======================
+@pytest.mark.parametrize("axis, value", [
+    ("rating", "NR"), ("tier", "Frontier"), ("environment", "Lawless"),
+    ("depth", 0), ("depth", 11), ("liquidity", 12), ("scenario", "Unknown")
+])
+def test_lookup_many_rejects_values_outside_the_grid(axis, value):
+    state = {"rating": ["BBB", "A"], "tier": ["Core Market"] * 2, "environment": ["Strict"] * 2,
+             "depth": [5, 6], "liquidity": [5, 6], "scenario": ["Base Case"] * 2}
+    state[axis] = [state[axis][0], value]
+
+    with pytest.raises(ValueError, match=f"Unknown {axis}.*{value}"):
+        scenario_grid.lookup_many(*state.values())
@@ -0,0 +1,99 @@
+import json
+
+import numpy as np
+import pytest
+
+import risk_engine
+import risk_features
+import sample_data
+import scoring_model
+
+CONFIG = scoring_model.load_config()
+
+
+@pytest.fixture(scope="module")
+def frame():
+    # Every configured term, including the rolling features
+    return risk_features.add_features(risk_engine.add_growth(sample_data.generate_panel()))
+
+
+def per_term_raw(frame, weights):
+    # One term at a time: abs terms by magnitude, missing values count as zero
+    raw = np.zeros(len(frame))
+    for term, weight in weights.items():
+        values = np.nan_to_num(frame[term].to_numpy(dtype=float), nan=0.0)
+        if CONFIG["terms"][term] == "abs":
+            values = np.abs(values)
+        raw += weight * values
+    return raw
+
+
+def min_max(raw):
+    span = raw.max() - raw.min()
+    return np.full(len(raw), 50.0) if span <= 0 else (raw - raw.min()) / span * 100
+
+
+# ======================
+# Compiled Models
+# ======================
+def test_every_configured_model_matches_the_per_term_formula(frame):
+    models = scoring_model.configured_models()
+    raw, scores = models.raw(frame), models.scores(frame)
+
+    assert models.names == list(CONFIG["models"])
+    for column, (name, weights) in enumerate(CONFIG["models"].items()):
+        expected = per_term_raw(frame, weights)
+        np.testing.assert_allclose(raw[:, column], expected, rtol=1e-12, atol=1e-12, err_msg=name)
+        np.testing.assert_allclose(scores[:, column], min_max(expected), rtol=1e-10, atol=1e-10, err_msg=name)
+
+
+def test_abs_terms_count_by_magnitude(frame):
+    # Flipping the sign of an abs term leaves every score unchanged; a
+    # level term moves it
+    flipped = frame.copy()
+    for term, transform in CONFIG["terms"].items():
+        if transform == "abs":
+            flipped[term] = -flipped[term]
+    models = scoring_model.configured_models()
+    np.testing.assert_allclose(models.raw(flipped), models.raw(frame))
+
+    flipped["Inflation"] = -flipped["Inflation"]
+    assert not np.allclose(models.raw(flipped), models.raw(frame))
+
+
+def test_baseline_matches_the_original_risk_score(frame):
+    baseline = scoring_model.compile_weights(risk_engine.weights_key())
+    expected = (0.4 * np.abs(frame["GDP_Growth"]) + 0.3 * frame["Inflation"] +
+                0.2 * np.abs(frame["Credit_Growth"]) + 0.1 * frame["Unemployment"]).to_numpy(dtype=float)
+
+    np.testing.assert_allclose(baseline.raw(frame)[:, 0], expected, rtol=1e-12)
+    np.testing.assert_allclose(baseline.scores(frame)[:, 0], risk_engine.normalize_scores(expected), atol=1e-10)
+
+
+def test_single_model_compile_matches_its_column(frame):
+    models = scoring_model.configured_models()
+    for column, name in enumerate(models.names):
+        single = scoring_model.compile_weights(risk_engine.weights_key(scoring_model.model_weights(name)))
+        np.testing.assert_allclose(single.scores(frame)[:, 0], models.scores(frame)[:, column])
+
+
+def test_flat_model_scores_fifty(frame):
+    flat = frame.copy()
+    flat["Inflation"] = 3.0
+    model = scoring_model.compile_models({"Flat": {"Inflation": 1.0}})
+    np.testing.assert_array_equal(model.scores(flat)[:, 0], 50.0)
+
+
+# ======================
+# Rejected Configs
+# ======================
+def test_unknown_terms():
+    with pytest.raises(ValueError, match="Unknown risk weight terms"):
+        scoring_model.compile_models({"Typo": {"GDP_Grwth": 1.0}})
+
+
+def test_unknown_transform(tmp_path):
+    path = tmp_path / "models.json"
+    path.write_text(json.dumps({**CONFIG, "terms": {**CONFIG["terms"], "Inflation": "square"}}))
+    with pytest.raises(ValueError, match="Unknown term transforms"):
+        scoring_model.load_config(str(path))
@@ -0,0 +1,129 @@
+import asyncio
+import json
+
+import pytest
+
+import scoring_model
+import scoring_service
+
+
+@pytest.fixture(scope="module")
+def app():
+    return scoring_service.ScoringApp(scoring_service.load_service())
+
+
+def call(app, method, path, body=None, query=""):
+    # Drives the ASGI callable directly: one request, the full response
+    messages = [{"type": "http.request", "body": json.dumps(body).encode() if body is not None else b"",
+                 "more_body": False}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0) if messages else {"type": "http.disconnect"}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "method": method, "path": path, "query_string": query.encode()}
+    asyncio.run(app(scope, receive, send))
+    return sent[0]["status"], json.loads(sent[1]["body"])
+
+
+def post(app, body):
+    return call(app, "POST", "/v1/score", body)
+
+
+# ======================
+# Good Requests
+# ======================
+def test_batch_score(app):
+    status, payload = post(app, {"capital": 1_000_000, "items": [
+        {"country": "USA"},
+        {"country": "Brazil", "scenario": "Stress Test", "rating": "BB", "appetite": "Aggressive", "depth": 3}
+    ]})
+
+    assert status == 200
+    assert payload["count"] == 2
+    usa, brazil = payload["results"]
+    assert usa["country"] == "USA" and usa["scenario"] == scoring_service.DEFAULT_SCENARIO
+    assert brazil["depth"] == 3 and brazil["rating"] == "BB"
+    for row in payload["results"]:
+        assert isinstance(row["composite_risk"], float)
+        assert 0 <= row["risk_score"] <= 100
+
+
+def test_get_score_matches_post(app):
+    status, single = call(app, "GET", "/v1/score", query="country=USA&scenario=Pessimistic&depth=4")
+    _, batch = post(app, {"items": [{"country": "USA", "scenario": "Pessimistic", "depth": 4}]})
+
+    assert status == 200
+    assert single == batch["results"][0]
+
+
+def test_every_configured_model_scores(app):
+    for model in scoring_model.load_config()["models"]:
+        status, payload = post(app, {"model": model, "items": [{"country": "USA"}]})
+        assert status == 200, model
+
+
+# ======================
+# Rejected Requests
+# ======================
+def test_unknown_model(app):
+    status, payload = post(app, {"model": "nope", "items": [{"country": "USA"}]})
+    assert status == 400
+    assert "nope" in payload["error"]
+    for model in scoring_model.load_config()["models"]:
+        assert model in payload["error"]
+
+
+@pytest.mark.parametrize("model", [["x"], {"name": "x"}, 3])
+def test_non_string_model(app, model):
+    status, payload = post(app, {"model": model, "items": [{"country": "USA"}]})
+    assert status == 400
+    assert "expected one of" in payload["error"]
+
+
+@pytest.mark.parametrize("items", [
+    {"country": "USA"},
+    [["USA"]],
+    [{"country": "Atlantis"}],
+    [{"country": ["USA"]}],
+    [{"country": "USA", "scenario": ["Base Case"]}],
+    [{"country": "USA", "depth": [1, 2]}],
+    [{"country": "USA", "depth": [[5]]}],
+    [{"country": "USA", "liquidity": {"level": 5}}],
+    [{"country": "USA", "depth": True}],
+    [{"country": "USA", "depth": 11}],
+    [{"country": "USA", "depth": 2.5}],
+    [{"country": "USA", "depth": "deep"}]
+])
+def test_malformed_items(app, items):
+    status, payload = post(app, {"items": items})
+    assert status == 400, payload
+    assert "error" in payload
+
+
+@pytest.mark.parametrize("capital", [True, False, "lots", [1], "inf", "nan", -1, 0])
+def test_bad_capital(app, capital):
+    status, _ = post(app, {"capital": capital, "items": [{"country": "USA"}]})
+    assert status == 400
+
+
+def test_invalid_json(app):
+    messages = [{"type": "http.request", "body": b"{not json", "more_body": False}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(app({"type": "http", "method": "POST", "path": "/v1/score", "query_string": b""}, receive, send))
+    assert sent[0]["status"] == 400
+
+
+def test_unknown_route_and_method(app):
+    assert call(app, "GET", "/v2/score")[0] == 404
+    assert call(app, "DELETE", "/v1/score")[0] == 405
@@ -0,0 +1,109 @@
+import numpy as np
+import pytest
+
+import panel_cube
+import risk_engine
+import sample_data
+import scoring_model
+import stress
+
+
+@pytest.fixture(scope="module")
+def frame():
+    return risk_engine.compute_risk_frame(sample_data.generate_panel())
+
+
+@pytest.fixture
+def no_shocks(monkeypatch):
+    # One regime, no mean shocks, no volatility: every path is the
+    # unshocked panel, so losses have a closed form
+    monkeypatch.setattr(stress, "SCENARIOS", {"Base Case": {"probability": 1.0, "gdp": 0.0, "inflation": 0.0,
+                                                            "credit": 0.0}})
+    monkeypatch.setattr(stress, "COMMON_VOL", {"gdp": 0.0, "inflation": 0.0, "credit": 0.0})
+    monkeypatch.setattr(stress, "IDIO_VOL", {"gdp": 0.0, "inflation": 0.0, "credit": 0.0})
+
+
+# ======================
+# VaR / ES
+# ======================
+def test_var_es_on_a_known_sample():
+    losses = np.arange(1, 101, dtype=float)
+    out = stress.summarize(losses, np.zeros(100, dtype=np.int8), alpha=0.95)
+
+    assert out["var"] == pytest.approx(np.quantile(losses, 0.95))
+    assert out["es"] == pytest.approx(losses[losses >= out["var"]].mean())
+    assert out["es"] == pytest.approx(98.0)
+    assert out["expected_loss"] == pytest.approx(50.5)
+
+
+def test_var_es_match_the_normal_closed_form():
+    # Standard normal: VaR_99 = 2.3263, ES_99 = pdf(VaR_99) / 0.01 = 2.6652
+    losses = np.random.default_rng(7).standard_normal(2_000_000)
+    out = stress.summarize(losses, np.zeros(len(losses), dtype=np.int8), alpha=0.99)
+
+    assert out["var"] == pytest.approx(2.3263, abs=0.01)
+    assert out["es"] == pytest.approx(2.6652, abs=0.01)
+
+
+def test_unshocked_losses_match_the_closed_form(frame, no_shocks):
+    latest = panel_cube.PanelCube(frame).latest_rows()
+    exposures = np.arange(1, len(latest) + 1, dtype=float)
+    expected = (stress.default_of(latest["Risk_Score"].to_numpy(dtype=float)) * stress.LGD
+                @ (exposures / exposures.sum())) * 100
+
+    out = stress.run_stress(frame, exposures=exposures, n_paths=500)
+
+    assert out["losses"] == pytest.approx(np.full(500, expected), rel=1e-4)
+    assert out["var"] == pytest.approx(expected, rel=1e-4)
+    assert out["es"] == pytest.approx(expected, rel=1e-4)
+
+
+# ======================
+# Seeded Reference
+# ======================
+def test_seeded_run_is_reproducible(frame):
+    first = stress.run_stress(frame, n_paths=5_000, seed=3)
+    second = stress.run_stress(frame, n_paths=5_000, seed=3)
+    other = stress.run_stress(frame, n_paths=5_000, seed=4)
+
+    np.testing.assert_array_equal(first["losses"], second["losses"])
+    assert first["var"] == second["var"] and first["es"] == second["es"]
+    assert not np.array_equal(first["losses"], other["losses"])
+
+
+@pytest.mark.parametrize("model", list(scoring_model.load_config()["models"]))
+def test_chunk_matches_a_per_path_reference(frame, model):
+    config = scoring_model.load_config()
+    weights = scoring_model.model_weights(model)
+    scored = risk_engine.derived_frame(frame, weights)
+    inputs = stress.market_inputs(scored, weights)
+    exposures = np.linspace(1, 2, len(inputs["countries"]))
+    n_paths, seed = 50, 11
+    losses, regimes = stress.simulate_chunk(inputs, exposures, n_paths, seed, weights=weights)
+
+    # Same draws, in the same order, applied one path and one term at a time
+    rng = np.random.default_rng(seed)
+    names = list(stress.SCENARIOS)
+    probs = np.array([stress.SCENARIOS[s]["probability"] for s in names])
+    ref_regimes = rng.choice(len(names), size=n_paths, p=probs / probs.sum())
+    draws = {f: (rng.normal(0, stress.COMMON_VOL[f], (n_paths, 1)),
+                 rng.normal(0, stress.IDIO_VOL[f], (n_paths, len(exposures))))
+             for f in ("gdp", "inflation", "credit")}
+
+    span = inputs["raw_max"] - inputs["raw_min"]
+    for p in range(n_paths):
+        regime = names[ref_regimes[p]]
+        shock = {f: stress.SCENARIOS[regime][f] + draws[f][0][p, 0] + draws[f][1][p] for f in draws}
+        values = {
+            "GDP_Growth": inputs["gdp_growth"] + shock["gdp"],
+            "Inflation": inputs["inflation"] + shock["inflation"],
+            "Credit_Growth": inputs["credit_growth"] + shock["credit"],
+            "Unemployment": inputs["unemployment"] + stress.UNEMPLOYMENT_BETA * shock["gdp"],
+            **inputs["factors"]
+        }
+        raw = sum(weight * (np.abs(values[term]) if config["terms"][term] == "abs" else values[term])
+                  for term, weight in weights.items() if weight)
+        pd_ = stress.default_of((raw - inputs["raw_min"]) / span * 100)
+        assert losses[p] == pytest.approx(np.sum(pd_ * stress.LGD * exposures) / exposures.sum())
+
+    np.testing.assert_array_equal(regimes, ref_regimes)
@@ -0,0 +1,152 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+# ======================
+# Sources
+# ======================
+# World Bank WDI bulk exports: four metadata lines, then one row per
+# country with one column per year (1960 onwards).
+DATA_DIR = os.path.dirname(os.path.abspath(__file__))
+STORE_DIR = os.path.join(DATA_DIR, "wdi_store")
+
+WDI_FILES = {
+    "GDP": "GDP.csv",
+    "Inflation": "Inflation.csv",
+    "Credit": "Credit.csv"
+}
+
+VALUES_FILE = "values.npy"
+INDEX_FILE = "index.json"
+
+
+# ======================
+# Parsing
+# ======================
+def read_wdi_csv(path, indicator):
+    wide = pd.read_csv(path, skiprows=4)
+    year_cols = [c for c in wide.columns if str(c).strip().isdigit()]
+
+    long = wide.melt(
+        id_vars=["Country Code", "Country Name"],
+        value_vars=year_cols,
+        var_name="Year",
+        value_name="Value"
+    )
+    long = long.rename(columns={"Country Code": "Country", "Country Name": "Country_Name"})
+    long["Year"] = long["Year"].astype(int)
+    long["Value"] = pd.to_numeric(long["Value"], errors="coerce")
+    long["Indicator"] = indicator
+    return long[["Country", "Country_Name", "Year", "Indicator", "Value"]]
+
+
+def read_wdi_long(data_dir=DATA_DIR, files=None):
+    files = WDI_FILES if files is None else files
+    parts = [read_wdi_csv(os.path.join(data_dir, f), name) for name, f in files.items()]
+    return pd.concat(parts, ignore_index=True)
+
+
+# ======================
+# Store Build
+# ======================
+def _source_stamp(data_dir, files):
+    return {f: os.path.getmtime(os.path.join(data_dir, f)) for f in files.values()}
+
+
+def build_store(data_dir=DATA_DIR, store_dir=STORE_DIR, files=None):
+    # Melt once into a dense Country x Year x Indicator cube (NaN = missing)
+    files = WDI_FILES if files is None else files
+    long = read_wdi_long(data_dir, files)
+
+    names = long.drop_duplicates("Country").set_index("Country")["Country_Name"]
+    countries = sorted(names.index)
+    years = list(range(int(long["Year"].min()), int(long["Year"].max()) + 1))
+    indicators = list(files)
+
+    values = np.full((len(countries), len(years), len(indicators)), np.nan)
+    c_idx = pd.Index(countries).get_indexer(long["Country"])
+    y_idx = long["Year"].to_numpy() - years[0]
+    i_idx = pd.Index(indicators).get_indexer(long["Indicator"])
+    values[c_idx, y_idx, i_idx] = long["Value"].to_numpy()
+
+    os.makedirs(store_dir, exist_ok=True)
+    np.save(os.path.join(store_dir, VALUES_FILE), values)
+    with open(os.path.join(store_dir, INDEX_FILE), "w", encoding="utf-8") as fh:
+        json.dump({
+            "countries": countries,
+            "country_names": [names[c] for c in countries],
+            "years": years,
+            "indicators": indicators,
+            "sources": _source_stamp(data_dir, files)
+        }, fh)
+    return WDIStore(store_dir)
+
+
+def store_is_fresh(data_dir=DATA_DIR, store_dir=STORE_DIR, files=None):
+    files = WDI_FILES if files is None else files
+    index_path = os.path.join(store_dir, INDEX_FILE)
+    if not os.path.exists(index_path) or not os.path.exists(os.path.join(store_dir, VALUES_FILE)):
+        return False
+    with open(index_path, encoding="utf-8") as fh:
+        index = json.load(fh)
+    try:
+        return index["sources"] == _source_stamp(data_dir, files)
+    except OSError:
+        # Sources removed after the build: the store is all we have
+        return True
+
+
+def open_store(data_dir=DATA_DIR, store_dir=STORE_DIR, files=None):
+    # Local, network-free entry point; rebuilds only when the CSVs changed
+    if not store_is_fresh(data_dir, store_dir, files):
+        return build_store(data_dir, store_dir, files)
+    return WDIStore(store_dir)
+
+
+# ======================
+# Store Access
+# ======================
+class WDIStore:
+    def __init__(self, store_dir=STORE_DIR):
+        with open(os.path.join(store_dir, INDEX_FILE), encoding="utf-8") as fh:
+            index = json.load(fh)
+        self.countries = index["countries"]
+        self.country_names = dict(zip(index["countries"], index["country_names"]))
+        self.years = index["years"]
+        self.indicators = index["indicators"]
+        self.values = np.load(os.path.join(store_dir, VALUES_FILE), mmap_mode="r")
+
+        self.country_index = {c: i for i, c in enumerate(self.countries)}
+        self.indicator_index = {name: i for i, name in enumerate(self.indicators)}
+
+    def year_slice(self, years=None):
+        if years is None:
+            return slice(None), self.years
+        years = [y for y in years if self.years[0] <= y <= self.years[-1]]
+        return [y - self.years[0] for y in years], years
+
+    def series(self, country, indicator, years=None):
+        y_idx, years = self.year_slice(years)
+        values = self.values[self.country_index[country], y_idx, self.indicator_index[indicator]]
+        return pd.Series(np.asarray(values), index=pd.Index(years, name="Year"), name=indicator)
+
+    def frame(self, countries=None, years=None, indicators=None):
+        # Wide Country/Year rows, one column per indicator
+        countries = self.countries if countries is None else [c for c in countries if c in self.country_index]
+        indicators = self.indicators if indicators is None else list(indicators)
+        y_idx, years = self.year_slice(years)
+
+        c_idx = [self.country_index[c] for c in countries]
+        i_idx = [self.indicator_index[i] for i in indicators]
+        block = np.asarray(self.values[c_idx][:, y_idx][:, :, i_idx])
+
+        out = pd.DataFrame(block.reshape(-1, len(indicators)), columns=indicators)
+        out.insert(0, "Year", np.tile(years, len(countries)))
+        out.insert(0, "Country", np.repeat(countries, len(years)))
+        return out
+
+    def long_frame(self, countries=None, years=None, indicators=None):
+        wide = self.frame(countries, years, indicators)
+        return wide.melt(id_vars=["Country", "Year"], var_name="Indicator", value_name="Value")